@@ -0,0 +1,11 @@
+"""
+Núcleo das árvores, sem interface e sem renderização: importar o pacote não
+carrega graphviz nem multiprocessing, então processos de um pool sobem rápido.
+O desenho (visualize, RenderQueue) importa o graphviz na primeira chamada.
+"""
+from .busca_binaria import (BinarySearchTree, ConcurrentBinarySearchTree,
+                            MappedBinarySearchTree, Node, ReadWriteLock, RenderQueue)
+from .instrumentacao import Instrumentacao
+
+__all__ = ["BinarySearchTree", "ConcurrentBinarySearchTree", "Instrumentacao",
+           "MappedBinarySearchTree", "Node", "ReadWriteLock", "RenderQueue"]
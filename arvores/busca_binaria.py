@@ -0,0 +1,446 @@
+"""
+Árvore binária de busca (a mesma usada em atividade_2), sem dependência de
+renderização na importação: o graphviz só é carregado no primeiro desenho.
+"""
+import os
+import shutil
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+from .renderizacao import arvore_para_dot, carregar_graphviz
+from .snapshot import SnapshotMapeado, gravar_snapshot
+
+
+class Node:
+    def __init__(self, value):
+        self.value = value
+        self.left = None
+        self.right = None
+
+
+def _children(node):
+    return [child for child in (node.left, node.right) if child]
+
+
+def _value_range(node, visited):
+    # Menor e maior valores da subárvore, exatos mesmo quando o resumo para no limite.
+    low = high = node
+    while low.left:
+        low = low.left
+    while high.right:
+        high = high.right
+    return f"{low.value} .. {high.value}"
+
+
+class BinarySearchTree:
+    def __init__(self):
+        self.root = None
+
+    def insert(self, value):
+        if self.root is None:
+            self.root = Node(value)
+            return
+        current = self.root
+        while True:
+            if value < current.value:
+                if current.left is None:
+                    current.left = Node(value)
+                    return
+                current = current.left
+            elif value > current.value:
+                if current.right is None:
+                    current.right = Node(value)
+                    return
+                current = current.right
+            else:
+                return
+
+    def search(self, value):
+        current = self.root
+        while current is not None:
+            if current.value == value:
+                return True
+            elif value < current.value:
+                current = current.left
+            else:
+                current = current.right
+        return False
+
+    def delete(self, value):
+        parent = None
+        current = self.root
+        while current is not None and current.value != value:
+            parent = current
+            current = current.left if value < current.value else current.right
+        if current is None:
+            return
+
+        if current.left is not None and current.right is not None:
+            # Dois filhos: copia o sucessor e passa a remover o sucessor
+            successor_parent = current
+            successor = current.right
+            while successor.left is not None:
+                successor_parent = successor
+                successor = successor.left
+            current.value = successor.value
+            parent, current = successor_parent, successor
+
+        child = current.left if current.left is not None else current.right
+        if parent is None:
+            self.root = child
+        elif parent.left is current:
+            parent.left = child
+        else:
+            parent.right = child
+
+    def _min_value_node(self, node):
+        current = node
+        while current.left:
+            current = current.left
+        return current
+
+    def height(self):
+        if self.root is None:
+            return -1
+        h = -1
+        level = [self.root]
+        while level:
+            h += 1
+            next_level = []
+            for node in level:
+                if node.left:
+                    next_level.append(node.left)
+                if node.right:
+                    next_level.append(node.right)
+            level = next_level
+        return h
+
+    def depth(self, value):
+        node = self.root
+        d = 0
+        while node is not None:
+            if node.value == value:
+                return d
+            elif value < node.value:
+                node = node.left
+            else:
+                node = node.right
+            d += 1
+        return -1
+
+    def inorder(self):
+        stack = []
+        node = self.root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.value
+            node = node.right
+
+    def salvar(self, filename):
+        """
+        Grava os valores em ordem no formato binário de snapshot de
+        arvores.snapshot (o mesmo da ArvoreAVL). Só aceita valores todos int
+        (dentro do int64) ou todos float: misturas e inteiros grandes demais
+        levantam erro em vez de virar float64 com perda.
+        """
+        gravar_snapshot(filename, list(self.inorder()))
+
+    @classmethod
+    def carregar(cls, filename):
+        """
+        Abre um snapshot com mmap, sem criar nós: search, depth, height e
+        inorder são respondidos direto do arquivo. A árvore é montada, em O(n)
+        e balanceada, só na primeira escrita.
+        """
+        return MappedBinarySearchTree(filename, cls)
+
+    @classmethod
+    def _from_sorted(cls, values):
+        tree = cls()
+        tree.root = cls._build_balanced(values, len(values))
+        return tree
+
+    @staticmethod
+    def _build_balanced(values, count):
+        if count == 0:
+            return None
+        root = Node(values[(count - 1) // 2])
+        stack = [(0, count - 1, root)]
+        while stack:
+            low, high, node = stack.pop()
+            middle = (low + high) // 2
+            if low <= middle - 1:
+                node.left = Node(values[(low + middle - 1) // 2])
+                stack.append((low, middle - 1, node.left))
+            if middle + 1 <= high:
+                node.right = Node(values[(middle + 1 + high) // 2])
+                stack.append((middle + 1, high, node.right))
+        return root
+
+    def visualize(self, filename="bst_fixa", max_depth=None, max_nodes=None, focus=None,
+                  format="png"):
+        """
+        Sem limites, desenha todos os nós. Com max_depth, max_nodes ou focus,
+        usa o modo para árvores grandes (veja to_dot): o número de nós enviados
+        ao dot fica limitado. format="dot" só grava o texto DOT, sem layout.
+        """
+        source = self.dot_source(max_depth, max_nodes, focus)
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if format == "dot":
+            with open(f"{filename}.dot", "w", encoding="utf-8") as f:
+                f.write(source)
+        else:
+            carregar_graphviz().Source(source).render(filename, format=format, cleanup=True)
+        print(f"Árvore gerada em {filename}.{format}")
+
+    def dot_source(self, max_depth=None, max_nodes=None, focus=None):
+        """Texto DOT da árvore; sem limites, inteira (veja to_dot)."""
+        return self.to_dot(max_depth, max_nodes, focus)
+
+    def to_dot(self, max_depth=None, max_nodes=None, focus=None):
+        """
+        Gera o texto DOT da árvore com nível de detalhe, percorrendo-a em
+        largura (sem recursão). Subárvores abaixo de max_depth, ou além dos
+        primeiros max_nodes nós, viram um único nó-resumo com quantidade,
+        intervalo de valores e altura. Com focus, só o caminho da raiz até
+        esse valor é expandido; o que fica fora do caminho é resumido, e o
+        limite de profundidade passa a contar a partir do nó em foco.
+        """
+        path, node = [], self.root
+        if focus is not None:
+            while node is not None and node.value != focus:
+                path.append(node)
+                node = node.left if focus < node.value else node.right
+        return arvore_para_dot(self.root, _children, lambda n: n.value, _value_range,
+                               max_depth, max_nodes, path, node if focus is not None else None)
+
+
+class MappedBinarySearchTree(SnapshotMapeado):
+    """
+    Visão somente leitura de um snapshot salvo com `BinarySearchTree.salvar`.
+    Os valores ordenados são o layout implícito da árvore balanceada que a
+    carga montaria, então search e depth são buscas binárias no arquivo e
+    height vem da quantidade. insert, delete e qualquer método não
+    implementado aqui montam a árvore e passam a delegar tudo a ela.
+    """
+    def __init__(self, filename, cls=BinarySearchTree):
+        super().__init__(filename, cls._from_sorted)
+
+    def insert(self, value):
+        return self._materializar().insert(value)
+
+    def delete(self, value):
+        return self._materializar().delete(value)
+
+    def search(self, value):
+        return self.depth(value) != -1
+
+    def depth(self, value):
+        if self._arvore is not None:
+            return self._arvore.depth(value)
+        return self._profundidade(value)
+
+    def height(self):
+        if self._arvore is not None:
+            return self._arvore.height()
+        return len(self._chaves).bit_length() - 1
+
+    def inorder(self):
+        if self._arvore is not None:
+            return self._arvore.inorder()
+        return self._iterar()
+
+
+class ReadWriteLock:
+    """
+    Trava de leitores e escritor: várias leituras simultâneas ou uma escrita.
+    Escritores em espera bloqueiam novos leitores, para não passarem fome.
+    """
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    @contextmanager
+    def read_locked(self):
+        with self._condition:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if self._readers == 0:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write_locked(self):
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer = False
+                self._condition.notify_all()
+
+
+class ConcurrentBinarySearchTree(BinarySearchTree):
+    """
+    BinarySearchTree segura para threads: buscas em paralelo, escritas
+    exclusivas. Percursos (inorder, salvar, to_dot) leem a árvore inteira sob a
+    trava de leitura, porque delete reescreve valores no lugar e um percurso
+    sem trava poderia pular ou repetir valores.
+    """
+    def __init__(self):
+        super().__init__()
+        self.lock = ReadWriteLock()
+
+    def insert(self, value):
+        with self.lock.write_locked():
+            super().insert(value)
+
+    def delete(self, value):
+        with self.lock.write_locked():
+            super().delete(value)
+
+    def search(self, value):
+        with self.lock.read_locked():
+            return super().search(value)
+
+    def height(self):
+        with self.lock.read_locked():
+            return super().height()
+
+    def depth(self, value):
+        with self.lock.read_locked():
+            return super().depth(value)
+
+    def inorder(self):
+        # Cópia tirada sob a trava e percorrida fora dela: um gerador que
+        # segurasse a trava bloquearia os escritores enquanto o chamador
+        # consome, e travaria se o próprio chamador escrevesse no meio.
+        with self.lock.read_locked():
+            values = list(super().inorder())
+        return iter(values)
+
+    def to_dot(self, max_depth=None, max_nodes=None, focus=None):
+        with self.lock.read_locked():
+            return super().to_dot(max_depth, max_nodes, focus)
+
+
+def _render_source(source, filename, format):
+    return carregar_graphviz().Source(source).render(filename, format=format, cleanup=True)
+
+
+class RenderQueue:
+    """
+    Fila de renderização: o DOT de cada snapshot é capturado na hora (barato)
+    e o dot roda depois, em um pool limitado de processos. submit bloqueia
+    quando max_pending renderizações já estão na fila.
+
+    Snapshots repetidos não passam pelo dot de novo: se o arquivo já recebeu
+    esse mesmo conteúdo, nada é feito; se outro arquivo recebeu, a imagem
+    pronta é copiada.
+    """
+    def __init__(self, max_workers=None, max_pending=None):
+        # Importado aqui: carregar multiprocessing custa caro e só a fila precisa dele.
+        from concurrent.futures import ProcessPoolExecutor
+        max_workers = max_workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(max_workers)
+        self._slots = threading.BoundedSemaphore(max_pending or 4 * max_workers)
+        self._renders = {}   # (hash do DOT, formato) -> (future, arquivo renderizado)
+        self._outputs = {}   # (arquivo, formato) -> hash do último DOT enviado
+        self._copies = []    # (future, arquivo de destino, formato)
+        self._pending = []
+        self.rendered = 0
+        self.skipped = 0
+
+    def submit(self, tree, filename, format="png", max_depth=None, max_nodes=None,
+               focus=None):
+        """Captura o snapshot da árvore agora e agenda a renderização."""
+        return self.submit_source(tree.dot_source(max_depth, max_nodes, focus),
+                                  filename, format)
+
+    def submit_source(self, source, filename, format="png"):
+        """Agenda um texto DOT. Retorna False se o dot não precisou ser chamado."""
+        import hashlib
+        digest = hashlib.sha1(source.encode()).hexdigest()
+        previous = self._outputs.get((filename, format))
+        if previous == digest:
+            self.skipped += 1
+            return False
+        if previous is not None:
+            self._release(previous, filename, format)
+            # Uma cópia ainda pendente para este arquivo traria o conteúdo antigo.
+            self._copies = [copy for copy in self._copies
+                            if copy[1:] != (filename, format)]
+        self._outputs[(filename, format)] = digest
+
+        if (digest, format) in self._renders:
+            self._copies.append((self._renders[digest, format][0], filename, format))
+            self.skipped += 1
+            return False
+        self._slots.acquire()
+        future = self._executor.submit(_render_source, source, filename, format)
+        future.add_done_callback(lambda _: self._slots.release())
+        self._renders[digest, format] = (future, filename)
+        self._pending.append(future)
+        self.rendered += 1
+        return True
+
+    def _release(self, digest, filename, format):
+        # O arquivo vai ser sobrescrito: espera a renderização anterior dele e
+        # faz antes as cópias que dependiam do conteúdo antigo.
+        future, rendered_file = self._renders.get((digest, format), (None, None))
+        if rendered_file != filename:
+            return
+        future.result()
+        self._copy_from(future)
+        del self._renders[digest, format]
+
+    def _copy_from(self, future=None):
+        remaining = []
+        for source_future, filename, format in self._copies:
+            if future is None or source_future is future:
+                shutil.copyfile(source_future.result(), f"{filename}.{format}")
+            else:
+                remaining.append((source_future, filename, format))
+        self._copies = remaining
+
+    def flush(self):
+        """Espera todas as renderizações pendentes (levanta o erro da primeira que falhou)."""
+        for future in self._pending:
+            future.result()
+        self._pending.clear()
+        self._copy_from()
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            # Já há um erro subindo: não espera nem copia nada que possa escondê-lo.
+            self._executor.shutdown(cancel_futures=True)
+
@@ -0,0 +1,80 @@
+"""
+Instrumentação das árvores AVL (AVLTree e ArvoreAVL): contadores de rotação,
+comparações e nós visitados por operação, histograma de alturas, ganchos
+opcionais e amostragem.
+
+A árvore recebe o objeto em `instrumentacao=` e só conversa com ele por
+iniciar / visitar / rotacao / concluir. Sem instrumentação (None), o custo é
+um teste de None por operação e por nível descido.
+"""
+from collections import Counter
+
+TIPOS_DE_ROTACAO = ("direita", "esquerda", "esquerda_direita", "direita_esquerda")
+
+
+class Instrumentacao:
+    """
+    Mede 1 a cada `amostragem` operações; nas demais, a árvore não chama mais
+    nada. `ao_rotacionar(tipo, chave)` é chamado a cada rotação de uma
+    operação medida e `ao_concluir(operacao, comparacoes, visitados, altura)`
+    ao fim dela.
+    """
+    def __init__(self, amostragem=1, ao_rotacionar=None, ao_concluir=None):
+        if amostragem < 1:
+            raise ValueError("A amostragem deve ser 1 ou maior.")
+        self.amostragem = amostragem
+        self.ao_rotacionar = ao_rotacionar
+        self.ao_concluir = ao_concluir
+        self.zerar()
+
+    def zerar(self):
+        self.operacoes = 0
+        self.amostradas = Counter()
+        self.rotacoes = dict.fromkeys(TIPOS_DE_ROTACAO, 0)
+        self.comparacoes = 0
+        self.nos_visitados = 0
+        self.histograma_alturas = Counter()
+        self._comparacoes_operacao = 0
+        self._visitados_operacao = 0
+
+    # Chamados pelas árvores
+    def iniciar(self):
+        """Conta a operação e diz se ela deve ser medida."""
+        self.operacoes += 1
+        if self.operacoes % self.amostragem:
+            return False
+        self._comparacoes_operacao = 0
+        self._visitados_operacao = 0
+        return True
+
+    def visitar(self, comparacoes):
+        self._visitados_operacao += 1
+        self._comparacoes_operacao += comparacoes
+
+    def rotacao(self, tipo, chave):
+        self.rotacoes[tipo] += 1
+        if self.ao_rotacionar is not None:
+            self.ao_rotacionar(tipo, chave)
+
+    def concluir(self, operacao, altura):
+        self.amostradas[operacao] += 1
+        self.comparacoes += self._comparacoes_operacao
+        self.nos_visitados += self._visitados_operacao
+        self.histograma_alturas[altura] += 1
+        if self.ao_concluir is not None:
+            self.ao_concluir(operacao, self._comparacoes_operacao, self._visitados_operacao, altura)
+
+    def metricas(self):
+        """Retorna uma cópia dos números atuais, pronta para json.dumps."""
+        amostradas = sum(self.amostradas.values())
+        return {
+            "operacoes": self.operacoes,
+            "amostragem": self.amostragem,
+            "operacoes_amostradas": dict(self.amostradas),
+            "rotacoes": dict(self.rotacoes),
+            "comparacoes": self.comparacoes,
+            "nos_visitados": self.nos_visitados,
+            "comparacoes_por_operacao": self.comparacoes / amostradas if amostradas else 0.0,
+            "nos_visitados_por_operacao": self.nos_visitados / amostradas if amostradas else 0.0,
+            "histograma_alturas": dict(sorted(self.histograma_alturas.items())),
+        }
@@ -0,0 +1,107 @@
+"""
+Desenho das árvores: carregamento sob demanda do graphviz, usado só quando
+algo é desenhado, e o texto DOT com nível de detalhe, comum a todas as
+árvores binárias do repositório.
+"""
+from collections import deque
+
+# Máximo de nós percorridos para montar o rótulo de um nó-resumo: acima disso
+# o rótulo mostra só um limite inferior, e o tempo de desenho não cresce com a árvore.
+LIMITE_RESUMO = 1000
+
+_graphviz = None
+
+
+def carregar_graphviz():
+    """Importa o graphviz na primeira chamada e reaproveita o módulo nas seguintes."""
+    global _graphviz
+    if _graphviz is None:
+        try:
+            import graphviz
+        except ImportError as erro:
+            raise ImportError(
+                "Desenhar a árvore requer o pacote graphviz (pip install graphviz) "
+                "e o programa dot instalado no sistema.") from erro
+        _graphviz = graphviz
+    return _graphviz
+
+
+def _dot_resumo(linhas, no, pai, nomes, filhos, faixa):
+    # Quantidade, altura e a faixa de valores da subárvore, em uma caixa.
+    # `nomes` guarda o nome DOT de cada nó já emitido: num DAG, um nó
+    # compartilhado já desenhado (expandido ou resumido) só recebe a aresta.
+    nome = nomes.get(id(no))
+    if nome is None:
+        nome = nomes[id(no)] = f"s{id(no)}"
+        quantidade, altura, percorridos = 0, -1, []
+        pilha = [(no, 0)]
+        while pilha and quantidade < LIMITE_RESUMO:
+            atual, nivel = pilha.pop()
+            quantidade += 1
+            altura = max(altura, nivel)
+            percorridos.append(atual)
+            pilha.extend((filho, nivel + 1) for filho in filhos(atual))
+        if pilha:
+            rotulo = f"mais de {quantidade} nós"
+        else:
+            rotulo = f"{quantidade} {'nó' if quantidade == 1 else 'nós'}"
+        texto = faixa(no, percorridos) if faixa else None
+        if texto:
+            rotulo += f"\\n{texto}"
+        rotulo += f"\\naltura ≥ {altura}" if pilha else f"\\naltura {altura}"
+        linhas.append(f'  {nome} [shape=box, style=dashed, label="{rotulo}"];')
+    linhas.append(f"  n{id(pai)} -> {nome};")
+
+
+def arvore_para_dot(raiz, filhos, rotulo, faixa=None, max_profundidade=None, max_nos=None,
+                    caminho=(), foco=None):
+    """
+    Texto DOT com nível de detalhe, gerado por um percurso em largura (sem
+    recursão, então cadeias longas não estouram a pilha). Subárvores abaixo de
+    max_profundidade, ou além dos primeiros max_nos nós, viram um nó-resumo;
+    sem limites, a árvore sai inteira. Nós compartilhados (DAG) são
+    desenhados uma vez só.
+
+    `filhos(no)` devolve os filhos existentes, em ordem, e `rotulo(no)` o texto
+    do nó. `faixa(no, percorridos)` dá a linha de valores do resumo de `no`,
+    a partir dos nós que o resumo percorreu, ou None para omiti-la.
+
+    Com foco (um nó), só `caminho`, os ancestrais dele da raiz até o pai, é
+    expandido fora da subárvore do foco, que é destacada e onde a profundidade
+    passa a contar. Um caminho sem foco (valor procurado ausente) desenha só
+    o caminho e os resumos ao lado dele.
+    """
+    if raiz is None:
+        return "digraph {\n}\n"
+    linhas = ["digraph {", "  ordering=out;"]
+    inicio = foco if foco is not None or caminho else raiz
+    nomes = {id(no): f"n{id(no)}" for no in caminho}
+    if inicio is not None:
+        nomes[id(inicio)] = f"n{id(inicio)}"
+    for no in caminho:
+        linhas.append(f'  n{id(no)} [label="{rotulo(no)}"];')
+        for filho in filhos(no):
+            if id(filho) in nomes:
+                linhas.append(f"  n{id(no)} -> {nomes[id(filho)]};")
+            else:
+                _dot_resumo(linhas, filho, no, nomes, filhos, faixa)
+
+    fila = deque([(inicio, 0)] if inicio is not None else [])
+    exibidos = 0
+    while fila:
+        no, profundidade = fila.popleft()
+        exibidos += 1
+        destaque = ", style=filled, fillcolor=gold" if no is foco else ""
+        linhas.append(f'  n{id(no)} [label="{rotulo(no)}"{destaque}];')
+        for filho in filhos(no):
+            if id(filho) in nomes:
+                linhas.append(f"  n{id(no)} -> {nomes[id(filho)]};")
+            elif ((max_profundidade is not None and profundidade + 1 > max_profundidade)
+                    or (max_nos is not None and exibidos + len(fila) >= max_nos)):
+                _dot_resumo(linhas, filho, no, nomes, filhos, faixa)
+            else:
+                nomes[id(filho)] = f"n{id(filho)}"
+                linhas.append(f"  n{id(no)} -> n{id(filho)};")
+                fila.append((filho, profundidade + 1))
+    linhas.append("}")
+    return "\n".join(linhas) + "\n"
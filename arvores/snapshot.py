@@ -0,0 +1,129 @@
+"""
+Snapshot binário das árvores (ArvoreAVL e BinarySearchTree): um cabeçalho de
+16 bytes seguido das chaves ordenadas, empacotadas como int64 ("q") ou
+float64 ("d"). A ordem é o layout implícito da árvore balanceada: a raiz é o
+elemento do meio e cada subárvore é uma metade.
+"""
+import mmap
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import islice
+
+# Cabeçalho: assinatura, versão, typecode das chaves, 2 bytes de alinhamento e
+# a quantidade de chaves. Com 16 bytes, as chaves começam alinhadas a 8 bytes.
+CABECALHO_SNAPSHOT = struct.Struct("<4sBcxxQ")
+ASSINATURA_SNAPSHOT = b"AVLS"
+VERSAO_SNAPSHOT = 1
+
+
+def tipo_snapshot(chaves):
+    """
+    Escolhe o typecode das chaves sem conversões com perda: só int ("q", dentro
+    do int64) ou só float ("d"). Misturas, bool e inteiros grandes demais
+    levantam erro em vez de virar float64.
+    """
+    tipos = {type(chave) for chave in chaves}
+    if not tipos or tipos == {int}:
+        return "q"
+    if tipos == {float}:
+        return "d"
+    if tipos <= {int, float}:
+        raise TypeError("O snapshot binário não mistura chaves int e float.")
+    raise TypeError("O snapshot binário só aceita chaves int ou float.")
+
+
+def gravar_snapshot(caminho, chaves_ordenadas):
+    """Grava as chaves, já em ordem crescente, no formato de snapshot."""
+    try:
+        dados = array(tipo_snapshot(chaves_ordenadas), chaves_ordenadas)
+    except OverflowError:
+        raise OverflowError("O snapshot binário só guarda inteiros de 64 bits.") from None
+    with open(caminho, "wb") as arquivo:
+        arquivo.write(CABECALHO_SNAPSHOT.pack(ASSINATURA_SNAPSHOT, VERSAO_SNAPSHOT,
+                                              dados.typecode.encode(), len(dados)))
+        dados.tofile(arquivo)
+
+
+class SnapshotMapeado:
+    """
+    Base das visões somente leitura de um snapshot mapeado em memória. Responde
+    direto do arquivo o que não precisa de nós (tamanho, busca com
+    profundidade, intervalos); as subclasses expõem a API de cada árvore.
+
+    Na primeira escrita, `_materializar` monta a árvore mutável com
+    `montar(chaves_ordenadas)`, fecha o arquivo e a visão passa a delegar tudo
+    a ela, inclusive os métodos que a subclasse não implementa.
+    """
+    def __init__(self, caminho, montar):
+        self._montar = montar
+        self._arvore = None
+        with open(caminho, "rb") as arquivo:
+            self._mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mapa) < CABECALHO_SNAPSHOT.size:
+            self._mapa.close()
+            raise ValueError(f"{caminho} está truncado.")
+        assinatura, versao, tipo, quantidade = CABECALHO_SNAPSHOT.unpack_from(self._mapa)
+        if (assinatura != ASSINATURA_SNAPSHOT or versao != VERSAO_SNAPSHOT
+                or tipo not in (b"q", b"d")):
+            self._mapa.close()
+            raise ValueError(f"{caminho} não é um snapshot de árvore válido.")
+        if len(self._mapa) != CABECALHO_SNAPSHOT.size + 8 * quantidade:
+            self._mapa.close()
+            raise ValueError(f"{caminho} está truncado.")
+        self._chaves = memoryview(self._mapa)[CABECALHO_SNAPSHOT.size:].cast(tipo.decode())
+
+    def _fechar(self):
+        self._chaves.release()
+        try:
+            self._mapa.close()
+        except BufferError:
+            # Iteradores ainda abertos leem suas próprias vistas; o mapa é
+            # fechado quando o último deles for coletado.
+            pass
+        self._chaves = self._mapa = None
+
+    def _materializar(self):
+        if self._arvore is None:
+            self._arvore = self._montar(self._chaves.tolist())
+            self._fechar()
+        return self._arvore
+
+    def __getattr__(self, nome):
+        return getattr(self._materializar(), nome)
+
+    def __len__(self):
+        if self._arvore is not None:
+            return len(self._arvore)
+        return len(self._chaves)
+
+    def _profundidade(self, chave):
+        """Passos da busca binária até a chave, que são a profundidade no layout implícito; -1 se faltar."""
+        chaves = self._chaves
+        inicio, fim = 0, len(chaves) - 1
+        profundidade = 0
+        while inicio <= fim:
+            meio = (inicio + fim) // 2
+            if chave == chaves[meio]:
+                return profundidade
+            elif chave < chaves[meio]:
+                fim = meio - 1
+            else:
+                inicio = meio + 1
+            profundidade += 1
+        return -1
+
+    def _iterar(self, chave_min=None, chave_max=None, limite=None, reverso=False, apos=None):
+        """Gerador das chaves do intervalo, com as opções de ArvoreAVL.iterar_intervalo."""
+        # Vista própria do gerador: continua válida se a árvore for materializada
+        # (e a vista da classe liberada) no meio da iteração.
+        chaves = self._chaves[:]
+        inicio = 0 if chave_min is None else bisect_left(chaves, chave_min)
+        fim = len(chaves) if chave_max is None else bisect_right(chaves, chave_max)
+        if apos is not None:
+            if reverso:
+                fim = min(fim, bisect_left(chaves, apos))
+            else:
+                inicio = max(inicio, bisect_right(chaves, apos))
+        indices = range(fim - 1, inicio - 1, -1) if reverso else range(inicio, fim)
+        return (chaves[i] for i in islice(indices, limite))
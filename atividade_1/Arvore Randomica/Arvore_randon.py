@@ -1,5 +1,13 @@
+import keyword
+import math
+import os
 import random
-from graphviz import Digraph
+import re
+import sys
+from collections import OrderedDict, deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from arvores import renderizacao  # noqa: E402
 
 class Node:
     def __init__(self, valor):
@@ -27,6 +35,8 @@ def construir_arvore(formula):
     for token in tokens:
         if token.isdigit():
             transmissao.append(Node(int(token)))
+        elif token.isidentifier():
+            transmissao.append(Node(token))
         elif token in comando:
             while (operador and operador[-1] in comando and comando[operador[-1]] >= comando[token]):
                 no = Node(operador.pop())
@@ -43,22 +53,1026 @@ def construir_arvore(formula):
 
     return transmissao[0] if transmissao else None
 
-def desenhar_arvore(node, nome_arquivo="arvore"):
-    dot = Digraph()
-    
-    def adicionar_no(no):
-        if no:
-            dot.node(str(id(no)), str(no.valor))
-            if no.esquerda:
-                dot.edge(str(id(no)), str(id(no.esquerda)))
-                adicionar_no(no.esquerda)
-            if no.direita:
-                dot.edge(str(id(no)), str(id(no.direita)))
-                adicionar_no(no.direita)
-
-    adicionar_no(node)
-    dot.render(nome_arquivo, format="png", cleanup=True)
-    print(f"Árvore salva como {nome_arquivo}.png")
+class ErroDeSintaxe(ValueError):
+    """Erro de análise de uma expressão, com a posição exata do problema."""
+    def __init__(self, mensagem, posicao, linha, coluna):
+        super().__init__(f"{mensagem} (posição {posicao}, linha {linha}, coluna {coluna})")
+        self.posicao = posicao
+        self.linha = linha
+        self.coluna = coluna
+
+
+PADRAO_TOKEN = re.compile(r"""
+    (?P<espaco>\s+)
+  | (?P<numero>(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?)
+  | (?P<nome>[A-Za-z_]\w*)
+  | (?P<simbolo>[-+*/()])
+""", re.VERBOSE)
+
+
+def tokenizar(fluxo, tamanho_bloco=1 << 16):
+    """
+    Lê a expressão de um fluxo de texto (qualquer objeto com `read(n)`) em
+    blocos e gera tuplas (tipo, valor, posicao, linha, coluna), com tipo
+    "numero", "nome" ou "simbolo". Um token que pode continuar no próximo bloco
+    (por exemplo "12" | "3.5") só é emitido depois que o bloco seguinte chega.
+    """
+    buffer = ""
+    deslocamento = 0  # posição absoluta do início do buffer
+    linha, inicio_linha = 1, 0
+    fim = False
+    while not fim:
+        bloco = fluxo.read(tamanho_bloco)
+        fim = not bloco
+        buffer += bloco
+        indice = 0
+        while indice < len(buffer):
+            casamento = PADRAO_TOKEN.match(buffer, indice)
+            # Perto do fim do bloco o token pode estar incompleto ("1e" de "1e+5").
+            if not fim and (casamento is None or casamento.end() > len(buffer) - 3):
+                break
+            posicao = deslocamento + indice
+            if casamento is None:
+                raise ErroDeSintaxe(f"Caractere inesperado {buffer[indice]!r}",
+                                    posicao, linha, posicao - inicio_linha + 1)
+            tipo, texto = casamento.lastgroup, casamento.group()
+            if tipo == "espaco":
+                quebras = texto.count("\n")
+                if quebras:
+                    linha += quebras
+                    inicio_linha = posicao + texto.rindex("\n") + 1
+            else:
+                if tipo == "numero":
+                    texto = int(texto) if texto.isdigit() else float(texto)
+                yield tipo, texto, posicao, linha, posicao - inicio_linha + 1
+            indice = casamento.end()
+        deslocamento += indice
+        buffer = buffer[indice:]
+    yield "fim", None, deslocamento, linha, deslocamento - inicio_linha + 1
+
+
+PRECEDENCIA = {"+": 1, "-": 1, "*": 2, "/": 2, "neg": 3}
+
+
+def construir_arvore_de_fluxo(fluxo, tamanho_bloco=1 << 16):
+    """
+    Constrói a árvore de uma expressão lida de um fluxo de texto, em O(n) e sem
+    recursão (shunting-yard). Aceita parênteses, números inteiros e de ponto
+    flutuante, variáveis e menos unário; "-x" vira o nó (0 - x) e "-3" vira a
+    constante -3, para que a árvore continue só com operadores binários.
+    Erros levantam ErroDeSintaxe com a posição do token problemático.
+    """
+    operandos = []
+    operadores = []  # (operador, token) — o token guarda a posição para erros
+    espera_operando = True
+
+    def reduzir():
+        operador, _ = operadores.pop()
+        direita = operandos.pop()
+        if operador == "neg":
+            if direita.valor not in OPERACOES and not isinstance(direita.valor, str):
+                operandos.append(Node(-direita.valor))
+                return
+            no = Node("-")
+            no.esquerda = Node(0)
+        else:
+            no = Node(operador)
+            no.esquerda = operandos.pop()
+        no.direita = direita
+        operandos.append(no)
+
+    for token in tokenizar(fluxo, tamanho_bloco):
+        tipo, valor, posicao, linha, coluna = token
+        if espera_operando:
+            if tipo in ("numero", "nome"):
+                operandos.append(Node(valor))
+                espera_operando = False
+            elif valor == "(":
+                operadores.append(("(", token))
+            elif valor == "-":
+                operadores.append(("neg", token))
+            elif valor == "+":
+                pass  # mais unário não altera o valor
+            else:
+                encontrado = "fim da expressão" if tipo == "fim" else repr(valor)
+                raise ErroDeSintaxe(f"Operando esperado, encontrado {encontrado}", posicao, linha, coluna)
+        elif tipo == "fim":
+            break
+        elif valor in OPERACOES:
+            while operadores and operadores[-1][0] != "(" and \
+                    PRECEDENCIA[operadores[-1][0]] >= PRECEDENCIA[valor]:
+                reduzir()
+            operadores.append((valor, token))
+            espera_operando = True
+        elif valor == ")":
+            while operadores and operadores[-1][0] != "(":
+                reduzir()
+            if not operadores:
+                raise ErroDeSintaxe("Parêntese fechado sem correspondente", posicao, linha, coluna)
+            operadores.pop()
+        else:
+            raise ErroDeSintaxe(f"Operador esperado, encontrado {valor!r}", posicao, linha, coluna)
+
+    while operadores:
+        if operadores[-1][0] == "(":
+            _, _, posicao, linha, coluna = operadores[-1][1]
+            raise ErroDeSintaxe("Parêntese aberto sem correspondente", posicao, linha, coluna)
+        reduzir()
+    return operandos[0]
+
+
+def construir_arvore_de_arquivo(caminho, tamanho_bloco=1 << 16):
+    """Lê a expressão de um arquivo de texto, bloco a bloco."""
+    with open(caminho, encoding="utf-8") as arquivo:
+        return construir_arvore_de_fluxo(arquivo, tamanho_bloco)
+
+
+OPERACOES = {
+    "+": lambda a, b: a + b,
+    "-": lambda a, b: a - b,
+    "*": lambda a, b: a * b,
+    "/": lambda a, b: a / b,
+}
+
+
+def avaliar(node, variaveis=None):
+    """Avalia a árvore percorrendo-a recursivamente (referência para o compilador)."""
+    if node.valor in OPERACOES:
+        return OPERACOES[node.valor](avaliar(node.esquerda, variaveis), avaliar(node.direita, variaveis))
+    if isinstance(node.valor, str):
+        return variaveis[node.valor]
+    return node.valor
+
+
+def expressao_normalizada(node):
+    """
+    Gera o código Python da árvore, com todos os parênteses explícitos.
+    Serve para exibir e comparar expressões; compilar() gera código em linha
+    reta, porque o parser recusa parênteses aninhados demais.
+    """
+    partes = {}
+    pilha = [(node, False)]
+    while pilha:
+        no, visitado = pilha.pop()
+        if no.valor not in OPERACOES:
+            partes[id(no)] = str(no.valor)
+        elif visitado:
+            partes[id(no)] = f"({partes[id(no.esquerda)]} {no.valor} {partes[id(no.direita)]})"
+        else:
+            pilha.append((no, True))
+            pilha.append((no.direita, False))
+            pilha.append((no.esquerda, False))
+    return partes[id(node)]
+
+
+def variaveis_da_arvore(node):
+    """Retorna os nomes das variáveis da árvore, em ordem alfabética."""
+    nomes = set()
+    pilha = [node]
+    while pilha:
+        no = pilha.pop()
+        if no.valor in OPERACOES:
+            pilha.append(no.esquerda)
+            pilha.append(no.direita)
+        elif isinstance(no.valor, str):
+            nomes.add(no.valor)
+    return tuple(sorted(nomes))
+
+
+LIMITE_COMPILADAS = 256
+_compiladas = OrderedDict()
+
+
+def _codigo_compilado(node, variaveis):
+    """
+    Gera o código de uma função em linha reta, um nó operador por linha
+    (`_t0 = x * 2`, `_t1 = _t0 + y`, ..., `return _t1`), sem expressões
+    aninhadas: a profundidade da árvore não esbarra no limite de parênteses do
+    parser. Os temporários liberados são reaproveitados, como os buffers de
+    avaliar_em_lote. Constantes que não têm literal (inf, nan) viram globais.
+    """
+    prefixo = "_t"
+    while any(nome.startswith(prefixo) for nome in variaveis):
+        prefixo = "_" + prefixo
+    linhas, constantes, livres = [], {}, []
+    contador = 0
+    resultados = []
+    pilha = [(node, False)]
+    while pilha:
+        no, visitado = pilha.pop()
+        if no.valor not in OPERACOES:
+            if isinstance(no.valor, str):
+                resultados.append((no.valor, False))
+            elif isinstance(no.valor, int) or math.isfinite(no.valor):
+                resultados.append((repr(no.valor), False))
+            else:
+                nome = f"{prefixo}c{len(constantes)}"
+                constantes[nome] = no.valor
+                resultados.append((nome, False))
+        elif visitado:
+            direita, direita_temporaria = resultados.pop()
+            esquerda, esquerda_temporaria = resultados.pop()
+            for nome, temporario in ((esquerda, esquerda_temporaria), (direita, direita_temporaria)):
+                if temporario:
+                    livres.append(nome)
+            if livres:
+                destino = livres.pop()
+            else:
+                destino = f"{prefixo}{contador}"
+                contador += 1
+            linhas.append(f"    {destino} = {esquerda} {no.valor} {direita}")
+            resultados.append((destino, True))
+        else:
+            pilha.append((no, True))
+            pilha.append((no.direita, False))
+            pilha.append((no.esquerda, False))
+    linhas.append(f"    return {resultados.pop()[0]}")
+    cabecalho = f"def expressao({', '.join(variaveis)}):"
+    return "\n".join([cabecalho] + linhas), constantes
+
+
+def compilar(node):
+    """
+    Compila a árvore em uma função Python, que recebe as variáveis como
+    argumentos nomeados: compilar(construir_arvore("x * 2 + y"))(x=3, y=1).
+    Árvores com o mesmo código gerado reutilizam a mesma função; o cache
+    guarda as LIMITE_COMPILADAS funções usadas mais recentemente.
+
+    Variáveis com nome de palavra reservada (`if`, `None`...) não podem ser
+    argumentos nomeados e levantam ValueError.
+    """
+    variaveis = variaveis_da_arvore(node)
+    reservadas = [nome for nome in variaveis if keyword.iskeyword(nome)]
+    if reservadas:
+        raise ValueError(f"Variáveis com nome de palavra reservada do Python: {', '.join(reservadas)}")
+    codigo, constantes = _codigo_compilado(node, variaveis)
+    chave = (codigo, repr(constantes))
+    funcao = _compiladas.get(chave)
+    if funcao is not None:
+        _compiladas.move_to_end(chave)
+        return funcao
+    ambiente = {"__builtins__": {}, **constantes}
+    exec(compile(codigo, "<expressao>", "exec"), ambiente)
+    funcao = ambiente["expressao"]
+    funcao.variaveis = variaveis
+    _compiladas[chave] = funcao
+    if len(_compiladas) > LIMITE_COMPILADAS:
+        _compiladas.popitem(last=False)
+    return funcao
+
+
+def avaliar_em_lote(node, colunas, divisao_por_zero="inf"):
+    """
+    Avalia a árvore sobre colunas NumPy: `colunas` associa cada variável a um
+    array e cada nó operador vira uma única operação vetorizada.
+
+    Os resultados intermediários são gravados em buffers reaproveitados (com
+    `out=`), então a avaliação usa poucos arrays temporários, não um por nó.
+    As colunas de entrada nunca são alteradas.
+
+    `divisao_por_zero` define o resultado das divisões por zero: "inf" segue o
+    IEEE 754 (±inf, ou nan para 0/0), "nan" produz nan, "erro" levanta
+    ZeroDivisionError e um número é usado como valor substituto.
+    """
+    import numpy as np
+
+    if divisao_por_zero not in ("inf", "nan", "erro") and not isinstance(divisao_por_zero, (int, float)):
+        raise ValueError(f"Política de divisão por zero desconhecida: {divisao_por_zero!r}")
+    colunas = {nome: np.asarray(coluna) for nome, coluna in colunas.items()}
+    linhas = len(next(iter(colunas.values()))) if colunas else None
+    livres = []
+
+    def novo_buffer():
+        return livres.pop() if livres else np.empty(linhas, dtype=np.float64)
+
+    def dividir_escalares(a, b):
+        if b != 0:
+            return a / b
+        if divisao_por_zero == "erro":
+            raise ZeroDivisionError("Divisão por zero na expressão.")
+        if divisao_por_zero == "nan":
+            return float("nan")
+        if divisao_por_zero == "inf":
+            return float("nan") if a == 0 else float("inf") if a > 0 else float("-inf")
+        return float(divisao_por_zero)
+
+    # Cada resultado é (valor, temporario): temporario indica um buffer nosso,
+    # que pode ser sobrescrito; colunas de entrada e escalares não podem.
+    resultados = []
+    pilha = [(node, False)]
+    # Operações com inf/nan seguem o IEEE 754, sem avisos do NumPy.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        while pilha:
+            no, visitado = pilha.pop()
+            if no.valor not in OPERACOES:
+                if isinstance(no.valor, str):
+                    resultados.append((colunas[no.valor], False))
+                else:
+                    resultados.append((no.valor, False))
+                continue
+            if not visitado:
+                pilha.append((no, True))
+                pilha.append((no.direita, False))
+                pilha.append((no.esquerda, False))
+                continue
+
+            b, b_temporario = resultados.pop()
+            a, a_temporario = resultados.pop()
+            if np.isscalar(a) and np.isscalar(b):
+                valor = dividir_escalares(a, b) if no.valor == "/" else OPERACOES[no.valor](a, b)
+                resultados.append((valor, False))
+                continue
+
+            if a_temporario:
+                destino = a
+                if b_temporario:
+                    livres.append(b)
+            elif b_temporario:
+                destino = b
+            else:
+                destino = novo_buffer()
+
+            if no.valor == "+":
+                np.add(a, b, out=destino)
+            elif no.valor == "-":
+                np.subtract(a, b, out=destino)
+            elif no.valor == "*":
+                np.multiply(a, b, out=destino)
+            else:
+                zeros = None
+                if np.isscalar(b):
+                    if b == 0 and divisao_por_zero != "inf":
+                        zeros = True
+                elif divisao_por_zero != "inf":
+                    zeros = b == 0
+                    if not zeros.any():
+                        zeros = None
+                if zeros is not None and divisao_por_zero == "erro":
+                    raise ZeroDivisionError("Divisão por zero na expressão.")
+                np.divide(a, b, out=destino)
+                if zeros is not None:
+                    substituto = np.nan if divisao_por_zero == "nan" else divisao_por_zero
+                    if zeros is True:
+                        destino.fill(substituto)
+                    else:
+                        destino[zeros] = substituto
+            resultados.append((destino, True))
+
+    valor, temporario = resultados.pop()
+    if linhas is None:
+        return valor
+    if np.isscalar(valor):
+        return np.full(linhas, valor, dtype=np.float64)
+    return valor if temporario else np.array(valor, dtype=np.float64)
+
+
+class ConstrutorDAG:
+    """
+    Constrói expressões com hash-consing: subárvores estruturalmente iguais
+    (mesmo operador e mesmos filhos, ou mesma folha) viram um único nó
+    compartilhado, e a árvore passa a ser um DAG.
+    """
+    def __init__(self):
+        self._tabela = {}
+
+    def __len__(self):
+        return len(self._tabela)
+
+    def _obter(self, chave, valor, esquerda=None, direita=None):
+        no = self._tabela.get(chave)
+        if no is None:
+            no = Node(valor)
+            no.esquerda = esquerda
+            no.direita = direita
+            self._tabela[chave] = no
+        return no
+
+    def folha(self, valor):
+        # O tipo entra na chave para 1 e 1.0 não virarem o mesmo nó.
+        return self._obter((type(valor), valor), valor)
+
+    def operacao(self, operador, esquerda, direita):
+        """Os filhos devem ter sido criados por este mesmo construtor."""
+        return self._obter((operador, id(esquerda), id(direita)), operador, esquerda, direita)
+
+    def internar(self, node):
+        """Converte uma árvore (ou DAG) qualquer no DAG compartilhado equivalente."""
+        canonicos = {}
+        pilha = [(node, False)]
+        while pilha:
+            no, visitado = pilha.pop()
+            if id(no) in canonicos:
+                continue
+            if no.valor not in OPERACOES:
+                canonicos[id(no)] = self.folha(no.valor)
+            elif visitado:
+                canonicos[id(no)] = self.operacao(no.valor, canonicos[id(no.esquerda)],
+                                                  canonicos[id(no.direita)])
+            else:
+                pilha.append((no, True))
+                pilha.append((no.direita, False))
+                pilha.append((no.esquerda, False))
+        return canonicos[id(node)]
+
+
+def avaliar_dag(node, variaveis=None, valores=None):
+    """
+    Avalia a expressão calculando cada nó compartilhado uma única vez.
+    `valores` (id do nó -> valor) permite passar subárvores já avaliadas.
+    """
+    valores = {} if valores is None else valores
+    pilha = [(node, False)]
+    while pilha:
+        no, visitado = pilha.pop()
+        if id(no) in valores:
+            continue
+        if no.valor not in OPERACOES:
+            valores[id(no)] = variaveis[no.valor] if isinstance(no.valor, str) else no.valor
+        elif visitado:
+            valores[id(no)] = OPERACOES[no.valor](valores[id(no.esquerda)], valores[id(no.direita)])
+        else:
+            pilha.append((no, True))
+            pilha.append((no.direita, False))
+            pilha.append((no.esquerda, False))
+    return valores[id(node)]
+
+
+def contar_nos(node):
+    """Retorna (nós distintos, nós da árvore expandida) — iguais se não houver compartilhamento."""
+    expandidos = {}
+    pilha = [(node, False)]
+    while pilha:
+        no, visitado = pilha.pop()
+        if no is None or id(no) in expandidos:
+            continue
+        if visitado or (no.esquerda is None and no.direita is None):
+            expandidos[id(no)] = 1 + expandidos.get(id(no.esquerda), 0) + expandidos.get(id(no.direita), 0)
+        else:
+            pilha.append((no, True))
+            pilha.append((no.direita, False))
+            pilha.append((no.esquerda, False))
+    return len(expandidos), expandidos[id(node)]
+
+
+# --- Otimização: dobra de constantes, identidades e reassociação ---
+#
+# Uma regra recebe um nó operador cujos filhos já foram otimizados e retorna o
+# nó substituto, ou None se não se aplica. Um passe transforma a árvore
+# inteira; `otimizar` repete os passes até a árvore parar de mudar.
+# As regras supõem variáveis finitas (x * 0 vira 0) e nunca removem uma
+# divisão que poderia levantar ZeroDivisionError.
+
+ASSOCIATIVOS = ("+", "*")
+
+
+def _constante(no):
+    return no.valor not in OPERACOES and not isinstance(no.valor, str)
+
+
+def _pode_falhar(no):
+    """Indica se a subárvore contém uma divisão (que pode ser por zero)."""
+    pilha = [no]
+    while pilha:
+        no = pilha.pop()
+        if no.valor == "/":
+            return True
+        if no.valor in OPERACOES:
+            pilha.append(no.esquerda)
+            pilha.append(no.direita)
+    return False
+
+
+def dobrar_constantes(no):
+    """op(constante, constante) vira a constante resultante (exceto divisão por zero)."""
+    if _constante(no.esquerda) and _constante(no.direita):
+        if no.valor == "/" and no.direita.valor == 0:
+            return None
+        return Node(OPERACOES[no.valor](no.esquerda.valor, no.direita.valor))
+    return None
+
+
+def aplicar_identidades(no):
+    """x + 0, 0 + x, x - 0, x * 1, 1 * x e x / 1 viram x; x * 0 e 0 * x viram 0."""
+    esquerda, direita = no.esquerda, no.direita
+    def vale(lado, valor):
+        return _constante(lado) and lado.valor == valor
+    if no.valor == "+":
+        if vale(direita, 0):
+            return esquerda
+        if vale(esquerda, 0):
+            return direita
+    elif no.valor == "-":
+        if vale(direita, 0):
+            return esquerda
+    elif no.valor == "*":
+        if vale(direita, 1):
+            return esquerda
+        if vale(esquerda, 1):
+            return direita
+        if vale(direita, 0) and not _pode_falhar(esquerda):
+            return Node(0)
+        if vale(esquerda, 0) and not _pode_falhar(direita):
+            return Node(0)
+    elif no.valor == "/":
+        if vale(direita, 1):
+            return esquerda
+    return None
+
+
+def passe_de_regras(regras):
+    """Cria um passe que aplica as regras de baixo para cima, sem recursão."""
+    def passe(node):
+        novos = {}
+        pilha = [(node, False)]
+        while pilha:
+            no, visitado = pilha.pop()
+            if no.valor not in OPERACOES:
+                novos[id(no)] = no
+                continue
+            if not visitado:
+                if id(no) in novos:  # nó compartilhado de um DAG, já otimizado
+                    continue
+                pilha.append((no, True))
+                pilha.append((no.direita, False))
+                pilha.append((no.esquerda, False))
+                continue
+            novo = Node(no.valor)
+            novo.esquerda = novos[id(no.esquerda)]
+            novo.direita = novos[id(no.direita)]
+            aplicou = True
+            while aplicou and novo.valor in OPERACOES:
+                aplicou = False
+                for regra in regras:
+                    substituto = regra(novo)
+                    if substituto is not None:
+                        novo, aplicou = substituto, True
+                        break
+            novos[id(no)] = novo
+        return novos[id(node)]
+    return passe
+
+
+def _balancear(operador, operandos):
+    """Monta uma cadeia do operador com os operandos em ordem e altura mínima."""
+    while len(operandos) > 1:
+        pares = []
+        for i in range(0, len(operandos) - 1, 2):
+            no = Node(operador)
+            no.esquerda, no.direita = operandos[i], operandos[i + 1]
+            pares.append(no)
+        if len(operandos) % 2:
+            pares.append(operandos[-1])
+        operandos = pares
+    return operandos[0]
+
+
+def _referencias(node):
+    """Quantas arestas chegam a cada nó (id -> contagem); maior que 1 só em DAGs."""
+    referencias = {id(node): 0}
+    pilha = [node]
+    while pilha:
+        no = pilha.pop()
+        if no.valor not in OPERACOES:
+            continue
+        for filho in (no.esquerda, no.direita):
+            if id(filho) not in referencias:
+                referencias[id(filho)] = 0
+                pilha.append(filho)
+            referencias[id(filho)] += 1
+    return referencias
+
+
+def reassociar(node):
+    """
+    Reorganiza cadeias do mesmo operador associativo (+ ou *), como
+    ((a + b) + c) + d, em árvores balanceadas, mantendo a ordem dos operandos.
+    A profundidade de uma cadeia de k operandos cai de k - 1 para ⌈log2 k⌉.
+    Com floats, a soma reassociada pode diferir no último dígito.
+
+    Aceita DAGs (de ConstrutorDAG): um nó compartilhado é montado uma única vez
+    e entra como operando em cada cadeia que o usa, sem ser absorvido por elas.
+    """
+    referencias = _referencias(node)
+    prontos = {}  # id do nó original -> nó novo
+    cadeias = {}  # id do nó original -> (operador, operandos), ainda não montada
+
+    def resolver(filho):
+        novo = prontos.get(id(filho))
+        if novo is None:
+            operador, operandos = cadeias.pop(id(filho))
+            novo = prontos[id(filho)] = _balancear(operador, list(operandos))
+        return novo
+
+    pilha = [(node, False)]
+    while pilha:
+        no, visitado = pilha.pop()
+        if no.valor not in OPERACOES:
+            prontos[id(no)] = no
+            continue
+        if not visitado:
+            if id(no) in prontos or id(no) in cadeias:
+                continue
+            pilha.append((no, True))
+            pilha.append((no.direita, False))
+            pilha.append((no.esquerda, False))
+            continue
+        if no.valor in ASSOCIATIVOS:
+            partes = []
+            for filho in (no.esquerda, no.direita):
+                if (id(filho) in cadeias and cadeias[id(filho)][0] == no.valor
+                        and referencias[id(filho)] == 1):
+                    partes.append(cadeias.pop(id(filho))[1])
+                else:
+                    partes.append(deque([resolver(filho)]))
+            esquerda, direita = partes
+            # Junta a lista menor na maior: O(n log n) no total.
+            if len(esquerda) >= len(direita):
+                esquerda.extend(direita)
+                cadeias[id(no)] = (no.valor, esquerda)
+            else:
+                direita.extendleft(reversed(esquerda))
+                cadeias[id(no)] = (no.valor, direita)
+        else:
+            novo = Node(no.valor)
+            novo.esquerda = resolver(no.esquerda)
+            novo.direita = resolver(no.direita)
+            prontos[id(no)] = novo
+    return resolver(node)
+
+
+PASSES_PADRAO = (passe_de_regras([dobrar_constantes, aplicar_identidades]), reassociar)
+
+
+def profundidade(node):
+    """Número de arestas do caminho mais longo da raiz até uma folha."""
+    maior = 0
+    pilha = [(node, 0)]
+    while pilha:
+        no, nivel = pilha.pop()
+        maior = max(maior, nivel)
+        if no.valor in OPERACOES:
+            pilha.append((no.esquerda, nivel + 1))
+            pilha.append((no.direita, nivel + 1))
+    return maior
+
+
+def estruturas_iguais(a, b):
+    pilha = [(a, b)]
+    while pilha:
+        x, y = pilha.pop()
+        if x is y:
+            continue
+        if x is None or y is None or type(x.valor) is not type(y.valor) or x.valor != y.valor:
+            return False
+        pilha.append((x.esquerda, y.esquerda))
+        pilha.append((x.direita, y.direita))
+    return True
+
+
+def otimizar(node, passes=PASSES_PADRAO, max_iteracoes=20):
+    """
+    Aplica os passes em sequência até um ponto fixo (ou max_iteracoes rodadas).
+    Retorna a nova árvore e um relatório com nós e profundidade antes e depois.
+    A árvore original não é alterada.
+    """
+    relatorio = {"nos_antes": contar_nos(node)[1], "profundidade_antes": profundidade(node)}
+    iteracoes = 0
+    while iteracoes < max_iteracoes:
+        iteracoes += 1
+        anterior = node
+        for passe in passes:
+            node = passe(node)
+        if estruturas_iguais(anterior, node):
+            break
+    relatorio.update(nos_depois=contar_nos(node)[1], profundidade_depois=profundidade(node),
+                     iteracoes=iteracoes)
+    return node, relatorio
+
+
+class AvaliadorIncremental:
+    """
+    Mantém o valor de cada subárvore em cache e, quando folhas mudam, recalcula
+    só os nós no caminho delas até a raiz: O(profundidade) por atualização, em
+    vez de O(n). Também funciona com DAGs (nós com vários pais).
+
+    Uma divisão por zero não interrompe a propagação: o nó fica marcado como
+    erro, o erro sobe até a raiz e `valor` levanta ZeroDivisionError.
+    """
+    _ERRO = object()
+
+    def __init__(self, node, variaveis=None):
+        self.raiz = node
+        self.variaveis = dict(variaveis or {})
+        self._pais = {}      # id(nó) -> lista de pais
+        self._alturas = {}   # id(nó) -> altura a partir das folhas (folha = 0)
+        self._valores = {}   # id(nó) -> valor em cache
+        self._folhas_por_nome = {}
+        pilha = [(node, False)]
+        while pilha:
+            no, visitado = pilha.pop()
+            if id(no) in self._valores:
+                continue
+            if no.valor not in OPERACOES:
+                self._alturas[id(no)] = 0
+                if isinstance(no.valor, str):
+                    self._folhas_por_nome.setdefault(no.valor, []).append(no)
+                self._valores[id(no)] = self._calcular(no)
+            elif visitado:
+                for filho in (no.esquerda, no.direita):
+                    self._pais.setdefault(id(filho), []).append(no)
+                self._alturas[id(no)] = 1 + max(self._alturas[id(no.esquerda)],
+                                                self._alturas[id(no.direita)])
+                self._valores[id(no)] = self._calcular(no)
+            else:
+                pilha.append((no, True))
+                pilha.append((no.direita, False))
+                pilha.append((no.esquerda, False))
+
+    def _calcular(self, no):
+        if no.valor not in OPERACOES:
+            return self.variaveis[no.valor] if isinstance(no.valor, str) else no.valor
+        a, b = self._valores[id(no.esquerda)], self._valores[id(no.direita)]
+        if a is self._ERRO or b is self._ERRO or (no.valor == "/" and b == 0):
+            return self._ERRO
+        return OPERACOES[no.valor](a, b)
+
+    @property
+    def valor(self):
+        valor = self._valores[id(self.raiz)]
+        if valor is self._ERRO:
+            raise ZeroDivisionError("Divisão por zero na expressão.")
+        return valor
+
+    def atualizar(self, alvo, valor):
+        """Atualiza uma folha (nó constante ou nome de variável) e propaga."""
+        self.atualizar_em_lote({alvo: valor})
+
+    def atualizar_em_lote(self, mudancas):
+        """
+        Aplica várias mudanças de uma vez: {nó folha ou nome de variável: valor}.
+        Os caminhos afetados são unidos e cada nó sujo é recalculado uma única
+        vez, dos mais baixos para os mais altos. O novo resultado fica em `valor`.
+        """
+        alteradas = []
+        for alvo, valor in mudancas.items():
+            if isinstance(alvo, str):
+                self.variaveis[alvo] = valor
+                alteradas.extend(self._folhas_por_nome.get(alvo, ()))
+            else:
+                alvo.valor = valor
+                alteradas.append(alvo)
+
+        # Marca os ancestrais como sujos, parando nos que já foram marcados.
+        sujos = {}
+        pilha = list(alteradas)
+        while pilha:
+            no = pilha.pop()
+            if id(no) in sujos:
+                continue
+            sujos[id(no)] = no
+            pilha.extend(self._pais.get(id(no), ()))
+
+        por_altura = {}
+        for no in sujos.values():
+            por_altura.setdefault(self._alturas[id(no)], []).append(no)
+        for altura in sorted(por_altura):
+            for no in por_altura[altura]:
+                self._valores[id(no)] = self._calcular(no)
+
+
+# --- Avaliação paralela de árvores muito grandes ---
+#
+# A árvore é cortada por peso: partindo da raiz, desce-se pelos nós pesados
+# (com mais de total / pedaços nós) e cada subárvore leve que sai desse
+# caminho é entregue a um processo, agrupada com as vizinhas em pedaços de
+# peso parecido. Numa cadeia desequilibrada, como as do parser em fluxo, o
+# caminho pesado é a própria cadeia e os pedaços são os termos pendurados
+# nela. Os processos são criados por fork depois do corte, herdam os pedaços
+# e recebem apenas o índice de cada um; os nós pesados são avaliados no
+# processo principal com os resultados parciais já conhecidos. Onde não há
+# fork, cada subárvore vai em forma pós-fixa compacta (bytes de códigos +
+# lista de operandos).
+
+_CODIGOS = {"+": 2, "-": 3, "*": 4, "/": 5}
+_OPERADORES = "  +-*/"
+
+# Pedaços de cada avaliação em andamento, herdados pelos processos do fork.
+_pedacos_compartilhados = {}
+
+
+def serializar_subarvore(node):
+    """Retorna (códigos, operandos): 0 = constante, 1 = variável, 2-5 = operador."""
+    codigos = bytearray()
+    operandos = []
+    pilha = [(node, False)]
+    while pilha:
+        no, visitado = pilha.pop()
+        if no.valor not in OPERACOES:
+            codigos.append(1 if isinstance(no.valor, str) else 0)
+            operandos.append(no.valor)
+        elif visitado:
+            codigos.append(_CODIGOS[no.valor])
+        else:
+            pilha.append((no, True))
+            pilha.append((no.direita, False))
+            pilha.append((no.esquerda, False))
+    return bytes(codigos), operandos
+
+
+def _avaliar_serializada(serializada, variaveis):
+    codigos, operandos = serializada
+    pilha = []
+    proximo = iter(operandos)
+    for codigo in codigos:
+        if codigo == 0:
+            pilha.append(next(proximo))
+        elif codigo == 1:
+            pilha.append(variaveis[next(proximo)])
+        else:
+            direita = pilha.pop()
+            pilha[-1] = OPERACOES[_OPERADORES[codigo]](pilha[-1], direita)
+    return pilha[0]
+
+
+def _avaliar_pedaco(chave, indice, variaveis):
+    return [avaliar_dag(no, variaveis) for no in _pedacos_compartilhados[chave][indice]]
+
+
+def _avaliar_serializadas(serializadas, variaveis):
+    return [_avaliar_serializada(serializada, variaveis) for serializada in serializadas]
+
+
+def _tem_pelo_menos(node, quantidade):
+    """Diz se a expressão tem pelo menos `quantidade` nós distintos, parando ao atingir o limite."""
+    vistos = {id(node)}
+    pilha = [node]
+    while pilha and len(vistos) < quantidade:
+        no = pilha.pop()
+        if no.valor in OPERACOES:
+            for filho in (no.esquerda, no.direita):
+                if id(filho) not in vistos:
+                    vistos.add(id(filho))
+                    pilha.append(filho)
+    return len(vistos) >= quantidade
+
+
+def _pesos(node):
+    """
+    Número de nós de cada subárvore operador (id -> peso), sem recursão. Um nó
+    sai da pilha quando os filhos já têm peso; num DAG, cada nó é pesado uma vez.
+    """
+    pesos = {}
+    pilha = [node]
+    while pilha:
+        no = pilha[-1]
+        esquerda, direita = no.esquerda, no.direita
+        pendente = False
+        for filho in (direita, esquerda):
+            if filho.valor in OPERACOES and id(filho) not in pesos:
+                pilha.append(filho)
+                pendente = True
+        if not pendente:
+            pilha.pop()
+            pesos[id(no)] = (1 + (pesos[id(esquerda)] if esquerda.valor in OPERACOES else 1)
+                             + (pesos[id(direita)] if direita.valor in OPERACOES else 1))
+    return pesos
+
+
+def particionar(node, pedacos):
+    """
+    Corta a expressão em cerca de `pedacos` pedaços de peso parecido. Desce
+    pelos nós pesados (mais de total / pedacos nós) e reúne, na ordem, as
+    subárvores leves que saem deles em grupos de pelo menos esse peso.
+    Retorna a lista de pedaços, cada um uma lista de subárvores independentes;
+    num DAG, cada nó compartilhado entra uma única vez.
+    """
+    if node.valor not in OPERACOES:
+        return []
+    pesos = _pesos(node)
+    alvo = max(1, pesos[id(node)] // pedacos)
+    grupos, grupo, peso_grupo = [], [], 0
+    vistos = {id(node)}
+    pilha = [node]
+    while pilha:
+        no = pilha.pop()
+        if pesos[id(no)] <= alvo:
+            grupo.append(no)
+            peso_grupo += pesos[id(no)]
+            if peso_grupo >= alvo:
+                grupos.append(grupo)
+                grupo, peso_grupo = [], 0
+            continue
+        for filho in (no.direita, no.esquerda):
+            # Folhas ficam para o processo principal: não compensam o envio.
+            if filho.valor in OPERACOES and id(filho) not in vistos:
+                vistos.add(id(filho))
+                pilha.append(filho)
+    if grupo:
+        grupos.append(grupo)
+    return grupos
+
+
+def avaliar_em_paralelo(node, variaveis=None, trabalhadores=None, limite_serial=50_000,
+                        pedacos_por_trabalhador=8):
+    """
+    Avalia a árvore (ou o DAG com subexpressões compartilhadas) dividindo-a
+    entre `trabalhadores` processos. Com menos de `limite_serial` nós, ou com
+    um único trabalhador, a avaliação é serial; a contagem para ao atingir o
+    limite, então o teste custa no máximo `limite_serial` passos.
+
+    Os pedaços são distribuídos sob demanda (vários por processo), o que
+    compensa a diferença de peso que sobra entre eles. Se o corte não achar
+    subárvores leves (uma cadeia só de folhas), a avaliação também é serial.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    trabalhadores = trabalhadores or os.cpu_count() or 1
+    if trabalhadores == 1 or not _tem_pelo_menos(node, limite_serial):
+        return avaliar_dag(node, variaveis)
+
+    pedacos = particionar(node, trabalhadores * pedacos_por_trabalhador)
+    if not pedacos:
+        return avaliar_dag(node, variaveis)
+    conhecidos = {}
+    usar_fork = "fork" in multiprocessing.get_all_start_methods()
+    chave = id(pedacos)
+    if usar_fork:
+        _pedacos_compartilhados[chave] = pedacos
+    try:
+        contexto = multiprocessing.get_context("fork" if usar_fork else None)
+        with ProcessPoolExecutor(max_workers=trabalhadores, mp_context=contexto) as executor:
+            if usar_fork:
+                futuros = [executor.submit(_avaliar_pedaco, chave, i, variaveis)
+                           for i in range(len(pedacos))]
+            else:
+                futuros = [executor.submit(_avaliar_serializadas,
+                                           [serializar_subarvore(no) for no in pedaco], variaveis)
+                           for pedaco in pedacos]
+            for pedaco, futuro in zip(pedacos, futuros):
+                for no, valor in zip(pedaco, futuro.result()):
+                    conhecidos[id(no)] = valor
+    finally:
+        _pedacos_compartilhados.pop(chave, None)
+    return avaliar_dag(node, variaveis, conhecidos)
+
+
+def _filhos(no):
+    return (no.esquerda, no.direita) if no.valor in OPERACOES else ()
+
+
+def _faixa_de_constantes(no, percorridos):
+    constantes = [atual.valor for atual in percorridos
+                  if atual.valor not in OPERACOES and not isinstance(atual.valor, str)]
+    return f"constantes {min(constantes)} .. {max(constantes)}" if constantes else None
+
+
+def arvore_para_dot(node, max_profundidade=None, max_nos=None, foco=None):
+    """
+    Texto DOT da expressão com nível de detalhe, gerado por um percurso em
+    largura. Subárvores abaixo de max_profundidade, ou além dos primeiros
+    max_nos nós, viram um nó-resumo. `foco` é um nó da árvore: só o caminho
+    da raiz até ele é expandido, e a profundidade passa a contar a partir dele.
+    """
+    caminho = []
+    if foco is not None and foco is not node:
+        # Busca em profundidade guardando os pais, para achar o caminho até o foco.
+        pais = {id(node): None}
+        pilha = [node]
+        while pilha and id(foco) not in pais:
+            no = pilha.pop()
+            for filho in _filhos(no):
+                if id(filho) not in pais:
+                    pais[id(filho)] = no
+                    pilha.append(filho)
+        if id(foco) in pais:
+            no = pais[id(foco)]
+            while no is not None:
+                caminho.append(no)
+                no = pais[id(no)]
+            caminho.reverse()
+        else:
+            foco = None
+    return renderizacao.arvore_para_dot(node, _filhos, lambda no: no.valor, _faixa_de_constantes,
+                                        max_profundidade, max_nos, caminho, foco)
+
+
+def desenhar_arvore(node, nome_arquivo="arvore", max_profundidade=None, max_nos=None,
+                    foco=None, formato="png"):
+    # Sem limites, a expressão sai inteira; com algum limite (ou foco), usa o
+    # modo para árvores grandes de arvore_para_dot. Em ambos o DOT é gerado
+    # sem recursão, então as cadeias longas do parser não estouram a pilha.
+    # formato="dot" só grava o texto DOT, sem chamar o layout. O graphviz só é
+    # importado quando há layout a fazer, então os processos de avaliação
+    # paralela e quem só quer o .dot não o carregam.
+    fonte = arvore_para_dot(node, max_profundidade, max_nos, foco)
+    if formato == "dot":
+        with open(f"{nome_arquivo}.dot", "w", encoding="utf-8") as arquivo:
+            arquivo.write(fonte)
+    else:
+        renderizacao.carregar_graphviz().Source(fonte).render(
+            nome_arquivo, format=formato, cleanup=True)
+    print(f"Árvore salva como {nome_arquivo}.{formato}")
 
 if __name__ == '__main__':
     expressao = gerar_expressao()
@@ -0,0 +1,35 @@
+# benchmark_compilador.py
+# Compara a avaliação recursiva da árvore com a função gerada por compilar().
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from Arvore_randon import avaliar, compilar, construir_arvore  # noqa: E402
+
+FORMULA = "a * 3 + b / 7 - c * d + 10 - a * b"
+
+
+if __name__ == "__main__":
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    arvore = construir_arvore(FORMULA)
+    entradas = [{nome: random.randint(1, 100) for nome in "abcd"} for _ in range(1000)]
+
+    inicio = time.perf_counter()
+    for i in range(repeticoes):
+        avaliar(arvore, entradas[i % 1000])
+    recursivo = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    funcao = compilar(arvore)
+    compilacao = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    for i in range(repeticoes):
+        funcao(**entradas[i % 1000])
+    compilado = time.perf_counter() - inicio
+
+    print(f"Fórmula: {FORMULA} ({repeticoes} avaliações)")
+    print(f"  percurso recursivo {recursivo / repeticoes * 1e6:8.3f} us/avaliação")
+    print(f"  função compilada   {compilado / repeticoes * 1e6:8.3f} us/avaliação"
+          f" ({recursivo / compilado:.1f}x, compilação {compilacao * 1e3:.2f} ms)")
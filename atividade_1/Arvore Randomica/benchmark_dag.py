@@ -0,0 +1,39 @@
+# benchmark_dag.py
+# Compara a árvore expandida com o DAG compartilhado (hash-consing) em número
+# de nós e tempo de avaliação, variando a redundância da expressão.
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from Arvore_randon import (ConstrutorDAG, avaliar, avaliar_dag,  # noqa: E402
+                           construir_arvore_de_fluxo, contar_nos)
+
+
+def expressao_redundante(niveis):
+    # Cada nível repete duas vezes a expressão do nível anterior.
+    expressao = "x * 3 + 7"
+    for nivel in range(niveis):
+        operador = "+-*"[nivel % 3]
+        expressao = f"({expressao}) {operador} ({expressao})"
+    return expressao
+
+
+def cronometrar(funcao):
+    inicio = time.perf_counter()
+    funcao()
+    return time.perf_counter() - inicio
+
+
+if __name__ == "__main__":
+    variaveis = {"x": 1.5}
+    for niveis in (4, 8, 12):
+        arvore = construir_arvore_de_fluxo(io.StringIO(expressao_redundante(niveis)))
+        dag = ConstrutorDAG().internar(arvore)
+        nos_arvore = contar_nos(arvore)[0]
+        nos_dag = contar_nos(dag)[0]
+        tempo_arvore = cronometrar(lambda: avaliar(arvore, variaveis))
+        tempo_dag = cronometrar(lambda: avaliar_dag(dag, variaveis))
+        print(f"{niveis:2d} níveis: árvore {nos_arvore:7d} nós {tempo_arvore * 1e3:8.2f} ms   "
+              f"DAG {nos_dag:4d} nós {tempo_dag * 1e3:8.3f} ms")
@@ -0,0 +1,55 @@
+# benchmark_incremental.py
+# Compara a reavaliação completa da árvore com o AvaliadorIncremental quando só
+# algumas folhas mudam entre uma avaliação e outra.
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from Arvore_randon import AvaliadorIncremental, Node, avaliar  # noqa: E402
+
+
+def arvore_balanceada(folhas):
+    # Combina as folhas duas a duas alternando operadores, até sobrar a raiz.
+    nivel = folhas
+    while len(nivel) > 1:
+        proximo = []
+        for i in range(0, len(nivel) - 1, 2):
+            no = Node("+*-"[i % 3])
+            no.esquerda, no.direita = nivel[i], nivel[i + 1]
+            proximo.append(no)
+        if len(nivel) % 2:
+            proximo.append(nivel[-1])
+        nivel = proximo
+    return nivel[0]
+
+
+def cronometrar(funcao, repeticoes):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    return (time.perf_counter() - inicio) / repeticoes
+
+
+if __name__ == "__main__":
+    random.seed(7)
+    for n in (1_000, 10_000, 100_000):
+        folhas = [Node(random.uniform(0.5, 1.5)) for _ in range(n)]
+        arvore = arvore_balanceada(folhas)
+        avaliador = AvaliadorIncremental(arvore)
+
+        def atualizar_uma():
+            avaliador.atualizar(random.choice(folhas), random.uniform(0.5, 1.5))
+
+        def atualizar_lote():
+            avaliador.atualizar_em_lote(
+                {random.choice(folhas): random.uniform(0.5, 1.5) for _ in range(64)})
+
+        tempo_completo = cronometrar(lambda: avaliar(arvore), 3)
+        tempo_uma = cronometrar(atualizar_uma, 1000)
+        tempo_lote = cronometrar(atualizar_lote, 100)
+        assert avaliador.valor == avaliar(arvore)
+        print(f"{n:7d} folhas: completa {tempo_completo * 1e3:8.2f} ms   "
+              f"1 folha {tempo_uma * 1e6:7.1f} µs   "
+              f"64 folhas {tempo_lote * 1e6:8.1f} µs")
@@ -0,0 +1,44 @@
+# benchmark_lote.py
+# Compara a avaliação linha a linha (função compilada) com a avaliação
+# vetorizada em lote sobre colunas NumPy, de 1K a 10M linhas.
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from Arvore_randon import avaliar_em_lote, compilar, construir_arvore  # noqa: E402
+
+FORMULA = "a * 3 + b / 7 - c * d + 10 - a / b"
+LIMITE_POR_LINHA = 100000  # acima disso, o laço Python é estimado pela taxa medida
+
+
+if __name__ == "__main__":
+    arvore = construir_arvore(FORMULA)
+    funcao = compilar(arvore)
+    maximo = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 7
+    linhas = 1000
+    print(f"Fórmula: {FORMULA}")
+    while linhas <= maximo:
+        rng = np.random.default_rng(0)
+        colunas = {nome: rng.integers(0, 100, linhas).astype(np.float64) for nome in "abcd"}
+
+        inicio = time.perf_counter()
+        avaliar_em_lote(arvore, colunas)
+        lote = time.perf_counter() - inicio
+
+        medidas = min(linhas, LIMITE_POR_LINHA)
+        listas = {nome: coluna[:medidas].tolist() for nome, coluna in colunas.items()}
+        inicio = time.perf_counter()
+        for a, b, c, d in zip(listas["a"], listas["b"], listas["c"], listas["d"]):
+            try:
+                funcao(a=a, b=b, c=c, d=d)
+            except ZeroDivisionError:
+                pass
+        por_linha = (time.perf_counter() - inicio) * linhas / medidas
+        estimado = " (estimado)" if medidas < linhas else ""
+
+        print(f"  {linhas:>9} linhas: lote {lote * 1e3:10.2f} ms   "
+              f"por linha {por_linha * 1e3:10.2f} ms{estimado}   {por_linha / lote:6.1f}x")
+        linhas *= 10
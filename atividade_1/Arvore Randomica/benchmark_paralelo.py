@@ -0,0 +1,74 @@
+# benchmark_paralelo.py
+# Mede a avaliação paralela de árvores de expressão com milhões de nós,
+# variando o número de processos, contra a avaliação serial. Roda com uma
+# árvore de divisões aleatórias e com a cadeia desequilibrada que o parser em
+# fluxo produz para uma soma longa de termos.
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from Arvore_randon import (Node, avaliar_dag, avaliar_em_paralelo,  # noqa: E402
+                           construir_arvore_de_fluxo, contar_nos, particionar)
+
+
+def gerar_arvore_grande(operadores, semente=42):
+    # Versão em escala de gerar_expressao: divide as folhas em dois grupos de
+    # tamanho aleatório, de cima para baixo, com uma pilha em vez de recursão.
+    aleatorio = random.Random(semente)
+    topo = Node(None)
+    pilha = [(operadores + 1, topo, "esquerda")]
+    while pilha:
+        folhas, pai, lado = pilha.pop()
+        if folhas == 1:
+            no = Node(aleatorio.choice(("x", "y", aleatorio.uniform(0.5, 2.0))))
+        else:
+            # Sem divisão, para a expressão não cair em x / (x - x).
+            no = Node(aleatorio.choice("+-*"))
+            k = aleatorio.randint(1, folhas - 1)
+            pilha.append((k, no, "esquerda"))
+            pilha.append((folhas - k, no, "direita"))
+        setattr(pai, lado, no)
+    return topo.esquerda
+
+
+def gerar_cadeia_do_parser(operadores, semente=42):
+    # Termos como "( x * 1.5 )" ligados por + - *: o parser monta uma cadeia
+    # à esquerda com os termos pendurados à direita.
+    aleatorio = random.Random(semente)
+    operandos = ["x", "y", "1.5", "0.75"]
+    partes = []
+    for _ in range(operadores // 2):
+        partes += ["(", aleatorio.choice(operandos), aleatorio.choice("+-*"),
+                   aleatorio.choice(operandos), ")", aleatorio.choice("+-*")]
+    partes.append("1")
+    return construir_arvore_de_fluxo(io.StringIO(" ".join(partes)))
+
+
+def cronometrar(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return resultado, time.perf_counter() - inicio
+
+
+if __name__ == "__main__":
+    variaveis = {"x": 1.25, "y": 0.75}
+    operadores = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    print(f"{2 * operadores + 1} nós por árvore, {os.cpu_count()} CPUs")
+    for nome, gerar in (("divisões aleatórias", gerar_arvore_grande),
+                        ("cadeia do parser", gerar_cadeia_do_parser)):
+        arvore = gerar(operadores)
+        print(f"\n{nome}")
+        esperado, tempo_serial = cronometrar(lambda: avaliar_dag(arvore, variaveis))
+        print(f"serial          {tempo_serial:7.3f} s")
+        pedacos, tempo_corte = cronometrar(lambda: particionar(arvore, 8 * 8))
+        pesos = [sum(contar_nos(no)[0] for no in pedaco) for pedaco in pedacos]
+        print(f"corte em {len(pedacos)} pedaços (processo principal) {tempo_corte:.3f} s, "
+              f"maior pedaço {max(pesos, default=0)} nós")
+        for trabalhadores in (2, 4, 8):
+            valor, tempo = cronometrar(
+                lambda: avaliar_em_paralelo(arvore, variaveis, trabalhadores, limite_serial=0))
+            assert repr(valor) == repr(esperado)  # também vale para inf e nan
+            print(f"{trabalhadores} processos     {tempo:7.3f} s   ({tempo_serial / tempo:4.2f}x)")
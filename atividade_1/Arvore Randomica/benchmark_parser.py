@@ -0,0 +1,37 @@
+# benchmark_parser.py
+# Mede o parser em fluxo com uma expressão gerada de 10^6 tokens, lida de arquivo.
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from Arvore_randon import construir_arvore_de_arquivo  # noqa: E402
+
+
+def gerar_arquivo(caminho, tokens):
+    operadores = ["+", "-", "*", "/"]
+    operandos = ["x", "y", "3.5", "-2", "17"]
+    escritos = 0
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        while escritos < tokens:
+            partes = ["(", random.choice(operandos), random.choice(operadores),
+                      random.choice(operandos), ")", random.choice(operadores)]
+            arquivo.write(" ".join(partes) + "\n")
+            escritos += len(partes)
+        arquivo.write("1\n")
+
+
+if __name__ == "__main__":
+    tokens = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6
+    caminho = os.path.join(tempfile.mkdtemp(), "expressao.txt")
+    gerar_arquivo(caminho, tokens)
+    tamanho = os.path.getsize(caminho)
+
+    inicio = time.perf_counter()
+    construir_arvore_de_arquivo(caminho)
+    decorrido = time.perf_counter() - inicio
+    os.remove(caminho)
+    print(f"{tokens} tokens ({tamanho / 2 ** 20:.1f} MiB): {decorrido:.2f} s, "
+          f"{decorrido / tokens * 1e6:.2f} us/token")
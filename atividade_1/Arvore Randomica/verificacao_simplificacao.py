@@ -0,0 +1,72 @@
+# verificacao_simplificacao.py
+# Teste diferencial: a árvore otimizada deve ter o mesmo valor que a original
+# em expressões aleatórias no estilo de gerar_expressao(), também quando a
+# entrada é um DAG com subexpressões compartilhadas (ConstrutorDAG).
+import math
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from Arvore_randon import (ConstrutorDAG, Node, avaliar, construir_arvore,  # noqa: E402
+                           gerar_expressao, otimizar)
+
+
+def com_variaveis(formula):
+    # Troca alguns operandos por variáveis ou pelos neutros 0 e 1, para
+    # exercitar as identidades além da dobra de constantes.
+    tokens = formula.split()
+    for i in range(0, len(tokens), 2):
+        sorteio = random.random()
+        if sorteio < 0.3:
+            tokens[i] = random.choice(["x", "y"])
+        elif sorteio < 0.45:
+            tokens[i] = random.choice(["0", "1"])
+    return " ".join(tokens)
+
+
+def valor(arvore, variaveis):
+    try:
+        return avaliar(arvore, variaveis)
+    except ZeroDivisionError:
+        return ZeroDivisionError
+
+
+def repetida(arvore):
+    # op(arvore, arvore) internado: a expressão inteira vira um nó compartilhado,
+    # além das repetições que ela já tiver.
+    raiz = Node(random.choice("+-*/"))
+    raiz.esquerda = raiz.direita = arvore
+    return ConstrutorDAG().internar(raiz)
+
+
+def verificar(formula, original, otimizada):
+    for _ in range(3):
+        variaveis = {"x": random.uniform(-10, 10), "y": random.randint(-3, 3)}
+        esperado, obtido = valor(original, variaveis), valor(otimizada, variaveis)
+        if not mesmo_valor(esperado, obtido):
+            raise AssertionError(f"{formula}: {esperado} != {obtido} com {variaveis}")
+
+
+def mesmo_valor(a, b):
+    if a is ZeroDivisionError or b is ZeroDivisionError:
+        return a is b
+    return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-12)
+
+
+if __name__ == "__main__":
+    amostras = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    reducao_nos = reducao_profundidade = 0
+    for _ in range(amostras):
+        formula = gerar_expressao()
+        if random.random() < 0.7:
+            formula = com_variaveis(formula)
+        original = construir_arvore(formula)
+        otimizada, relatorio = otimizar(original)
+        verificar(formula, original, otimizada)
+        dag = repetida(original)
+        verificar(f"DAG de {formula}", dag, otimizar(dag)[0])
+        reducao_nos += relatorio["nos_antes"] - relatorio["nos_depois"]
+        reducao_profundidade += relatorio["profundidade_antes"] - relatorio["profundidade_depois"]
+    print(f"{amostras} expressões (e seus DAGs) equivalentes após a otimização; redução média de "
+          f"{reducao_nos / amostras:.2f} nós e {reducao_profundidade / amostras:.2f} níveis")
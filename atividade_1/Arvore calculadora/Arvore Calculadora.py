@@ -1,4 +1,8 @@
-from graphviz import Digraph
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from arvores.renderizacao import carregar_graphviz  # noqa: E402
 
 
 class No:
@@ -23,7 +27,7 @@ def arvore(no, Nivel=0):
 
 
 def desenhar_arvore_png(raiz, nome_arquivo="arvore"):
-    dot = Digraph(comment="Árvore Binária")
+    dot = carregar_graphviz().Digraph(comment="Árvore Binária")
     dot.attr('node', shape='circle') 
 
     def add(n, pai=None):
@@ -0,0 +1,40 @@
+# benchmark_bst.py
+# Mede a latência por operação da BinarySearchTree com entradas
+# ordenadas (pior caso: cadeia degenerada) e aleatórias.
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "ArvoreBuscaBinaria"))
+from ArvoreBuscaBinaria import BinarySearchTree  # noqa: E402
+
+
+def medir(rotulo, funcao, valores):
+    inicio = time.perf_counter()
+    for v in valores:
+        funcao(v)
+    total = time.perf_counter() - inicio
+    print(f"  {rotulo:<8} {total / len(valores) * 1e6:10.2f} us/op")
+
+
+def executar(n, ordenado):
+    valores = list(range(n)) if ordenado else random.sample(range(n * 10), n)
+    bst = BinarySearchTree()
+    print(f"n={n} ({'ordenado' if ordenado else 'aleatório'})")
+    medir("insert", bst.insert, valores)
+    medir("search", bst.search, valores)
+    medir("depth", bst.depth, valores[:1000])
+    inicio = time.perf_counter()
+    altura = bst.height()
+    print(f"  height   {(time.perf_counter() - inicio) * 1e3:10.2f} ms (altura={altura})")
+    medir("delete", bst.delete, valores)
+
+
+if __name__ == "__main__":
+    # Entradas ordenadas formam uma cadeia: cada operação é O(n),
+    # por isso o tamanho ordenado é menor que o aleatório.
+    n_ordenado = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    n_aleatorio = int(sys.argv[2]) if len(sys.argv) > 2 else 200000
+    executar(n_ordenado, ordenado=True)
+    executar(n_aleatorio, ordenado=False)
@@ -0,0 +1,115 @@
+# benchmark_concorrencia.py
+# Teste de estresse e vazão da ConcurrentBinarySearchTree contra a
+# BinarySearchTree protegida por uma única trava global. Além das buscas,
+# threads de varredura percorrem a árvore inteira (inorder) durante as
+# remoções e conferem que nenhum valor foi pulado ou repetido.
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "ArvoreBuscaBinaria"))
+from ArvoreBuscaBinaria import BinarySearchTree, ConcurrentBinarySearchTree  # noqa: E402
+
+DURACAO = 1.0
+UNIVERSO = 20000
+
+
+class GlobalLockTree:
+    """Linha de base: toda chamada passa pela mesma trava."""
+    def __init__(self):
+        self.tree = BinarySearchTree()
+        self.lock = threading.Lock()
+
+    def insert(self, value):
+        with self.lock:
+            self.tree.insert(value)
+
+    def delete(self, value):
+        with self.lock:
+            self.tree.delete(value)
+
+    def search(self, value):
+        with self.lock:
+            return self.tree.search(value)
+
+    def depth(self, value):
+        with self.lock:
+            return self.tree.depth(value)
+
+    def inorder(self):
+        with self.lock:
+            return iter(list(self.tree.inorder()))
+
+
+def preencher(bst):
+    valores = list(range(0, UNIVERSO, 2))
+    random.shuffle(valores)
+    for v in valores:
+        bst.insert(v)
+    return bst
+
+
+def escritor(bst, parar):
+    # Única thread que escreve: alterna inserções e remoções de valores ímpares.
+    while not parar.is_set():
+        valor = random.randrange(1, UNIVERSO, 2)
+        if random.random() < 0.5:
+            bst.insert(valor)
+        else:
+            bst.delete(valor)
+
+
+def leitor(bst, parar, contagem, erros):
+    operacoes = 0
+    while not parar.is_set():
+        valor = random.randrange(0, UNIVERSO, 2)
+        # Valores pares nunca são removidos: devem ser sempre encontrados.
+        if not bst.search(valor) or bst.depth(valor) == -1:
+            erros.append(valor)
+        operacoes += 2
+    contagem.append(operacoes)
+
+
+def varredor(bst, parar, contagem, erros):
+    operacoes = 0
+    while not parar.is_set():
+        valores = list(bst.inorder())
+        # Em ordem estrita (sem repetições) e com todos os pares, que nunca saem.
+        pares = sum(1 for v in valores if v % 2 == 0)
+        if pares != UNIVERSO // 2 or any(a >= b for a, b in zip(valores, valores[1:])):
+            erros.append(len(valores))
+        operacoes += 1
+    contagem.append(operacoes)
+
+
+def executar(bst, leitores, varredores=0):
+    parar = threading.Event()
+    contagem, erros = [], []
+    threads = [threading.Thread(target=escritor, args=(bst, parar))]
+    threads += [threading.Thread(target=leitor, args=(bst, parar, contagem, erros))
+                for _ in range(leitores)]
+    threads += [threading.Thread(target=varredor, args=(bst, parar, [], erros))
+                for _ in range(varredores)]
+    for thread in threads:
+        thread.start()
+    time.sleep(DURACAO)
+    parar.set()
+    for thread in threads:
+        thread.join()
+    if erros:
+        raise AssertionError(f"{len(erros)} leituras inconsistentes")
+    return sum(contagem) / DURACAO
+
+
+if __name__ == "__main__":
+    for leitores in (1, 2, 4, 8):
+        base = executar(preencher(GlobalLockTree()), leitores)
+        concorrente = executar(preencher(ConcurrentBinarySearchTree()), leitores)
+        print(f"{leitores} leitor(es): trava global {base:10.0f} ops/s   "
+              f"leitores/escritor {concorrente:10.0f} ops/s")
+    # Estresse das varreduras: buscas e percursos completos durante as remoções.
+    for varredores in (1, 4):
+        executar(preencher(ConcurrentBinarySearchTree()), 2, varredores)
+        print(f"{varredores} varredura(s) simultânea(s) às remoções: percursos consistentes")
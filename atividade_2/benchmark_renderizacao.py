@@ -0,0 +1,54 @@
+# benchmark_renderizacao.py
+# Vazão da RenderQueue contra chamadas sequenciais de visualize (dot.render)
+# em uma trilha de auditoria: um snapshot da árvore a cada operação, com
+# parte das operações sendo só consultas (o snapshot se repete).
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "ArvoreBuscaBinaria"))
+from ArvoreBuscaBinaria import BinarySearchTree, RenderQueue  # noqa: E402
+
+SNAPSHOTS = 200
+
+
+def trilha(semente=1):
+    # Gera (nome do arquivo, árvore) no estado de cada passo da trilha.
+    aleatorio = random.Random(semente)
+    arvore = BinarySearchTree()
+    for passo in range(SNAPSHOTS):
+        if aleatorio.random() < 0.6:
+            arvore.insert(aleatorio.randrange(1000))
+        else:
+            arvore.search(aleatorio.randrange(1000))
+        yield f"passo_{passo:04d}", arvore
+
+
+def sequencial(pasta):
+    for nome, arvore in trilha():
+        arvore.visualize(os.path.join(pasta, nome))
+
+
+def em_fila(pasta, trabalhadores):
+    with RenderQueue(max_workers=trabalhadores) as fila:
+        for nome, arvore in trilha():
+            fila.submit(arvore, os.path.join(pasta, nome))
+    return fila
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as pasta:
+        inicio = time.perf_counter()
+        sequencial(pasta)
+        tempo_sequencial = time.perf_counter() - inicio
+    print(f"sequencial      {SNAPSHOTS / tempo_sequencial:7.1f} snapshots/s")
+
+    for trabalhadores in (1, 2, 4, os.cpu_count() or 1):
+        with tempfile.TemporaryDirectory() as pasta:
+            inicio = time.perf_counter()
+            fila = em_fila(pasta, trabalhadores)
+            tempo = time.perf_counter() - inicio
+        print(f"fila ({trabalhadores} proc.)  {SNAPSHOTS / tempo:7.1f} snapshots/s   "
+              f"{fila.rendered} renderizados, {fila.skipped} reaproveitados")
@@ -1,5 +1,10 @@
+import os
 import random
-from graphviz import Digraph
+import sys
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from arvores.renderizacao import arvore_para_dot, carregar_graphviz  # noqa: E402
 
 # Nó da árvore
 class Node:
@@ -31,41 +36,113 @@ class BinaryTree:
             else:
                 self._inserir_rec(no.direita, valor)
 
-    # Travessias recursivas
+    # Travessias iterativas (geradores com pilha explícita, memória O(altura))
+    def iter_inorder(self, no=None):
+        pilha = []
+        no = no or self.raiz
+        while pilha or no:
+            while no:
+                pilha.append(no)
+                no = no.esquerda
+            no = pilha.pop()
+            yield no.valor
+            no = no.direita
+
+    def iter_preorder(self, no=None):
+        no = no or self.raiz
+        pilha = [no] if no else []
+        while pilha:
+            no = pilha.pop()
+            yield no.valor
+            if no.direita:
+                pilha.append(no.direita)
+            if no.esquerda:
+                pilha.append(no.esquerda)
+
+    def iter_postorder(self, no=None):
+        pilha = []
+        ultimo = None
+        no = no or self.raiz
+        while pilha or no:
+            while no:
+                pilha.append(no)
+                no = no.esquerda
+            topo = pilha[-1]
+            if topo.direita and topo.direita is not ultimo:
+                no = topo.direita
+            else:
+                ultimo = pilha.pop()
+                yield ultimo.valor
+
+    def iter_level_order(self, no=None):
+        no = no or self.raiz
+        fila = deque([no] if no else [])
+        while fila:
+            no = fila.popleft()
+            yield no.valor
+            if no.esquerda:
+                fila.append(no.esquerda)
+            if no.direita:
+                fila.append(no.direita)
+
+    # Travessias em lista
     def inorder(self, no=None):
-        if no is None:
-            no = self.raiz
-        return (self.inorder(no.esquerda) if no.esquerda else []) + [no.valor] + \
-               (self.inorder(no.direita) if no.direita else [])
+        return list(self.iter_inorder(no))
 
     def preorder(self, no=None):
-        if no is None:
-            no = self.raiz
-        return [no.valor] + \
-               (self.preorder(no.esquerda) if no.esquerda else []) + \
-               (self.preorder(no.direita) if no.direita else [])
+        return list(self.iter_preorder(no))
 
     def postorder(self, no=None):
-        if no is None:
-            no = self.raiz
-        return (self.postorder(no.esquerda) if no.esquerda else []) + \
-               (self.postorder(no.direita) if no.direita else []) + [no.valor]
+        return list(self.iter_postorder(no))
+
+    def level_order(self, no=None):
+        return list(self.iter_level_order(no))
 
     # Visualização com graphviz
-    def visualizar(self, nome="arvore"):
-        dot = Digraph()
-        def add_nodes_edges(no):
-            if no:
-                dot.node(str(no.valor), str(no.valor))
-                if no.esquerda:
-                    dot.edge(str(no.valor), str(no.esquerda.valor))
-                    add_nodes_edges(no.esquerda)
-                if no.direita:
-                    dot.edge(str(no.valor), str(no.direita.valor))
-                    add_nodes_edges(no.direita)
-        add_nodes_edges(self.raiz)
-        dot.render(nome, format="png", cleanup=True)
-        print(f"Árvore gerada: {nome}.png")
+    def visualizar(self, nome="arvore", max_profundidade=None, max_nos=None, foco=None,
+                   formato="png"):
+        # Com algum limite (ou foco), usa o modo para árvores grandes de para_dot;
+        # formato="dot" só grava o texto DOT, sem chamar o layout. O graphviz só
+        # é importado quando há layout a fazer, para quem usa só a árvore (ou só
+        # o .dot) não pagar por ele.
+        fonte = self.para_dot(max_profundidade, max_nos, foco)
+        if formato == "dot":
+            with open(f"{nome}.dot", "w", encoding="utf-8") as arquivo:
+                arquivo.write(fonte)
+        else:
+            carregar_graphviz().Source(fonte).render(nome, format=formato, cleanup=True)
+        print(f"Árvore gerada: {nome}.{formato}")
+
+    # Nível de detalhe: percurso em largura que resume subárvores inteiras
+    def para_dot(self, max_profundidade=None, max_nos=None, foco=None):
+        """
+        Texto DOT da árvore, sem recursão. Subárvores abaixo de max_profundidade,
+        ou além dos primeiros max_nos nós em largura, viram um nó-resumo com
+        quantidade, intervalo de valores e altura. Com foco, só o caminho até
+        esse valor é expandido e a profundidade conta a partir dele.
+        """
+        caminho, no = [], self.raiz
+        if foco is not None:
+            while no is not None and no.valor != foco:
+                caminho.append(no)
+                no = no.esquerda if foco < no.valor else no.direita
+        return arvore_para_dot(self.raiz, _filhos, lambda n: n.valor, _intervalo,
+                               max_profundidade, max_nos, caminho,
+                               no if foco is not None else None)
+
+
+def _filhos(no):
+    return [filho for filho in (no.esquerda, no.direita) if filho]
+
+
+def _intervalo(no, percorridos):
+    # Menor e maior valores da subárvore, exatos mesmo quando o resumo para no limite.
+    menor = maior = no
+    while menor.esquerda:
+        menor = menor.esquerda
+    while maior.direita:
+        maior = maior.direita
+    return f"{menor.valor} .. {maior.valor}"
 
 if __name__ == "__main__":
     # Árvore fixa
@@ -1,7 +1,13 @@
+import os
 import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from arvores.instrumentacao import Instrumentacao  # noqa: E402
+
 class No:
     """Representa um nó na Árvore AVL."""
+    __slots__ = ("chave", "esquerda", "direita", "altura")
+
     def __init__(self, chave):
         self.chave = chave
         self.esquerda = None
@@ -11,7 +17,11 @@ class No:
 class AVLTree:
     """
     Implementa uma árvore de busca auto-balanceada (AVL).
+    As rotações e a busca podem ser medidas passando uma Instrumentacao.
     """
+    def __init__(self, instrumentacao=None):
+        self.instrumentacao = instrumentacao
+
     def obter_altura(self, no):
         """Retorna a altura de um nó; 0 se o nó for nulo."""
         if not no:
@@ -46,13 +56,22 @@ class AVLTree:
 
     def inserir(self, raiz, chave):
         """Insere uma chave e rebalanceia a árvore."""
-      
+        instrumentacao = self.instrumentacao
+        if instrumentacao is None or not instrumentacao.iniciar():
+            return self._inserir_recursivo(raiz, chave, None)
+        raiz = self._inserir_recursivo(raiz, chave, instrumentacao)
+        instrumentacao.concluir("inserir", raiz.altura)
+        return raiz
+
+    def _inserir_recursivo(self, raiz, chave, medida):
         if not raiz:
             return No(chave)
-        elif chave < raiz.chave:
-            raiz.esquerda = self.inserir(raiz.esquerda, chave)
+        if medida is not None:
+            medida.visitar(1)
+        if chave < raiz.chave:
+            raiz.esquerda = self._inserir_recursivo(raiz.esquerda, chave, medida)
         else:
-            raiz.direita = self.inserir(raiz.direita, chave)
+            raiz.direita = self._inserir_recursivo(raiz.direita, chave, medida)
 
        
         raiz.altura = 1 + max(self.obter_altura(raiz.esquerda), self.obter_altura(raiz.direita))
@@ -62,23 +81,27 @@ class AVLTree:
 
        
         if balance > 1 and chave < raiz.esquerda.chave:
-            print(f"-> Rotação Simples à Direita em torno do nó {raiz.chave}")
+            if medida is not None:
+                medida.rotacao("direita", raiz.chave)
             return self._rotacao_direita(raiz)
 
         
         if balance < -1 and chave > raiz.direita.chave:
-            print(f"-> Rotação Simples à Esquerda em torno do nó {raiz.chave}")
+            if medida is not None:
+                medida.rotacao("esquerda", raiz.chave)
             return self._rotacao_esquerda(raiz)
 
         
         if balance > 1 and chave > raiz.esquerda.chave:
-            print(f"-> Rotação Dupla (Esquerda-Direita) em torno do nó {raiz.chave}")
+            if medida is not None:
+                medida.rotacao("esquerda_direita", raiz.chave)
             raiz.esquerda = self._rotacao_esquerda(raiz.esquerda)
             return self._rotacao_direita(raiz)
 
         
         if balance < -1 and chave < raiz.direita.chave:
-            print(f"-> Rotação Dupla (Direita-Esquerda) em torno do nó {raiz.chave}")
+            if medida is not None:
+                medida.rotacao("direita_esquerda", raiz.chave)
             raiz.direita = self._rotacao_direita(raiz.direita)
             return self._rotacao_esquerda(raiz)
 
@@ -93,12 +116,24 @@ class AVLTree:
                 self.visualizar_arvore(no.direita, nivel + 1, "D---")
 
 
+MENSAGENS_DE_ROTACAO = {
+    "direita": "Rotação Simples à Direita",
+    "esquerda": "Rotação Simples à Esquerda",
+    "esquerda_direita": "Rotação Dupla (Esquerda-Direita)",
+    "direita_esquerda": "Rotação Dupla (Direita-Esquerda)",
+}
+
+
+def anunciar_rotacao(tipo, chave):
+    print(f"-> {MENSAGENS_DE_ROTACAO[tipo]} em torno do nó {chave}")
+
+
 if __name__ == "__main__":
     print("======================================================")
     print("DEMONSTRAÇÃO 1: ROTAÇÃO SIMPLES (Inserindo 10, 20, 30)")
     print("======================================================")
     
-    arvore_simples = AVLTree()
+    arvore_simples = AVLTree(Instrumentacao(ao_rotacionar=anunciar_rotacao))
     raiz_simples = None
     chaves_simples = [10, 20, 30]
 
@@ -112,7 +147,7 @@ if __name__ == "__main__":
     print("DEMONSTRAÇÃO 2: ROTAÇÃO DUPLA (Inserindo 10, 30, 20)")
     print("======================================================")
 
-    arvore_dupla = AVLTree()
+    arvore_dupla = AVLTree(Instrumentacao(ao_rotacionar=anunciar_rotacao))
     raiz_dupla = None
     chaves_duplas = [10, 30, 20]
 
@@ -121,3 +156,5 @@ if __name__ == "__main__":
         raiz_dupla = arvore_dupla.inserir(raiz_dupla, chave)
         arvore_dupla.visualizar_arvore(raiz_dupla)
         print("-" * 20)
+
+    print("\nMétricas da demonstração 2:", arvore_dupla.instrumentacao.metricas())
@@ -0,0 +1,378 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+import os
+import struct
+
+
+# Página 0 guarda os metadados da árvore; as demais são nós.
+METADADOS = struct.Struct("<4sIIIIQI")
+ASSINATURA = b"BMA1"
+# Cabeçalho de cada página: tipo, alinhamento, quantidade de chaves, próxima página.
+CABECALHO_PAGINA = struct.Struct("<BxHI")
+FOLHA, INTERNA, LIVRE = 0, 1, 2
+SEM_PAGINA = 0
+
+
+class Pagina:
+    """
+    Representa uma página (nó) da árvore B+ em memória.
+    Folhas guardam as chaves e o número da próxima folha (lista encadeada para
+    varreduras em ordem); páginas internas guardam separadores e filhos.
+    """
+    __slots__ = ("numero", "tipo", "chaves", "filhos", "proxima", "suja")
+
+    def __init__(self, numero, tipo, chaves=None, filhos=None, proxima=SEM_PAGINA):
+        self.numero = numero
+        self.tipo = tipo
+        self.chaves = chaves if chaves is not None else []
+        self.filhos = filhos if filhos is not None else []
+        self.proxima = proxima
+        self.suja = False
+
+
+class ArvoreBMaisDisco:
+    """
+    Árvore B+ de chaves inteiras guardada em um arquivo de páginas de tamanho
+    fixo, com a mesma interface da ArvoreAVL (`inserir`, `deletar`,
+    `encontrar_nos_intervalo`, `obter_profundidade_no`).
+
+    Só as `paginas_em_cache` páginas usadas mais recentemente ficam em memória
+    (LRU). Páginas alteradas são gravadas em lote, em ordem de número de página,
+    quando saem do cache ou em `sincronizar()`.
+    """
+    def __init__(self, caminho, paginas_em_cache=256, tamanho_pagina=4096):
+        # O caminho de uma operação (raiz até folha, mais irmãos) precisa caber no cache.
+        self.paginas_em_cache = max(paginas_em_cache, 16)
+        self._cache = OrderedDict()
+        existe = os.path.exists(caminho) and os.path.getsize(caminho) > 0
+        self._arquivo = open(caminho, "r+b" if existe else "w+b")
+        if existe:
+            self._ler_metadados()
+        else:
+            self.tamanho_pagina = tamanho_pagina
+            self._quantidade_paginas = 1
+            self._livre = SEM_PAGINA
+            self.contagem = 0
+            self.altura = 1
+            self.raiz = self._nova_pagina(FOLHA).numero
+            self.sincronizar()
+        espaco = self.tamanho_pagina - CABECALHO_PAGINA.size
+        self.capacidade_folha = espaco // 8
+        self.capacidade_interna = (espaco - 4) // 12
+
+    # ===============================================================
+    # ARQUIVO, METADADOS E CACHE DE PÁGINAS
+    # ===============================================================
+
+    def _ler_metadados(self):
+        self._arquivo.seek(0)
+        dados = self._arquivo.read(METADADOS.size)
+        (assinatura, self.tamanho_pagina, self.raiz, self._quantidade_paginas,
+         self.altura, self.contagem, self._livre) = METADADOS.unpack(dados)
+        if assinatura != ASSINATURA:
+            raise ValueError("O arquivo não contém uma árvore B+.")
+
+    def _gravar_metadados(self):
+        self._arquivo.seek(0)
+        self._arquivo.write(METADADOS.pack(ASSINATURA, self.tamanho_pagina, self.raiz,
+                                           self._quantidade_paginas, self.altura,
+                                           self.contagem, self._livre))
+
+    def _ler_pagina(self, numero):
+        pagina = self._cache.get(numero)
+        if pagina is not None:
+            self._cache.move_to_end(numero)
+            return pagina
+        self._arquivo.seek(numero * self.tamanho_pagina)
+        dados = self._arquivo.read(self.tamanho_pagina)
+        tipo, quantidade, proxima = CABECALHO_PAGINA.unpack_from(dados)
+        inicio = CABECALHO_PAGINA.size
+        chaves = array("q")
+        chaves.frombytes(dados[inicio:inicio + 8 * quantidade])
+        filhos = []
+        if tipo == INTERNA:
+            filhos = array("I")
+            inicio += 8 * quantidade
+            filhos.frombytes(dados[inicio:inicio + 4 * (quantidade + 1)])
+            filhos = filhos.tolist()
+        pagina = Pagina(numero, tipo, chaves.tolist(), filhos, proxima)
+        self._guardar_no_cache(pagina)
+        return pagina
+
+    def _gravar_pagina(self, pagina):
+        dados = CABECALHO_PAGINA.pack(pagina.tipo, len(pagina.chaves), pagina.proxima)
+        dados += array("q", pagina.chaves).tobytes()
+        if pagina.tipo == INTERNA:
+            dados += array("I", pagina.filhos).tobytes()
+        self._arquivo.seek(pagina.numero * self.tamanho_pagina)
+        self._arquivo.write(dados.ljust(self.tamanho_pagina, b"\0"))
+        pagina.suja = False
+
+    def _guardar_no_cache(self, pagina):
+        self._cache[pagina.numero] = pagina
+        self._cache.move_to_end(pagina.numero)
+        if len(self._cache) > self.paginas_em_cache:
+            # Despeja de uma vez o oitavo mais antigo do cache, gravando as sujas em ordem.
+            despejadas = [self._cache.popitem(last=False)[1]
+                          for _ in range(max(1, self.paginas_em_cache // 8))]
+            for pagina_despejada in sorted(despejadas, key=lambda p: p.numero):
+                if pagina_despejada.suja:
+                    self._gravar_pagina(pagina_despejada)
+
+    def _marcar_suja(self, pagina):
+        """Deve ser chamado depois de cada alteração em uma página."""
+        pagina.suja = True
+        self._guardar_no_cache(pagina)
+
+    def _nova_pagina(self, tipo):
+        if self._livre != SEM_PAGINA:
+            pagina = self._ler_pagina(self._livre)
+            self._livre = pagina.proxima
+            pagina.tipo, pagina.chaves, pagina.filhos, pagina.proxima = tipo, [], [], SEM_PAGINA
+        else:
+            pagina = Pagina(self._quantidade_paginas, tipo)
+            self._quantidade_paginas += 1
+        self._marcar_suja(pagina)
+        return pagina
+
+    def _liberar_pagina(self, pagina):
+        pagina.tipo, pagina.chaves, pagina.filhos = LIVRE, [], []
+        pagina.proxima = self._livre
+        self._livre = pagina.numero
+        self._marcar_suja(pagina)
+
+    def sincronizar(self):
+        """Grava todas as páginas alteradas e os metadados no arquivo."""
+        for pagina in sorted(self._cache.values(), key=lambda p: p.numero):
+            if pagina.suja:
+                self._gravar_pagina(pagina)
+        self._gravar_metadados()
+        self._arquivo.flush()
+
+    def fechar(self):
+        self.sincronizar()
+        self._arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    # ===============================================================
+    # BUSCAS
+    # ===============================================================
+
+    def _descer(self, chave):
+        """Retorna o caminho [(página, índice do filho seguido)] da raiz até a folha."""
+        caminho = []
+        pagina = self._ler_pagina(self.raiz)
+        while pagina.tipo == INTERNA:
+            indice = bisect_right(pagina.chaves, chave)
+            caminho.append((pagina, indice))
+            pagina = self._ler_pagina(pagina.filhos[indice])
+        caminho.append((pagina, None))
+        return caminho
+
+    def __len__(self):
+        return self.contagem
+
+    def __contains__(self, chave):
+        folha = self._descer(chave)[-1][0]
+        indice = bisect_left(folha.chaves, chave)
+        return indice < len(folha.chaves) and folha.chaves[indice] == chave
+
+    def obter_profundidade_no(self, chave):
+        """
+        Todas as chaves de uma árvore B+ ficam nas folhas, então a profundidade de
+        uma chave existente é o nível das folhas (a raiz está no nível 0).
+        Se a chave não for encontrada, retorna -1.
+        """
+        return self.altura - 1 if chave in self else -1
+
+    def iterar_intervalo(self, chave_min=None, chave_max=None, limite=None):
+        """Gera as chaves em [chave_min, chave_max] seguindo os elos entre folhas."""
+        pagina = self._descer(chave_min)[-1][0] if chave_min is not None else self._folha_mais_a_esquerda()
+        indice = 0 if chave_min is None else bisect_left(pagina.chaves, chave_min)
+        gerados = 0
+        while limite is None or gerados < limite:
+            if indice == len(pagina.chaves):
+                if pagina.proxima == SEM_PAGINA:
+                    return
+                pagina = self._ler_pagina(pagina.proxima)
+                indice = 0
+                continue
+            chave = pagina.chaves[indice]
+            if chave_max is not None and chave > chave_max:
+                return
+            yield chave
+            gerados += 1
+            indice += 1
+
+    def _folha_mais_a_esquerda(self):
+        pagina = self._ler_pagina(self.raiz)
+        while pagina.tipo == INTERNA:
+            pagina = self._ler_pagina(pagina.filhos[0])
+        return pagina
+
+    def encontrar_nos_intervalo(self, chave_min, chave_max):
+        """
+        Encontra e retorna uma lista com todas as chaves no intervalo [chave_min, chave_max].
+        """
+        return list(self.iterar_intervalo(chave_min, chave_max))
+
+    def percurso_em_ordem(self):
+        """Retorna uma lista com as chaves em ordem."""
+        return list(self.iterar_intervalo())
+
+    # ===============================================================
+    # INSERÇÃO
+    # ===============================================================
+
+    def inserir(self, chave):
+        caminho = self._descer(chave)
+        folha = caminho[-1][0]
+        indice = bisect_left(folha.chaves, chave)
+        if indice < len(folha.chaves) and folha.chaves[indice] == chave:
+            raise ValueError("Chave duplicada não permitida na Árvore B+.")
+        folha.chaves.insert(indice, chave)
+        self._marcar_suja(folha)
+        self.contagem += 1
+
+        # Divide as páginas cheias de baixo para cima, subindo o separador.
+        pagina = folha
+        for pai, indice_filho in reversed(caminho[:-1]):
+            separador, nova = self._dividir_se_cheia(pagina)
+            if nova is None:
+                return
+            pai.chaves.insert(indice_filho, separador)
+            pai.filhos.insert(indice_filho + 1, nova.numero)
+            self._marcar_suja(pai)
+            pagina = pai
+        separador, nova = self._dividir_se_cheia(pagina)
+        if nova is not None:
+            raiz = self._nova_pagina(INTERNA)
+            raiz.chaves = [separador]
+            raiz.filhos = [pagina.numero, nova.numero]
+            self._marcar_suja(raiz)
+            self.raiz = raiz.numero
+            self.altura += 1
+
+    def _dividir_se_cheia(self, pagina):
+        """Divide a página ao meio se passou da capacidade; retorna (separador, nova página)."""
+        if pagina.tipo == FOLHA:
+            if len(pagina.chaves) <= self.capacidade_folha:
+                return None, None
+            meio = len(pagina.chaves) // 2
+            nova = self._nova_pagina(FOLHA)
+            nova.chaves = pagina.chaves[meio:]
+            del pagina.chaves[meio:]
+            nova.proxima, pagina.proxima = pagina.proxima, nova.numero
+            separador = nova.chaves[0]
+        else:
+            if len(pagina.chaves) <= self.capacidade_interna:
+                return None, None
+            meio = len(pagina.chaves) // 2
+            nova = self._nova_pagina(INTERNA)
+            separador = pagina.chaves[meio]
+            nova.chaves = pagina.chaves[meio + 1:]
+            nova.filhos = pagina.filhos[meio + 1:]
+            del pagina.chaves[meio:]
+            del pagina.filhos[meio + 1:]
+        self._marcar_suja(nova)
+        self._marcar_suja(pagina)
+        return separador, nova
+
+    # ===============================================================
+    # DELEÇÃO
+    # ===============================================================
+
+    def deletar(self, chave):
+        caminho = self._descer(chave)
+        folha = caminho[-1][0]
+        indice = bisect_left(folha.chaves, chave)
+        if indice == len(folha.chaves) or folha.chaves[indice] != chave:
+            return # Chave não encontrada
+        del folha.chaves[indice]
+        self._marcar_suja(folha)
+        self.contagem -= 1
+
+        # Corrige páginas com menos da metade da capacidade, de baixo para cima.
+        pagina = folha
+        for pai, indice_filho in reversed(caminho[:-1]):
+            minimo = (self.capacidade_folha if pagina.tipo == FOLHA else self.capacidade_interna) // 2
+            if len(pagina.chaves) >= minimo:
+                return
+            self._corrigir_falta(pai, indice_filho, pagina, minimo)
+            pagina = pai
+
+        raiz = self._ler_pagina(self.raiz)
+        if raiz.tipo == INTERNA and not raiz.chaves:
+            self.raiz = raiz.filhos[0]
+            self.altura -= 1
+            self._liberar_pagina(raiz)
+
+    def _corrigir_falta(self, pai, indice, pagina, minimo):
+        """Empresta uma chave de um irmão ou funde a página com ele."""
+        esquerda = self._ler_pagina(pai.filhos[indice - 1]) if indice > 0 else None
+        direita = self._ler_pagina(pai.filhos[indice + 1]) if indice + 1 < len(pai.filhos) else None
+        folha = pagina.tipo == FOLHA
+
+        if esquerda is not None and len(esquerda.chaves) > minimo:
+            if folha:
+                pagina.chaves.insert(0, esquerda.chaves.pop())
+                pai.chaves[indice - 1] = pagina.chaves[0]
+            else:
+                pagina.chaves.insert(0, pai.chaves[indice - 1])
+                pagina.filhos.insert(0, esquerda.filhos.pop())
+                pai.chaves[indice - 1] = esquerda.chaves.pop()
+            alteradas = (esquerda, pagina, pai)
+        elif direita is not None and len(direita.chaves) > minimo:
+            if folha:
+                pagina.chaves.append(direita.chaves.pop(0))
+                pai.chaves[indice] = direita.chaves[0]
+            else:
+                pagina.chaves.append(pai.chaves[indice])
+                pagina.filhos.append(direita.filhos.pop(0))
+                pai.chaves[indice] = direita.chaves.pop(0)
+            alteradas = (direita, pagina, pai)
+        else:
+            # Funde a página da direita do par na da esquerda.
+            if esquerda is not None:
+                destino, origem, separador_indice = esquerda, pagina, indice - 1
+            else:
+                destino, origem, separador_indice = pagina, direita, indice
+            if folha:
+                destino.chaves.extend(origem.chaves)
+                destino.proxima = origem.proxima
+            else:
+                destino.chaves.append(pai.chaves[separador_indice])
+                destino.chaves.extend(origem.chaves)
+                destino.filhos.extend(origem.filhos)
+            del pai.chaves[separador_indice]
+            del pai.filhos[separador_indice + 1]
+            self._liberar_pagina(origem)
+            alteradas = (destino, pai)
+        for alterada in alteradas:
+            self._marcar_suja(alterada)
+
+
+if __name__ == "__main__":
+    import random
+    import tempfile
+
+    caminho = os.path.join(tempfile.mkdtemp(), "arvore_b.db")
+    print(f"\n--- ÁRVORE B+ EM DISCO ({caminho}) ---")
+    with ArvoreBMaisDisco(caminho, paginas_em_cache=16, tamanho_pagina=256) as arvore:
+        chaves = random.sample(range(1, 10000), 2000)
+        for chave in chaves:
+            arvore.inserir(chave)
+        for chave in chaves[:500]:
+            arvore.deletar(chave)
+        print(f"Chaves: {len(arvore)}, altura: {arvore.altura}")
+        print(f"Nós no intervalo [100, 300]: {arvore.encontrar_nos_intervalo(100, 300)}")
+
+    with ArvoreBMaisDisco(caminho) as reaberta:
+        print(f"Após reabrir: {len(reaberta)} chaves, ordenadas: "
+              f"{reaberta.percurso_em_ordem() == sorted(chaves[500:])}")
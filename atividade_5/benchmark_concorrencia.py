@@ -0,0 +1,94 @@
+# benchmark_concorrencia.py
+# Teste de estresse e vazão da ArvoreAVLConcorrente contra a ArvoreAVL
+# protegida por uma única trava global, variando o número de threads leitoras.
+import importlib.util
+import os
+import random
+import sys
+import threading
+import time
+
+CAMINHO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Árvore AVL.py")
+spec = importlib.util.spec_from_file_location("arvore_avl", CAMINHO)
+arvore_avl = importlib.util.module_from_spec(spec)
+sys.modules["arvore_avl"] = arvore_avl
+spec.loader.exec_module(arvore_avl)
+
+DURACAO = 1.0
+UNIVERSO = 20000
+
+
+class ArvoreComTravaGlobal:
+    """Linha de base: toda chamada passa pela mesma trava."""
+    def __init__(self, chaves):
+        self.arvore = arvore_avl.ArvoreAVL.from_iterable(chaves)
+        self.trava = threading.Lock()
+
+    def inserir(self, chave):
+        with self.trava:
+            self.arvore.inserir(chave)
+
+    def deletar(self, chave):
+        with self.trava:
+            self.arvore.deletar(chave)
+
+    def obter_profundidade_no(self, chave):
+        with self.trava:
+            return self.arvore.obter_profundidade_no(chave)
+
+    def encontrar_nos_intervalo(self, chave_min, chave_max):
+        with self.trava:
+            return self.arvore.encontrar_nos_intervalo(chave_min, chave_max)
+
+
+def escritor(arvore, presentes, parar):
+    # Única thread que escreve: alterna inserções e remoções de chaves ímpares.
+    while not parar.is_set():
+        chave = random.randrange(1, UNIVERSO, 2)
+        if chave in presentes:
+            arvore.deletar(chave)
+            presentes.discard(chave)
+        else:
+            arvore.inserir(chave)
+            presentes.add(chave)
+
+
+def leitor(arvore, parar, contagem, erros):
+    operacoes = 0
+    while not parar.is_set():
+        chave = random.randrange(0, UNIVERSO, 2)
+        # Chaves pares nunca são removidas: devem ser sempre encontradas.
+        if arvore.obter_profundidade_no(chave) == -1:
+            erros.append(chave)
+        inicio = random.randrange(UNIVERSO)
+        faixa = arvore.encontrar_nos_intervalo(inicio, inicio + 50)
+        if faixa != sorted(faixa):
+            erros.append(faixa)
+        operacoes += 2
+    contagem.append(operacoes)
+
+
+def executar(arvore, leitores):
+    parar = threading.Event()
+    contagem, erros = [], []
+    threads = [threading.Thread(target=escritor, args=(arvore, set(), parar))]
+    threads += [threading.Thread(target=leitor, args=(arvore, parar, contagem, erros))
+                for _ in range(leitores)]
+    for thread in threads:
+        thread.start()
+    time.sleep(DURACAO)
+    parar.set()
+    for thread in threads:
+        thread.join()
+    if erros:
+        raise AssertionError(f"{len(erros)} leituras inconsistentes")
+    return sum(contagem) / DURACAO
+
+
+if __name__ == "__main__":
+    pares = range(0, UNIVERSO, 2)
+    for leitores in (1, 2, 4, 8):
+        base = executar(ArvoreComTravaGlobal(pares), leitores)
+        concorrente = executar(arvore_avl.ArvoreAVLConcorrente(pares), leitores)
+        print(f"{leitores} leitor(es): trava global {base:10.0f} ops/s   "
+              f"cópia na escrita {concorrente:10.0f} ops/s")
@@ -0,0 +1,63 @@
+# benchmark_disco.py
+# Compara a árvore B+ em disco com a ArvoreAVL em memória, com conjuntos de
+# chaves menores e bem maiores que o cache de páginas.
+import importlib.util
+import os
+import random
+import sys
+import tempfile
+import time
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, PASTA)
+from Arvore_B_disco import ArvoreBMaisDisco  # noqa: E402
+
+spec = importlib.util.spec_from_file_location("arvore_avl", os.path.join(PASTA, "Árvore AVL.py"))
+arvore_avl = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(arvore_avl)
+
+PAGINAS_EM_CACHE = 64
+TAMANHO_PAGINA = 4096
+
+
+def medir(arvore, chaves):
+    tempos = {}
+    inicio = time.perf_counter()
+    for chave in chaves:
+        arvore.inserir(chave)
+    tempos["inserir"] = (time.perf_counter() - inicio) / len(chaves)
+
+    amostra = random.sample(chaves, min(len(chaves), 20000))
+    inicio = time.perf_counter()
+    for chave in amostra:
+        arvore.obter_profundidade_no(chave)
+    tempos["buscar"] = (time.perf_counter() - inicio) / len(amostra)
+
+    inicio = time.perf_counter()
+    for _ in range(100):
+        chave = random.choice(chaves)
+        arvore.encontrar_nos_intervalo(chave, chave + 10000)
+    tempos["intervalo"] = (time.perf_counter() - inicio) / 100
+
+    inicio = time.perf_counter()
+    for chave in amostra:
+        arvore.deletar(chave)
+    tempos["deletar"] = (time.perf_counter() - inicio) / len(amostra)
+    return tempos
+
+
+if __name__ == "__main__":
+    capacidade = PAGINAS_EM_CACHE * (TAMANHO_PAGINA // 8)
+    print(f"Cache: {PAGINAS_EM_CACHE} páginas de {TAMANHO_PAGINA} bytes (~{capacidade} chaves)")
+    tamanhos = [int(t) for t in sys.argv[1:]] or [capacidade // 10, capacidade, capacidade * 10]
+    for n in tamanhos:
+        chaves = random.sample(range(n * 100), n)
+        caminho = os.path.join(tempfile.mkdtemp(), "arvore_b.db")
+        with ArvoreBMaisDisco(caminho, PAGINAS_EM_CACHE, TAMANHO_PAGINA) as arvore_b:
+            disco = medir(arvore_b, chaves)
+        memoria = medir(arvore_avl.ArvoreAVL(), chaves)
+        os.remove(caminho)
+        print(f"n={n}")
+        for operacao in disco:
+            print(f"  {operacao:<10} B+ disco {disco[operacao] * 1e6:10.1f} us"
+                  f"   AVL memória {memoria[operacao] * 1e6:10.1f} us")
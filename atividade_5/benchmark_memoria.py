@@ -0,0 +1,41 @@
+# benchmark_memoria.py
+# Compara a memória e o tempo de busca da ArvoreAVL com nós objeto
+# e com armazenamento em colunas ("array").
+import importlib.util
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+CAMINHO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Árvore AVL.py")
+spec = importlib.util.spec_from_file_location("arvore_avl", CAMINHO)
+arvore_avl = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(arvore_avl)
+
+
+def medir(armazenamento, chaves):
+    tracemalloc.start()
+    arvore = arvore_avl.ArvoreAVL(armazenamento=armazenamento)
+    for chave in chaves:
+        arvore.inserir(chave)
+    memoria = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    inicio = time.perf_counter()
+    for chave in chaves:
+        arvore.obter_profundidade_no(chave)
+    busca = (time.perf_counter() - inicio) / len(chaves)
+    return memoria, busca
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    # Chaves acima do cache de inteiros pequenos, como IDs reais.
+    chaves = random.sample(range(10 ** 6, 10 ** 9), n)
+    resultados = {}
+    for armazenamento in ("objetos", "array"):
+        memoria, busca = medir(armazenamento, chaves)
+        resultados[armazenamento] = memoria
+        print(f"{armazenamento:<8} {memoria / n:8.1f} bytes/chave  {busca * 1e6:8.2f} us/busca")
+    print(f"Redução de memória: {resultados['objetos'] / resultados['array']:.1f}x")
@@ -0,0 +1,53 @@
+# benchmark_paralelo.py
+# Mede o ganho das operações em lote paralelas da ArvoreAVL conforme o
+# número de processos aumenta.
+import importlib.util
+import os
+import random
+import sys
+import time
+
+CAMINHO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Árvore AVL.py")
+spec = importlib.util.spec_from_file_location("arvore_avl", CAMINHO)
+arvore_avl = importlib.util.module_from_spec(spec)
+sys.modules["arvore_avl"] = arvore_avl
+spec.loader.exec_module(arvore_avl)
+ArvoreAVL = arvore_avl.ArvoreAVL
+
+
+def cronometrar(funcao):
+    inicio = time.perf_counter()
+    funcao()
+    return time.perf_counter() - inicio
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    maximo = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    chaves_a = random.sample(range(n * 4), n)
+    chaves_b = random.sample(range(n * 4), n)
+
+    print(f"n={n}, até {maximo} processos (cpu_count={os.cpu_count()})")
+    for armazenamento in ("objetos", "array"):
+        print(f"armazenamento {armazenamento!r}")
+        base_carga = cronometrar(lambda: ArvoreAVL.from_iterable(chaves_a, armazenamento=armazenamento))
+        a = ArvoreAVL.from_iterable(chaves_a, armazenamento=armazenamento)
+        b = ArvoreAVL.from_iterable(chaves_b, armazenamento=armazenamento)
+        base_uniao = cronometrar(lambda: a.union(b))
+        print(f"  serial     carga {base_carga:7.2f} s   união {base_uniao:7.2f} s")
+
+        trabalhadores = 1
+        while trabalhadores <= maximo:
+            carga = cronometrar(lambda: ArvoreAVL.from_iterable_paralelo(
+                chaves_a, trabalhadores, armazenamento=armazenamento))
+            a = ArvoreAVL.from_iterable(chaves_a, armazenamento=armazenamento)
+            uniao = cronometrar(lambda: a.operacao_paralela(b, "union", trabalhadores))
+            print(f"  {trabalhadores:2d} proc.   carga {carga:7.2f} s ({base_carga / carga:4.2f}x)"
+                  f"   união {uniao:7.2f} s ({base_uniao / uniao:4.2f}x)")
+            trabalhadores *= 2
+
+        # Tamanhos muito diferentes: operacao_paralela usa o join serial.
+        a = ArvoreAVL.from_iterable(chaves_a, armazenamento=armazenamento)
+        pequena = ArvoreAVL.from_iterable(chaves_b[:100], armazenamento=armazenamento)
+        uniao = cronometrar(lambda: a.operacao_paralela(pequena, "union", maximo))
+        print(f"  união de 100 chaves em {n}: {uniao * 1e3:.1f} ms")
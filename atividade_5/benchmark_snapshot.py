@@ -0,0 +1,56 @@
+# benchmark_snapshot.py
+# Mede gravação, carga via mmap e primeira escrita do snapshot binário, da
+# ArvoreAVL e da BinarySearchTree, comparando com a reconstrução por inserções
+# sucessivas.
+import importlib.util
+import os
+import random
+import sys
+import tempfile
+import time
+
+CAMINHO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Árvore AVL.py")
+spec = importlib.util.spec_from_file_location("arvore_avl", CAMINHO)
+arvore_avl = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(arvore_avl)
+ArvoreAVL = arvore_avl.ArvoreAVL
+from arvores import BinarySearchTree  # noqa: E402 - o módulo acima põe a raiz no sys.path
+
+
+def cronometrar(rotulo, funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    print(f"  {rotulo:<32} {time.perf_counter() - inicio:8.3f} s")
+    return resultado
+
+
+if __name__ == "__main__":
+    # Use 10000000 para o cenário de produção (exige alguns GB de RAM).
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    chaves = random.sample(range(n * 10), n)
+    arvore = ArvoreAVL.from_iterable(chaves)
+    caminho = os.path.join(tempfile.mkdtemp(), "arvore.avl")
+
+    print(f"n={n}")
+    cronometrar("salvar", lambda: arvore.salvar(caminho))
+    print(f"  {'tamanho do arquivo':<32} {os.path.getsize(caminho) / 2 ** 20:8.1f} MiB")
+    mapeada = cronometrar("carregar (mmap)", lambda: ArvoreAVL.carregar(caminho))
+    cronometrar("1000 buscas no arquivo", lambda: [mapeada.obter_profundidade_no(c) for c in chaves[:1000]])
+    cronometrar("primeira escrita (materializa)", lambda: mapeada.inserir(-1))
+    assert mapeada.percurso_em_ordem()[1:] == arvore.percurso_em_ordem()
+
+    amostra = chaves[:min(n, 1000000)]
+    def reinserir():
+        reconstruida = ArvoreAVL()
+        for chave in amostra:
+            reconstruida.inserir(chave)
+    cronometrar(f"reinserir {len(amostra)} chaves", reinserir)
+
+    print("BinarySearchTree")
+    bst = BinarySearchTree._from_sorted(sorted(chaves))
+    cronometrar("salvar", lambda: bst.salvar(caminho))
+    mapeada = cronometrar("carregar (mmap)", lambda: BinarySearchTree.carregar(caminho))
+    cronometrar("1000 buscas no arquivo", lambda: [mapeada.search(c) for c in chaves[:1000]])
+    cronometrar("primeira escrita (materializa)", lambda: mapeada.insert(-1))
+    assert mapeada.search(-1) and mapeada.height() == bst.height()
+    os.remove(caminho)
@@ -1,21 +1,179 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import chain
+from operator import itemgetter
+import math
+import os
+import sys
+import threading
+
+# O formato de snapshot é compartilhado com a BinarySearchTree, no pacote
+# `arvores` da raiz do repositório.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from arvores.snapshot import SnapshotMapeado, gravar_snapshot  # noqa: E402
+
+
 class No:
     """
     Representa um nó na Árvore AVL.
-    Cada nó armazena uma chave, referências para os filhos e sua altura.
+    Cada nó armazena uma chave, referências para os filhos, sua altura e o
+    tamanho (número de nós) da subárvore da qual é raiz.
     """
+    __slots__ = ("chave", "esquerda", "direita", "altura", "tamanho")
+
     def __init__(self, chave):
         self.chave = chave
         self.esquerda = None
         self.direita = None
         self.altura = 1 # A altura de um novo nó (folha) é sempre 1
+        self.tamanho = 1
+
+
+class NoMapa(No):
+    """Nó do modo mapa: guarda também o valor associado à chave."""
+    __slots__ = ("valor",)
+
+    def __init__(self, chave):
+        super().__init__(chave)
+        self.valor = None
+
+
+class NoMulticonjunto(No):
+    """Nó do modo multiconjunto: guarda quantas vezes a chave foi inserida."""
+    __slots__ = ("contagem",)
+
+    def __init__(self, chave):
+        super().__init__(chave)
+        self.contagem = 1
+
+
+TIPOS_DE_NO = {"conjunto": No, "mapa": NoMapa, "multiconjunto": NoMulticonjunto}
+# Marca de chave ausente onde None pode ser um valor legítimo (modo mapa).
+AUSENTE = object()
+
 
 class ArvoreAVL:
     """
     Implementa a estrutura e as operações de uma Árvore AVL.
+
+    O armazenamento é escolhido na construção: "objetos" (padrão) usa um
+    objeto `No` por chave; "array" usa a `ArvoreAVLCompacta`, com colunas
+    paralelas e nós identificados por índice.
+
+    O modo também é escolhido na construção (apenas com nós objeto):
+    "conjunto" (padrão) rejeita chaves duplicadas; "mapa" associa um valor a
+    cada chave (arvore[chave] = valor); "multiconjunto" conta as repetições de
+    cada chave no próprio nó. As estatísticas de ordem contam chaves distintas.
+
+    `instrumentacao` recebe uma arvores.Instrumentacao, que passa a medir
+    rotações, comparações e nós visitados de todas as operações que alteram a
+    árvore: `inserir`, `deletar`, os acessos de mapa e as operações em lote.
     """
-    def __init__(self):
+    instrumentacao = None
+    _medida = None
+    _no_alvo = None  # nó inserido ou encontrado pelo último _inserir_recursivo (modo mapa)
+    _removido = None  # valor do nó removido pelo último _deletar_recursivo (modo mapa)
+
+    def __new__(cls, armazenamento="objetos", **opcoes):
+        if cls is ArvoreAVL and armazenamento == "array":
+            return super().__new__(ArvoreAVLCompacta)
+        return super().__new__(cls)
+
+    def __init__(self, armazenamento="objetos", modo="conjunto", instrumentacao=None):
+        if armazenamento != "objetos":
+            raise ValueError(f"Armazenamento desconhecido: {armazenamento!r}")
+        if modo not in TIPOS_DE_NO:
+            raise ValueError(f"Modo desconhecido: {modo!r}")
+        self.modo = modo
+        self._tipo_no = TIPOS_DE_NO[modo]
+        self.instrumentacao = instrumentacao
         self.raiz = None
 
+    # ===============================================================
+    # CONSTRUÇÃO EM LOTE
+    # ===============================================================
+
+    @classmethod
+    def from_sorted(cls, chaves, **opcoes):
+        """
+        Constrói uma árvore perfeitamente balanceada em O(n) a partir de chaves
+        em ordem estritamente crescente. Chaves duplicadas ou fora de ordem
+        levantam ValueError, como em `inserir`.
+
+        No modo mapa os elementos são pares (chave, valor); no modo
+        multiconjunto chaves repetidas (adjacentes) são contadas.
+        """
+        arvore = cls(**opcoes)
+        chaves = list(chaves)
+        conteudos = None
+        if arvore.modo == "mapa":
+            conteudos = [valor for _, valor in chaves]
+            chaves = [chave for chave, _ in chaves]
+        for i in range(1, len(chaves)):
+            if chaves[i - 1] == chaves[i] and arvore.modo != "multiconjunto":
+                raise ValueError("Chave duplicada não permitida na Árvore AVL.")
+            if chaves[i - 1] > chaves[i]:
+                raise ValueError("As chaves devem estar em ordem crescente.")
+        if arvore.modo == "multiconjunto":
+            chaves, conteudos = arvore._agrupar_lote(chaves)
+        arvore.raiz = arvore._construir_balanceada(chaves, 0, len(chaves) - 1, conteudos)
+        return arvore
+
+    @classmethod
+    def from_iterable(cls, chaves, **opcoes):
+        """
+        Ordena as chaves e constrói a árvore com `from_sorted`.
+        O custo total é dominado pela ordenação, O(n log n).
+
+        No modo mapa recebe pares (chave, valor) ou um dicionário e, como em
+        `inserir`, o último valor de uma chave repetida prevalece.
+        """
+        if opcoes.get("modo") == "mapa":
+            arvore = cls(**opcoes)
+            chaves, valores = arvore._agrupar_lote(chaves)
+            arvore.raiz = arvore._construir_balanceada(chaves, 0, len(chaves) - 1, valores)
+            return arvore
+        return cls.from_sorted(sorted(chaves), **opcoes)
+
+    def _construir_balanceada(self, chaves, inicio, fim, conteudos=None):
+        """
+        Usa o elemento do meio de chaves[inicio..fim] como raiz e constrói as
+        subárvores com as metades. A profundidade da recursão é O(log n).
+        `conteudos`, paralelo a `chaves`, traz os valores (modo mapa) ou as
+        contagens (modo multiconjunto).
+        """
+        if inicio > fim:
+            return None
+        meio = (inicio + fim) // 2
+        no = self._tipo_no(chaves[meio])
+        if conteudos is not None:
+            self._definir_conteudo(no, conteudos[meio])
+        no.esquerda = self._construir_balanceada(chaves, inicio, meio - 1, conteudos)
+        no.direita = self._construir_balanceada(chaves, meio + 1, fim, conteudos)
+        self._atualizar_altura(no)
+        return no
+
+    def _agrupar_lote(self, itens):
+        """
+        Ordena um lote e junta as chaves iguais conforme o modo. Retorna
+        (chaves, conteudos): no modo conjunto conteudos é None; no mapa, o
+        último valor de cada chave; no multiconjunto, quantas vezes ela aparece.
+        """
+        if self.modo == "conjunto":
+            return sorted(set(itens)), None
+        if self.modo == "multiconjunto":
+            itens = ((chave, 1) for chave in itens)
+        elif hasattr(itens, "items"):
+            itens = itens.items()
+        chaves, conteudos = [], []
+        for chave, conteudo in sorted(itens, key=itemgetter(0)):
+            if chaves and chaves[-1] == chave:
+                conteudos[-1] = conteudos[-1] + conteudo if self.modo == "multiconjunto" else conteudo
+            else:
+                chaves.append(chave)
+                conteudos.append(conteudo)
+        return chaves, conteudos
+
     # ===============================================================
     # TAREFA 0: IMPLEMENTAR MÉTODOS AUXILIARES E ROTAÇÕES
     # ===============================================================
@@ -36,14 +194,24 @@ class ArvoreAVL:
             return 0
         return self.obter_altura(no.esquerda) - self.obter_altura(no.direita)
 
+    def obter_tamanho(self, no):
+        """
+        Retorna o número de nós da subárvore. Se o nó for nulo, o tamanho é 0.
+        """
+        if not no:
+            return 0
+        return no.tamanho
+
     def _atualizar_altura(self, no):
         """
         Atualiza a altura de um nó com base na altura máxima de seus filhos.
         A altura é 1 + max(altura(esquerda), altura(direita)).
+        O tamanho da subárvore é atualizado junto, pois muda nos mesmos pontos.
         """
         if not no:
             return
         no.altura = 1 + max(self.obter_altura(no.esquerda), self.obter_altura(no.direita))
+        no.tamanho = 1 + self.obter_tamanho(no.esquerda) + self.obter_tamanho(no.direita)
 
     def obter_no_valor_minimo(self, no):
         """
@@ -91,18 +259,34 @@ class ArvoreAVL:
     # TAREFA 1: IMPLEMENTAR INSERÇÃO E DELEÇÃO COM BALANCEAMENTO
     # ===============================================================
 
-    def inserir(self, chave):
-        """Método público para inserir uma chave na árvore."""
-        self.raiz = self._inserir_recursivo(self.raiz, chave)
+    def inserir(self, chave, valor=None):
+        """Método público para inserir uma chave na árvore (com seu valor, no modo mapa)."""
+        self._medir("inserir", self._inserir_recursivo, self.raiz, chave, valor)
 
-    def _inserir_recursivo(self, no_atual, chave):
+    def _inserir_recursivo(self, no_atual, chave, valor=None, substituir=True):
         # Passo 1: Realiza a inserção padrão de uma BST.
         if not no_atual:
-            return No(chave)
-        elif chave < no_atual.chave:
-            no_atual.esquerda = self._inserir_recursivo(no_atual.esquerda, chave)
+            no = self._tipo_no(chave)
+            if self.modo == "mapa":
+                no.valor = valor
+                self._no_alvo = no
+            return no
+        if self._medida is not None:
+            self._medida.visitar(1 if chave < no_atual.chave else 2)
+        if chave < no_atual.chave:
+            no_atual.esquerda = self._inserir_recursivo(no_atual.esquerda, chave, valor, substituir)
         elif chave > no_atual.chave:
-            no_atual.direita = self._inserir_recursivo(no_atual.direita, chave)
+            no_atual.direita = self._inserir_recursivo(no_atual.direita, chave, valor, substituir)
+        elif self.modo == "mapa":
+            # A chave já existe: apenas substitui o valor (exceto em setdefault),
+            # sem mudar a estrutura
+            if substituir:
+                no_atual.valor = valor
+            self._no_alvo = no_atual
+            return no_atual
+        elif self.modo == "multiconjunto":
+            no_atual.contagem += 1
+            return no_atual
         else:
             # Chaves duplicadas não são permitidas
             raise ValueError("Chave duplicada não permitida na Árvore AVL.")
@@ -116,38 +300,54 @@ class ArvoreAVL:
         # Passo 4: Verifica se o nó ficou desbalanceado e aplica as rotações corretas.
         # Caso 1: Desbalanceamento à Esquerda-Esquerda (Rotação Simples à Direita)
         if fator_balanceamento > 1 and chave < no_atual.esquerda.chave:
+            self._anotar_rotacao("direita", no_atual.chave)
             return self._rotacao_direita(no_atual)
 
         # Caso 2: Desbalanceamento à Direita-Direita (Rotação Simples à Esquerda)
         if fator_balanceamento < -1 and chave > no_atual.direita.chave:
+            self._anotar_rotacao("esquerda", no_atual.chave)
             return self._rotacao_esquerda(no_atual)
 
         # Caso 3: Desbalanceamento à Esquerda-Direita (Rotação Dupla)
         if fator_balanceamento > 1 and chave > no_atual.esquerda.chave:
+            self._anotar_rotacao("esquerda_direita", no_atual.chave)
             no_atual.esquerda = self._rotacao_esquerda(no_atual.esquerda)
             return self._rotacao_direita(no_atual)
 
         # Caso 4: Desbalanceamento à Direita-Esquerda (Rotação Dupla)
         if fator_balanceamento < -1 and chave < no_atual.direita.chave:
+            self._anotar_rotacao("direita_esquerda", no_atual.chave)
             no_atual.direita = self._rotacao_direita(no_atual.direita)
             return self._rotacao_esquerda(no_atual)
         
         return no_atual
 
     def deletar(self, chave):
-        """Método público para deletar uma chave da árvore."""
-        self.raiz = self._deletar_recursivo(self.raiz, chave)
+        """
+        Método público para deletar uma chave da árvore.
+        No modo multiconjunto, remove uma ocorrência da chave.
+        """
+        self._medir("deletar", self._deletar_recursivo, self.raiz, chave)
 
-    def _deletar_recursivo(self, no_atual, chave):
+    def _deletar_recursivo(self, no_atual, chave, ocorrencia=True):
         # Passo 1: Realiza a deleção padrão de uma BST.
         if not no_atual:
             return no_atual # Nó não encontrado
 
+        if self._medida is not None:
+            self._medida.visitar(1 if chave < no_atual.chave else 2)
         if chave < no_atual.chave:
-            no_atual.esquerda = self._deletar_recursivo(no_atual.esquerda, chave)
+            no_atual.esquerda = self._deletar_recursivo(no_atual.esquerda, chave, ocorrencia)
         elif chave > no_atual.chave:
-            no_atual.direita = self._deletar_recursivo(no_atual.direita, chave)
+            no_atual.direita = self._deletar_recursivo(no_atual.direita, chave, ocorrencia)
         else: # Nó encontrado
+            # `ocorrencia` é falso quando o nó é o sucessor já copiado para cima:
+            # ele sai inteiro, sem registrar valor nem descontar a contagem.
+            if ocorrencia and self.modo == "mapa":
+                self._removido = no_atual.valor
+            elif ocorrencia and self.modo == "multiconjunto" and no_atual.contagem > 1:
+                no_atual.contagem -= 1
+                return no_atual
             # Caso 1: Nó com um filho ou nenhum filho.
             if no_atual.esquerda is None:
                 temp = no_atual.direita
@@ -162,8 +362,9 @@ class ArvoreAVL:
             # Encontra o sucessor em ordem (menor nó da subárvore direita)
             sucessor = self.obter_no_valor_minimo(no_atual.direita)
             no_atual.chave = sucessor.chave # Copia a chave do sucessor
+            self._copiar_conteudo(sucessor, no_atual)
             # Deleta o sucessor
-            no_atual.direita = self._deletar_recursivo(no_atual.direita, sucessor.chave)
+            no_atual.direita = self._deletar_recursivo(no_atual.direita, sucessor.chave, False)
 
         # Se a árvore tinha apenas um nó, retorna
         if no_atual is None:
@@ -178,24 +379,57 @@ class ArvoreAVL:
         # Passo 4: Verifica o desbalanceamento e aplica as rotações.
         # Rotação Simples à Direita (Esquerda-Esquerda)
         if fator_balanceamento > 1 and self.obter_fator_balanceamento(no_atual.esquerda) >= 0:
+            self._anotar_rotacao("direita", no_atual.chave)
             return self._rotacao_direita(no_atual)
 
         # Rotação Simples à Esquerda (Direita-Direita)
         if fator_balanceamento < -1 and self.obter_fator_balanceamento(no_atual.direita) <= 0:
+            self._anotar_rotacao("esquerda", no_atual.chave)
             return self._rotacao_esquerda(no_atual)
 
         # Rotação Dupla Esquerda-Direita
         if fator_balanceamento > 1 and self.obter_fator_balanceamento(no_atual.esquerda) < 0:
+            self._anotar_rotacao("esquerda_direita", no_atual.chave)
             no_atual.esquerda = self._rotacao_esquerda(no_atual.esquerda)
             return self._rotacao_direita(no_atual)
 
         # Rotação Dupla Direita-Esquerda
         if fator_balanceamento < -1 and self.obter_fator_balanceamento(no_atual.direita) > 0:
+            self._anotar_rotacao("direita_esquerda", no_atual.chave)
             no_atual.direita = self._rotacao_direita(no_atual.direita)
             return self._rotacao_esquerda(no_atual)
 
         return no_atual
 
+    def _medir(self, operacao, funcao, *argumentos):
+        """
+        Executa `funcao(*argumentos)`, que retorna a nova raiz, e a registra como
+        `operacao` na instrumentação. Toda operação que altera a árvore
+        (inserir, deletar, acessos de mapa, operações em lote) passa por aqui.
+        """
+        medida = self._iniciar_medida()
+        try:
+            self.raiz = funcao(*argumentos)
+        finally:
+            self._medida = None
+        if medida is not None:
+            medida.concluir(operacao, self.obter_altura(self.raiz))
+
+    def _iniciar_medida(self):
+        """
+        Decide no início de cada operação se ela será medida. Sem
+        instrumentação, o custo fica nesse teste e em um `is None` por nível.
+        """
+        instrumentacao = self.instrumentacao
+        if instrumentacao is None or not instrumentacao.iniciar():
+            return None
+        self._medida = instrumentacao
+        return instrumentacao
+
+    def _anotar_rotacao(self, tipo, chave):
+        if self._medida is not None:
+            self._medida.rotacao(tipo, chave)
+
     # ===============================================================
     # TAREFA 2 E 3: IMPLEMENTAR BUSCAS
     # ===============================================================
@@ -204,25 +438,53 @@ class ArvoreAVL:
         """
         Encontra e retorna uma lista com todas as chaves no intervalo [chave_min, chave_max].
         """
-        resultado = []
-        self._encontrar_nos_intervalo_recursivo(self.raiz, chave_min, chave_max, resultado)
-        return resultado
+        return list(self.iterar_intervalo(chave_min, chave_max))
 
-    def _encontrar_nos_intervalo_recursivo(self, no, chave_min, chave_max, resultado):
-        if not no:
-            return
+    def iterar_intervalo(self, chave_min=None, chave_max=None, limite=None, reverso=False, apos=None):
+        """
+        Gera, sob demanda, as chaves no intervalo [chave_min, chave_max] em ordem
+        crescente (ou decrescente, com reverso=True). Um limite None deixa o lado
+        correspondente aberto.
 
-        # Se a chave do nó atual for maior que a chave mínima, pode haver chaves no intervalo na subárvore esquerda
-        if chave_min < no.chave:
-            self._encontrar_nos_intervalo_recursivo(no.esquerda, chave_min, chave_max, resultado)
-        
-        # Se a chave do nó atual estiver dentro do intervalo, adicione-a ao resultado
-        if chave_min <= no.chave <= chave_max:
-            resultado.append(no.chave)
-            
-        # Se a chave do nó atual for menor que a chave máxima, pode haver chaves no intervalo na subárvore direita
-        if chave_max > no.chave:
-            self._encontrar_nos_intervalo_recursivo(no.direita, chave_min, chave_max, resultado)
+        `limite` interrompe a geração após esse número de chaves e `apos` retoma a
+        partir da chave seguinte à informada (a última da página anterior), de modo
+        que cada página visita O(log n + limite) nós. Usa uma pilha explícita.
+        """
+        nos = self._iterar_nos_intervalo(chave_min, chave_max, limite, reverso, apos)
+        return (no.chave for no in nos)
+
+    def _iterar_nos_intervalo(self, chave_min, chave_max, limite, reverso, apos):
+        if reverso:
+            inicio, fim = chave_max, chave_min
+            antes = lambda a, b: a > b
+            primeiro, segundo = "direita", "esquerda"
+        else:
+            inicio, fim = chave_min, chave_max
+            antes = lambda a, b: a < b
+            primeiro, segundo = "esquerda", "direita"
+
+        # Desce até a primeira chave do intervalo, guardando o caminho na pilha.
+        pilha = []
+        no = self.raiz
+        while no is not None:
+            if (inicio is not None and antes(no.chave, inicio)) or \
+                    (apos is not None and not antes(apos, no.chave)):
+                no = getattr(no, segundo)
+            else:
+                pilha.append(no)
+                no = getattr(no, primeiro)
+
+        gerados = 0
+        while pilha and (limite is None or gerados < limite):
+            no = pilha.pop()
+            if fim is not None and antes(fim, no.chave):
+                return
+            yield no
+            gerados += 1
+            no = getattr(no, segundo)
+            while no is not None:
+                pilha.append(no)
+                no = getattr(no, primeiro)
 
     def obter_profundidade_no(self, chave):
         """
@@ -241,6 +503,514 @@ class ArvoreAVL:
             profundidade += 1
         return -1 # Nó não encontrado
 
+    # ===============================================================
+    # MODOS MAPA E MULTICONJUNTO
+    # ===============================================================
+
+    def _buscar_no(self, chave):
+        """Retorna o nó com a chave, ou None."""
+        no_atual = self.raiz
+        while no_atual is not None:
+            if chave == no_atual.chave:
+                return no_atual
+            no_atual = no_atual.esquerda if chave < no_atual.chave else no_atual.direita
+        return None
+
+    def _copiar_conteudo(self, origem, destino):
+        """Copia o valor (modo mapa) ou a contagem (modo multiconjunto) entre nós."""
+        if self.modo == "mapa":
+            destino.valor = origem.valor
+        elif self.modo == "multiconjunto":
+            destino.contagem = origem.contagem
+
+    def _definir_conteudo(self, no, conteudo):
+        if self.modo == "mapa":
+            no.valor = conteudo
+        elif self.modo == "multiconjunto":
+            no.contagem = conteudo
+
+    def _exigir_modo(self, modo):
+        if self.modo != modo:
+            raise TypeError(f"Operação disponível apenas no modo {modo!r}.")
+
+    def _exigir_mesmo_modo(self, outra):
+        if outra.modo != self.modo:
+            raise TypeError(f"Árvores de modos diferentes: {self.modo!r} e {outra.modo!r}.")
+
+    def _opcoes(self):
+        """Opções de construção de uma árvore vazia do mesmo tipo (usadas por split e join)."""
+        return {"modo": self.modo, "instrumentacao": self.instrumentacao}
+
+    def __contains__(self, chave):
+        return self.obter_profundidade_no(chave) != -1
+
+    def __getitem__(self, chave):
+        self._exigir_modo("mapa")
+        no = self._buscar_no(chave)
+        if no is None:
+            raise KeyError(chave)
+        return no.valor
+
+    def __setitem__(self, chave, valor):
+        self._exigir_modo("mapa")
+        self._medir("inserir", self._inserir_recursivo, self.raiz, chave, valor)
+
+    def __delitem__(self, chave):
+        self.pop(chave)
+
+    def get(self, chave, padrao=None):
+        self._exigir_modo("mapa")
+        no = self._buscar_no(chave)
+        return padrao if no is None else no.valor
+
+    def setdefault(self, chave, padrao=None):
+        """Retorna o valor da chave, inserindo `padrao` se ela faltar, em uma só descida."""
+        self._exigir_modo("mapa")
+        try:
+            self._medir("setdefault", self._inserir_recursivo, self.raiz, chave, padrao, False)
+            return self._no_alvo.valor
+        finally:
+            self._no_alvo = None
+
+    def pop(self, chave, *padrao):
+        """Remove a chave e retorna seu valor, em uma só descida."""
+        self._exigir_modo("mapa")
+        self._removido = AUSENTE
+        try:
+            self._medir("pop", self._deletar_recursivo, self.raiz, chave)
+            valor = self._removido
+        finally:
+            self._removido = None
+        if valor is AUSENTE:
+            if padrao:
+                return padrao[0]
+            raise KeyError(chave)
+        return valor
+
+    def itens(self, chave_min=None, chave_max=None, limite=None, reverso=False, apos=None):
+        """Gera os pares (chave, valor) do intervalo, com as opções de `iterar_intervalo`."""
+        self._exigir_modo("mapa")
+        nos = self._iterar_nos_intervalo(chave_min, chave_max, limite, reverso, apos)
+        return ((no.chave, no.valor) for no in nos)
+
+    def contar(self, chave):
+        """Retorna quantas vezes a chave foi inserida (modo multiconjunto)."""
+        self._exigir_modo("multiconjunto")
+        no = self._buscar_no(chave)
+        return 0 if no is None else no.contagem
+
+    # ===============================================================
+    # ESTATÍSTICAS DE ORDEM (usam o tamanho das subárvores, O(log n))
+    # ===============================================================
+
+    def __len__(self):
+        return self.obter_tamanho(self.raiz)
+
+    def _contar_menores(self, chave, inclusivo=False):
+        """Conta as chaves menores que `chave` (ou menores ou iguais, se inclusivo)."""
+        contagem = 0
+        no_atual = self.raiz
+        while no_atual is not None:
+            if chave < no_atual.chave or (chave == no_atual.chave and not inclusivo):
+                no_atual = no_atual.esquerda
+            else:
+                contagem += self.obter_tamanho(no_atual.esquerda) + 1
+                no_atual = no_atual.direita
+        return contagem
+
+    def rank(self, chave):
+        """
+        Retorna quantas chaves da árvore são menores que `chave`.
+        Se a chave existir, é a sua posição (a partir de 0) no percurso em ordem.
+        """
+        return self._contar_menores(chave)
+
+    def select(self, k):
+        """
+        Retorna a k-ésima menor chave, contando a partir de 0.
+        Levanta IndexError se k estiver fora do intervalo [0, len(arvore)).
+        """
+        if not 0 <= k < len(self):
+            raise IndexError("Posição fora do intervalo da árvore.")
+        no_atual = self.raiz
+        while True:
+            tamanho_esquerda = self.obter_tamanho(no_atual.esquerda)
+            if k < tamanho_esquerda:
+                no_atual = no_atual.esquerda
+            elif k == tamanho_esquerda:
+                return no_atual.chave
+            else:
+                k -= tamanho_esquerda + 1
+                no_atual = no_atual.direita
+
+    def contar_intervalo(self, chave_min, chave_max):
+        """
+        Conta as chaves no intervalo [chave_min, chave_max] sem percorrê-las.
+        """
+        if chave_min > chave_max:
+            return 0
+        return self._contar_menores(chave_max, inclusivo=True) - self._contar_menores(chave_min)
+
+    def mediana(self):
+        """
+        Retorna a mediana das chaves (a inferior, se a quantidade for par).
+        """
+        if not len(self):
+            raise ValueError("A árvore está vazia.")
+        return self.select((len(self) - 1) // 2)
+
+    # ===============================================================
+    # JOIN, SPLIT E OPERAÇÕES DE CONJUNTO EM LOTE
+    # ===============================================================
+    # Os algoritmos abaixo reaproveitam os nós das árvores de entrada em vez de
+    # criar nós novos. Com m <= n, união, interseção e diferença custam
+    # O(m log(n/m + 1)).
+
+    @classmethod
+    def join(cls, menores, chave, maiores, valor=None):
+        """
+        Junta duas árvores e uma chave em uma nova árvore AVL, em O(|h1 - h2| + 1).
+        Todas as chaves de `menores` devem ser menores que `chave` e todas as de
+        `maiores`, maiores. As duas árvores de entrada ficam vazias.
+        As duas devem ter o mesmo modo, que a nova árvore herda; `valor` é o
+        valor associado a `chave` (modo mapa) ou sua contagem (multiconjunto,
+        1 se omitida), como `split` os retorna.
+        """
+        menores._exigir_mesmo_modo(maiores)
+        if (len(menores) and menores.select(len(menores) - 1) >= chave) or \
+                (len(maiores) and maiores.select(0) <= chave):
+            raise ValueError("As chaves devem satisfazer menores < chave < maiores.")
+        arvore = cls(**menores._opcoes())
+        no = arvore._tipo_no(chave)
+        if arvore.modo == "mapa" or (arvore.modo == "multiconjunto" and valor is not None):
+            arvore._definir_conteudo(no, valor)
+        arvore.raiz = arvore._join(menores.raiz, no, maiores.raiz)
+        menores.raiz = maiores.raiz = None
+        return arvore
+
+    def split(self, chave):
+        """
+        Divide a árvore em O(log n) e retorna (menores, encontrada, maiores):
+        as árvores com as chaves menores e maiores que `chave` e o que havia
+        nela. `encontrada` diz se a chave existia (modo conjunto), é o seu valor
+        ou AUSENTE (modo mapa) ou a sua contagem, 0 se ausente (multiconjunto);
+        assim `join(menores, chave, maiores, encontrada)` refaz a árvore.
+        As duas têm o modo desta árvore, que fica vazia.
+        """
+        esquerda, no, direita = self._split(self.raiz, chave)
+        self.raiz = None
+        menores, maiores = type(self)(**self._opcoes()), type(self)(**self._opcoes())
+        menores.raiz, maiores.raiz = esquerda, direita
+        if self.modo == "mapa":
+            return menores, AUSENTE if no is None else no.valor, maiores
+        if self.modo == "multiconjunto":
+            return menores, 0 if no is None else no.contagem, maiores
+        return menores, no is not None, maiores
+
+    def union(self, outra):
+        """
+        Acrescenta a esta árvore as chaves de `outra`, que não é alterada. No modo
+        mapa os valores de `outra` prevalecem (como em dict.update); no modo
+        multiconjunto as contagens são somadas.
+        """
+        self._exigir_mesmo_modo(outra)
+        self._medir("union", self._uniao, self.raiz, self._importar(outra))
+
+    def intersection(self, outra):
+        """
+        Mantém nesta árvore apenas as chaves que também estão em `outra`, com os
+        valores desta árvore (modo mapa) ou a menor das contagens (multiconjunto).
+        """
+        self._exigir_mesmo_modo(outra)
+        self._medir("intersection", self._intersecao, self.raiz, self._importar(outra))
+
+    def difference(self, outra):
+        """
+        Remove desta árvore as chaves que estão em `outra`. No modo
+        multiconjunto desconta as contagens de `outra`.
+        """
+        self._exigir_mesmo_modo(outra)
+        self._medir("difference", self._diferenca, self.raiz, self._importar(outra))
+
+    def insert_many(self, chaves):
+        """
+        Insere várias chaves de uma vez; chaves já presentes são ignoradas. No
+        modo mapa recebe pares (chave, valor) ou um dicionário e substitui os
+        valores existentes; no multiconjunto cada ocorrência é contada.
+        """
+        lote, conteudos = self._agrupar_lote(chaves)
+        self._medir("insert_many", self._uniao, self.raiz,
+                    self._construir_balanceada(lote, 0, len(lote) - 1, conteudos))
+
+    def delete_many(self, chaves):
+        """
+        Remove várias chaves de uma vez; chaves ausentes são ignoradas, como em
+        `deletar`. No modo multiconjunto cada ocorrência remove uma repetição.
+        """
+        if self.modo == "mapa":
+            lote, conteudos = sorted(set(chaves)), None
+        else:
+            lote, conteudos = self._agrupar_lote(chaves)
+        self._medir("delete_many", self._diferenca, self.raiz,
+                    self._construir_balanceada(lote, 0, len(lote) - 1, conteudos))
+
+    # ===============================================================
+    # OPERAÇÕES EM LOTE PARALELAS
+    # ===============================================================
+    # As chaves são divididas por faixas e cada faixa é processada em um processo
+    # do pool. As faixas trafegam como bytes de um `array` (ou como lista, se as
+    # chaves não forem inteiros), nunca como nós. Os nós Python só podem ser
+    # criados no processo principal, então a ArvoreAVL é montada aqui em O(n).
+    # Na ArvoreAVLCompacta a estrutura é só de inteiros: os processos montam as
+    # colunas de cada subárvore e o processo principal apenas as copia.
+
+    @classmethod
+    def from_iterable_paralelo(cls, chaves, trabalhadores=None, **opcoes):
+        """
+        Equivalente a `from_iterable`, com a ordenação feita em paralelo
+        (sample sort): cada processo ordena um bloco da entrada e o reparte por
+        faixas; depois cada processo intercala uma faixa. No armazenamento em
+        array a montagem das colunas também é paralela.
+        """
+        # Importado aqui: carregar multiprocessing custa dezenas de ms, e os
+        # processos do pool importam este módulo sem precisar dele.
+        from concurrent.futures import ProcessPoolExecutor
+
+        chaves = list(chaves)
+        trabalhadores = trabalhadores or os.cpu_count() or 1
+        if trabalhadores == 1 or len(chaves) < 2 * trabalhadores or opcoes.get("modo", "conjunto") != "conjunto":
+            return cls.from_iterable(chaves, **opcoes)
+
+        tamanho_bloco = -(-len(chaves) // trabalhadores)
+        blocos = [_empacotar(chaves[i:i + tamanho_bloco]) for i in range(0, len(chaves), tamanho_bloco)]
+        amostra = sorted(chaves[::max(1, len(chaves) // (trabalhadores * 32))])
+        pivos = [amostra[i * len(amostra) // trabalhadores] for i in range(1, trabalhadores)]
+        del chaves
+
+        with ProcessPoolExecutor(trabalhadores) as pool:
+            particionados = list(pool.map(_ordenar_e_particionar, blocos, [pivos] * len(blocos)))
+            faixas = [[blocos_faixa[j] for blocos_faixa in particionados] for j in range(len(pivos) + 1)]
+            mescladas = list(pool.map(_mesclar_faixa, faixas))
+            if any(duplicada for _, duplicada in mescladas):
+                raise ValueError("Chave duplicada não permitida na Árvore AVL.")
+            arvore = cls(**opcoes)
+            arvore._reconstruir_em_paralelo([pacote for pacote, _ in mescladas], pool, trabalhadores)
+        return arvore
+
+    def operacao_paralela(self, outra, operacao, trabalhadores=None):
+        """
+        Executa `union`, `intersection` ou `difference` com `outra` dividindo as
+        duas árvores pelas mesmas faixas de chaves e combinando cada faixa em um
+        processo. Esta árvore recebe o resultado; `outra` não é alterada.
+
+        O caminho paralelo achata e remonta as duas árvores, O(n + m) no processo
+        principal. Quando o método serial baseado em join, O(m log(n/m + 1)), sai
+        mais barato (tamanhos muito diferentes), ele é usado no lugar.
+        """
+        if operacao not in ("union", "intersection", "difference"):
+            raise ValueError(f"Operação desconhecida: {operacao!r}")
+        self._exigir_mesmo_modo(outra)
+        trabalhadores = trabalhadores or os.cpu_count() or 1
+        menor, maior = sorted((len(self), len(outra)))
+        # As faixas trafegam só com chaves; valores e contagens ficam no join serial.
+        if (self.modo != "conjunto" or trabalhadores == 1 or maior < 2 * trabalhadores
+                or menor * math.log2(maior / max(menor, 1) + 1) < (menor + maior) / 2):
+            algoritmo = {"union": self._uniao, "intersection": self._intersecao,
+                         "difference": self._diferenca}[operacao]
+            self._medir(operacao, algoritmo, self.raiz, self._importar(outra))
+            return
+        chaves_a = self.percurso_em_ordem()
+        chaves_b = outra.percurso_em_ordem()
+        referencia = chaves_a if len(chaves_a) >= len(chaves_b) else chaves_b
+
+        pivos = [referencia[i * len(referencia) // trabalhadores] for i in range(1, trabalhadores)]
+        cortes_a = [0] + [bisect_left(chaves_a, p) for p in pivos] + [len(chaves_a)]
+        cortes_b = [0] + [bisect_left(chaves_b, p) for p in pivos] + [len(chaves_b)]
+        faixas_a = [_empacotar(chaves_a[cortes_a[i]:cortes_a[i + 1]]) for i in range(trabalhadores)]
+        faixas_b = [_empacotar(chaves_b[cortes_b[i]:cortes_b[i + 1]]) for i in range(trabalhadores)]
+        del chaves_a, chaves_b
+
+        self._medir(operacao, self._combinar_em_paralelo, operacao, faixas_a, faixas_b, trabalhadores)
+
+    def _combinar_em_paralelo(self, operacao, faixas_a, faixas_b, trabalhadores):
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(trabalhadores) as pool:
+            resultados = list(pool.map(_combinar_faixa, [operacao] * trabalhadores, faixas_a, faixas_b))
+            self._reconstruir_em_paralelo(resultados, pool, trabalhadores)
+        return self.raiz
+
+    def _reconstruir(self, chaves, conteudos=None):
+        """
+        Substitui o conteúdo da árvore pelas chaves ordenadas e sem repetição
+        (com os valores ou contagens em `conteudos`, nos modos mapa e multiconjunto).
+        """
+        self.raiz = self._construir_balanceada(chaves, 0, len(chaves) - 1, conteudos)
+
+    def _reconstruir_em_paralelo(self, pacotes, pool, trabalhadores):
+        """Reconstrói a partir das faixas empacotadas, já ordenadas; os nós objeto só podem ser criados aqui."""
+        self._reconstruir(list(chain.from_iterable(map(_desempacotar, pacotes))))
+
+    def _importar(self, outra):
+        """Cópia dos nós de `outra` para consumir nas operações de conjunto; `outra` não muda."""
+        if isinstance(outra, ArvoreAVLCompacta):
+            chaves = outra.percurso_em_ordem()
+            return self._construir_balanceada(chaves, 0, len(chaves) - 1)
+        return self._copiar(outra.raiz)
+
+    def _copiar(self, no):
+        if no is None:
+            return None
+        copia = self._tipo_no(no.chave)
+        self._copiar_conteudo(no, copia)
+        copia.esquerda = self._copiar(no.esquerda)
+        copia.direita = self._copiar(no.direita)
+        copia.altura = no.altura
+        copia.tamanho = no.tamanho
+        return copia
+
+    def _ligar(self, no, esquerda, direita):
+        """Pendura as subárvores no nó e atualiza sua altura."""
+        no.esquerda = esquerda
+        no.direita = direita
+        self._atualizar_altura(no)
+        return no
+
+    def _join(self, esquerda, no, direita):
+        """Junta esquerda < no < direita, rebalanceando ao longo da borda da árvore mais alta."""
+        altura_esquerda, altura_direita = self.obter_altura(esquerda), self.obter_altura(direita)
+        if altura_esquerda > altura_direita + 1:
+            return self._join_direita(esquerda, no, direita)
+        if altura_direita > altura_esquerda + 1:
+            return self._join_esquerda(esquerda, no, direita)
+        return self._ligar(no, esquerda, direita)
+
+    def _join_direita(self, esquerda, no, direita):
+        # Desce pela borda direita de `esquerda` até uma subárvore de altura compatível.
+        filho = esquerda.direita
+        if self.obter_altura(filho) <= self.obter_altura(direita) + 1:
+            novo = self._ligar(no, filho, direita)
+            if self.obter_altura(novo) <= self.obter_altura(esquerda.esquerda) + 1:
+                return self._ligar(esquerda, esquerda.esquerda, novo)
+            self._anotar_rotacao("direita_esquerda", esquerda.chave)
+            esquerda = self._ligar(esquerda, esquerda.esquerda, self._rotacao_direita(novo))
+            return self._rotacao_esquerda(esquerda)
+        novo = self._join_direita(filho, no, direita)
+        esquerda = self._ligar(esquerda, esquerda.esquerda, novo)
+        if self.obter_altura(novo) <= self.obter_altura(esquerda.esquerda) + 1:
+            return esquerda
+        self._anotar_rotacao("esquerda", esquerda.chave)
+        return self._rotacao_esquerda(esquerda)
+
+    def _join_esquerda(self, esquerda, no, direita):
+        # Simétrico de _join_direita, descendo pela borda esquerda de `direita`.
+        filho = direita.esquerda
+        if self.obter_altura(filho) <= self.obter_altura(esquerda) + 1:
+            novo = self._ligar(no, esquerda, filho)
+            if self.obter_altura(novo) <= self.obter_altura(direita.direita) + 1:
+                return self._ligar(direita, novo, direita.direita)
+            self._anotar_rotacao("esquerda_direita", direita.chave)
+            direita = self._ligar(direita, self._rotacao_esquerda(novo), direita.direita)
+            return self._rotacao_direita(direita)
+        novo = self._join_esquerda(esquerda, no, filho)
+        direita = self._ligar(direita, novo, direita.direita)
+        if self.obter_altura(novo) <= self.obter_altura(direita.direita) + 1:
+            return direita
+        self._anotar_rotacao("direita", direita.chave)
+        return self._rotacao_direita(direita)
+
+    def _split(self, no, chave):
+        """Retorna (menores, nó com a chave ou None, maiores)."""
+        if no is None:
+            return None, None, None
+        esquerda, direita = no.esquerda, no.direita
+        if self._medida is not None:
+            self._medida.visitar(1 if chave < no.chave else 2)
+        if chave == no.chave:
+            return esquerda, self._ligar(no, None, None), direita
+        if chave < no.chave:
+            menores, encontrado, maiores = self._split(esquerda, chave)
+            return menores, encontrado, self._join(maiores, no, direita)
+        menores, encontrado, maiores = self._split(direita, chave)
+        return self._join(esquerda, no, menores), encontrado, maiores
+
+    def _separar_ultimo(self, no):
+        """Retorna (árvore sem o maior nó, maior nó)."""
+        if no.direita is None:
+            return no.esquerda, no
+        resto, ultimo = self._separar_ultimo(no.direita)
+        return self._join(no.esquerda, no, resto), ultimo
+
+    def _join2(self, esquerda, direita):
+        """Junta duas árvores sem chave intermediária."""
+        if esquerda is None:
+            return direita
+        resto, ultimo = self._separar_ultimo(esquerda)
+        return self._join(resto, ultimo, direita)
+
+    def _uniao(self, a, b):
+        if a is None:
+            return b
+        if b is None:
+            return a
+        esquerda, direita = a.esquerda, a.direita
+        menores, encontrado, maiores = self._split(b, a.chave)
+        if encontrado is not None:
+            if self.modo == "mapa":
+                a.valor = encontrado.valor
+            elif self.modo == "multiconjunto":
+                a.contagem += encontrado.contagem
+        return self._join(self._uniao(esquerda, menores), a, self._uniao(direita, maiores))
+
+    def _intersecao(self, a, b):
+        if a is None or b is None:
+            return None
+        esquerda, direita = a.esquerda, a.direita
+        menores, encontrado, maiores = self._split(b, a.chave)
+        nova_esquerda = self._intersecao(esquerda, menores)
+        nova_direita = self._intersecao(direita, maiores)
+        if encontrado is not None:
+            if self.modo == "multiconjunto":
+                a.contagem = min(a.contagem, encontrado.contagem)
+            return self._join(nova_esquerda, a, nova_direita)
+        return self._join2(nova_esquerda, nova_direita)
+
+    def _diferenca(self, a, b):
+        if a is None or b is None:
+            return a
+        menores, encontrado, maiores = self._split(a, b.chave)
+        esquerda = self._diferenca(menores, b.esquerda)
+        direita = self._diferenca(maiores, b.direita)
+        if encontrado is not None and self.modo == "multiconjunto" and encontrado.contagem > b.contagem:
+            encontrado.contagem -= b.contagem
+            return self._join(esquerda, encontrado, direita)
+        return self._join2(esquerda, direita)
+
+    # ===============================================================
+    # SNAPSHOT BINÁRIO EM DISCO
+    # ===============================================================
+
+    def salvar(self, caminho):
+        """
+        Grava as chaves em `caminho` no formato binário de snapshot: um cabeçalho
+        de 16 bytes seguido das chaves ordenadas, empacotadas como int64 ("q") ou
+        float64 ("d"). A ordem é o layout implícito da árvore balanceada.
+        Chaves que não cabem sem perda (int e float misturados, inteiros fora do
+        int64) levantam TypeError ou OverflowError.
+        """
+        if self.modo != "conjunto":
+            raise TypeError("O snapshot binário guarda apenas chaves (modo 'conjunto').")
+        gravar_snapshot(caminho, self.percurso_em_ordem())
+
+    @classmethod
+    def carregar(cls, caminho):
+        """
+        Abre um snapshot com mmap, sem criar nós: buscas, intervalos e estatísticas
+        de ordem são respondidos direto do arquivo. A árvore mutável só é montada
+        na primeira escrita.
+        """
+        return ArvoreAVLMapeada(caminho, cls)
+
     # --- Função auxiliar para visualização ---
     def percurso_em_ordem(self):
         """Retorna uma lista com as chaves em ordem."""
@@ -254,6 +1024,817 @@ class ArvoreAVL:
             resultado.append(no.chave)
             self._percurso_em_ordem_recursivo(no.direita, resultado)
 
+NULO = -1
+
+
+class ArvoreAVLCompacta(ArvoreAVL):
+    """
+    Árvore AVL com os nós guardados em colunas paralelas do módulo `array`:
+    chaves, filho esquerdo, filho direito e altura. Um nó é o índice da sua
+    linha nas colunas e NULO (-1) representa a ausência de filho.
+
+    As posições liberadas ficam na pilha `_livres`, reaproveitada pelas
+    próximas inserções. Uma subárvore inteira descartada (pelas operações de
+    conjunto) entra na pilha só pela raiz, em O(1); seus nós voltam a ser
+    usados um a um, à medida que `_novo_no` desce por ela.
+
+    `split` e `join` trabalham sobre índices: as árvores resultantes de um
+    `split` compartilham as colunas (com nós disjuntos), e o `join` de duas
+    árvores com as mesmas colunas custa O(|h1 - h2| + 1). Árvores com colunas
+    diferentes são juntadas copiando a menor para as colunas da maior.
+
+    `tipo_chave` é o typecode da coluna de chaves ("q" para inteiros de 64
+    bits, "d" para floats); com None as chaves ficam numa lista Python e
+    podem ser de qualquer tipo comparável.
+    """
+    def __init__(self, armazenamento="array", tipo_chave="q", instrumentacao=None):
+        self.modo = "conjunto"
+        self.instrumentacao = instrumentacao
+        self.chaves = array(tipo_chave) if tipo_chave else []
+        self.esquerdas = array("i")
+        self.direitas = array("i")
+        self.alturas = array("b")
+        self.tamanhos = array("i")
+        self._livres = array("i")
+        self.raiz = NULO
+
+    def _opcoes(self):
+        return {"tipo_chave": getattr(self.chaves, "typecode", None), "instrumentacao": self.instrumentacao}
+
+    def _compartilhando(self, raiz):
+        """Nova árvore com a raiz dada, usando as colunas desta."""
+        arvore = type(self)(**self._opcoes())
+        arvore.chaves, arvore.esquerdas, arvore.direitas = self.chaves, self.esquerdas, self.direitas
+        arvore.alturas, arvore.tamanhos = self.alturas, self.tamanhos
+        arvore.raiz = raiz
+        return arvore
+
+    def _novo_no(self, chave):
+        """Ocupa uma posição livre (ou uma nova linha) para a chave."""
+        if self._livres:
+            no = self._livres.pop()
+            # A posição pode ser a raiz de uma subárvore descartada: os filhos
+            # voltam para a pilha.
+            for filho in (self.esquerdas[no], self.direitas[no]):
+                if filho != NULO:
+                    self._livres.append(filho)
+            self.chaves[no] = chave
+            self.esquerdas[no] = NULO
+            self.direitas[no] = NULO
+            self.alturas[no] = 1
+            self.tamanhos[no] = 1
+            return no
+        self.chaves.append(chave)
+        self.esquerdas.append(NULO)
+        self.direitas.append(NULO)
+        self.alturas.append(1)
+        self.tamanhos.append(1)
+        return len(self.alturas) - 1
+
+    def _liberar_no(self, no):
+        """Devolve a posição do nó (sem os filhos) para as posições livres."""
+        self.esquerdas[no] = NULO
+        self.direitas[no] = NULO
+        self.alturas[no] = 0
+        self.tamanhos[no] = 0
+        self._livres.append(no)
+
+    def _descartar(self, no):
+        """Devolve uma subárvore inteira para as posições livres, em O(1)."""
+        if no != NULO:
+            self._livres.append(no)
+
+    def obter_altura(self, no):
+        if no == NULO:
+            return 0
+        return self.alturas[no]
+
+    def obter_fator_balanceamento(self, no):
+        if no == NULO:
+            return 0
+        return self.obter_altura(self.esquerdas[no]) - self.obter_altura(self.direitas[no])
+
+    def obter_tamanho(self, no):
+        if no == NULO:
+            return 0
+        return self.tamanhos[no]
+
+    def _atualizar_altura(self, no):
+        if no == NULO:
+            return
+        esquerda, direita = self.esquerdas[no], self.direitas[no]
+        self.alturas[no] = 1 + max(self.obter_altura(esquerda), self.obter_altura(direita))
+        self.tamanhos[no] = 1 + self.obter_tamanho(esquerda) + self.obter_tamanho(direita)
+
+    def obter_no_valor_minimo(self, no):
+        while no != NULO and self.esquerdas[no] != NULO:
+            no = self.esquerdas[no]
+        return no
+
+    def _rotacao_direita(self, no_pivo):
+        nova_raiz = self.esquerdas[no_pivo]
+        self.esquerdas[no_pivo] = self.direitas[nova_raiz]
+        self.direitas[nova_raiz] = no_pivo
+        self._atualizar_altura(no_pivo)
+        self._atualizar_altura(nova_raiz)
+        return nova_raiz
+
+    def _rotacao_esquerda(self, no_pivo):
+        nova_raiz = self.direitas[no_pivo]
+        self.direitas[no_pivo] = self.esquerdas[nova_raiz]
+        self.esquerdas[nova_raiz] = no_pivo
+        self._atualizar_altura(no_pivo)
+        self._atualizar_altura(nova_raiz)
+        return nova_raiz
+
+    def _balancear(self, no):
+        """Atualiza a altura do nó e aplica a rotação necessária, se houver."""
+        self._atualizar_altura(no)
+        fator_balanceamento = self.obter_fator_balanceamento(no)
+        if fator_balanceamento > 1:
+            if self.obter_fator_balanceamento(self.esquerdas[no]) < 0:
+                self._anotar_rotacao("esquerda_direita", self.chaves[no])
+                self.esquerdas[no] = self._rotacao_esquerda(self.esquerdas[no])
+            else:
+                self._anotar_rotacao("direita", self.chaves[no])
+            return self._rotacao_direita(no)
+        if fator_balanceamento < -1:
+            if self.obter_fator_balanceamento(self.direitas[no]) > 0:
+                self._anotar_rotacao("direita_esquerda", self.chaves[no])
+                self.direitas[no] = self._rotacao_direita(self.direitas[no])
+            else:
+                self._anotar_rotacao("esquerda", self.chaves[no])
+            return self._rotacao_esquerda(no)
+        return no
+
+    def _inserir_recursivo(self, no_atual, chave, valor=None, substituir=True):
+        if no_atual == NULO:
+            return self._novo_no(chave)
+        chave_atual = self.chaves[no_atual]
+        if self._medida is not None:
+            self._medida.visitar(1 if chave < chave_atual else 2)
+        if chave < chave_atual:
+            self.esquerdas[no_atual] = self._inserir_recursivo(self.esquerdas[no_atual], chave)
+        elif chave > chave_atual:
+            self.direitas[no_atual] = self._inserir_recursivo(self.direitas[no_atual], chave)
+        else:
+            raise ValueError("Chave duplicada não permitida na Árvore AVL.")
+        return self._balancear(no_atual)
+
+    def _deletar_recursivo(self, no_atual, chave):
+        if no_atual == NULO:
+            return no_atual
+        chave_atual = self.chaves[no_atual]
+        if self._medida is not None:
+            self._medida.visitar(1 if chave < chave_atual else 2)
+        if chave < chave_atual:
+            self.esquerdas[no_atual] = self._deletar_recursivo(self.esquerdas[no_atual], chave)
+        elif chave > chave_atual:
+            self.direitas[no_atual] = self._deletar_recursivo(self.direitas[no_atual], chave)
+        else:
+            esquerda, direita = self.esquerdas[no_atual], self.direitas[no_atual]
+            if esquerda == NULO or direita == NULO:
+                self._liberar_no(no_atual)
+                return direita if esquerda == NULO else esquerda
+            sucessor = self.obter_no_valor_minimo(direita)
+            self.chaves[no_atual] = self.chaves[sucessor]
+            self.direitas[no_atual] = self._deletar_recursivo(direita, self.chaves[sucessor])
+        return self._balancear(no_atual)
+
+    def _construir_balanceada(self, chaves, inicio, fim, conteudos=None):
+        if inicio > fim:
+            return NULO
+        meio = (inicio + fim) // 2
+        no = self._novo_no(chaves[meio])
+        self.esquerdas[no] = self._construir_balanceada(chaves, inicio, meio - 1)
+        self.direitas[no] = self._construir_balanceada(chaves, meio + 1, fim)
+        self._atualizar_altura(no)
+        return no
+
+    def iterar_intervalo(self, chave_min=None, chave_max=None, limite=None, reverso=False, apos=None):
+        if reverso:
+            inicio, fim = chave_max, chave_min
+            antes = lambda a, b: a > b
+            primeiros, segundos = self.direitas, self.esquerdas
+        else:
+            inicio, fim = chave_min, chave_max
+            antes = lambda a, b: a < b
+            primeiros, segundos = self.esquerdas, self.direitas
+
+        pilha = []
+        no = self.raiz
+        while no != NULO:
+            chave = self.chaves[no]
+            if (inicio is not None and antes(chave, inicio)) or \
+                    (apos is not None and not antes(apos, chave)):
+                no = segundos[no]
+            else:
+                pilha.append(no)
+                no = primeiros[no]
+
+        gerados = 0
+        while pilha and (limite is None or gerados < limite):
+            no = pilha.pop()
+            chave = self.chaves[no]
+            if fim is not None and antes(fim, chave):
+                return
+            yield chave
+            gerados += 1
+            no = segundos[no]
+            while no != NULO:
+                pilha.append(no)
+                no = primeiros[no]
+
+    def obter_profundidade_no(self, chave):
+        no_atual = self.raiz
+        profundidade = 0
+        while no_atual != NULO:
+            chave_atual = self.chaves[no_atual]
+            if chave == chave_atual:
+                return profundidade
+            elif chave < chave_atual:
+                no_atual = self.esquerdas[no_atual]
+            else:
+                no_atual = self.direitas[no_atual]
+            profundidade += 1
+        return -1
+
+    def _contar_menores(self, chave, inclusivo=False):
+        contagem = 0
+        no_atual = self.raiz
+        while no_atual != NULO:
+            chave_atual = self.chaves[no_atual]
+            if chave < chave_atual or (chave == chave_atual and not inclusivo):
+                no_atual = self.esquerdas[no_atual]
+            else:
+                contagem += self.obter_tamanho(self.esquerdas[no_atual]) + 1
+                no_atual = self.direitas[no_atual]
+        return contagem
+
+    def select(self, k):
+        if not 0 <= k < len(self):
+            raise IndexError("Posição fora do intervalo da árvore.")
+        no_atual = self.raiz
+        while True:
+            tamanho_esquerda = self.obter_tamanho(self.esquerdas[no_atual])
+            if k < tamanho_esquerda:
+                no_atual = self.esquerdas[no_atual]
+            elif k == tamanho_esquerda:
+                return self.chaves[no_atual]
+            else:
+                k -= tamanho_esquerda + 1
+                no_atual = self.direitas[no_atual]
+
+    # Join, split e as operações de conjunto seguem os algoritmos da ArvoreAVL,
+    # com índices no lugar dos nós. Os nós que saem do resultado voltam para as
+    # posições livres em vez de ficarem para o coletor de lixo.
+
+    @classmethod
+    def join(cls, menores, chave, maiores):
+        if (len(menores) and menores.select(len(menores) - 1) >= chave) or \
+                (len(maiores) and maiores.select(0) <= chave):
+            raise ValueError("As chaves devem satisfazer menores < chave < maiores.")
+        dono, outra = (menores, maiores) if len(menores) >= len(maiores) else (maiores, menores)
+        if outra.chaves is dono.chaves:
+            raiz_outra = outra.raiz
+            dono._livres.extend(outra._livres)
+        else:
+            raiz_outra = dono._importar(outra)
+        arvore = dono._compartilhando(NULO)
+        arvore._livres, dono._livres, outra._livres = dono._livres, array("i"), array("i")
+        esquerda, direita = (dono.raiz, raiz_outra) if dono is menores else (raiz_outra, dono.raiz)
+        arvore.raiz = arvore._join(esquerda, arvore._novo_no(chave), direita)
+        menores.raiz = maiores.raiz = NULO
+        return arvore
+
+    def split(self, chave):
+        esquerda, no, direita = self._split(self.raiz, chave)
+        if no != NULO:
+            self._liberar_no(no)
+        self.raiz = NULO
+        menores, maiores = self._compartilhando(esquerda), self._compartilhando(direita)
+        menores._livres, self._livres = self._livres, array("i")
+        return menores, no != NULO, maiores
+
+    def union(self, outra):
+        self._exigir_mesmo_modo(outra)
+        self._medir("union", self._uniao, self.raiz, self._importar(outra))
+
+    def intersection(self, outra):
+        self._exigir_mesmo_modo(outra)
+        self._medir("intersection", self._intersecao, self.raiz, self._importar(outra))
+
+    def difference(self, outra):
+        self._exigir_mesmo_modo(outra)
+        self._medir("difference", self._diferenca, self.raiz, self._importar(outra))
+
+    def _importar(self, outra):
+        """Monta nestas colunas uma cópia balanceada das chaves de `outra`, em O(m)."""
+        chaves = outra.percurso_em_ordem()
+        return self._construir_balanceada(chaves, 0, len(chaves) - 1)
+
+    def _reconstruir(self, chaves):
+        # Colunas novas: as antigas podem estar compartilhadas com outras árvores.
+        self.chaves = array(self.chaves.typecode) if isinstance(self.chaves, array) else []
+        self.esquerdas, self.direitas = array("i"), array("i")
+        self.alturas, self.tamanhos = array("b"), array("i")
+        self._livres = array("i")
+        self.raiz = self._construir_balanceada(chaves, 0, len(chaves) - 1)
+
+    def _reconstruir_em_paralelo(self, pacotes, pool, trabalhadores):
+        # O índice de cada nó é a sua posição em ordem, então as colunas de
+        # estrutura dependem só da quantidade de chaves. Os níveis de cima são
+        # preenchidos aqui; cada subárvore abaixo deles é montada em um processo
+        # e copiada para as colunas por fatia.
+        chaves = array(self.chaves.typecode) if isinstance(self.chaves, array) else []
+        for pacote in pacotes:
+            if isinstance(chaves, array) and pacote[0] == chaves.typecode:
+                chaves.frombytes(pacote[1])
+            else:
+                chaves.extend(_desempacotar(pacote))
+        total = len(chaves)
+        esquerdas, direitas = array("i", [NULO]) * total, array("i", [NULO]) * total
+        alturas, tamanhos = array("b", [0]) * total, array("i", [0]) * total
+        niveis_aqui = (4 * trabalhadores).bit_length()
+        faixas = []
+        pilha = [(0, total - 1, 0)] if total else []
+        while pilha:
+            inicio, fim, nivel = pilha.pop()
+            if nivel == niveis_aqui:
+                faixas.append((inicio, fim))
+                continue
+            meio, esquerdas[meio], direitas[meio], alturas[meio], tamanhos[meio] = \
+                _no_balanceado(inicio, fim)
+            if inicio < meio:
+                pilha.append((inicio, meio - 1, nivel + 1))
+            if meio < fim:
+                pilha.append((meio + 1, fim, nivel + 1))
+        partes = pool.map(_estrutura_balanceada, [inicio for inicio, _ in faixas], [fim for _, fim in faixas])
+        for (inicio, fim), colunas in zip(faixas, partes):
+            for coluna, tipo, dados in zip((esquerdas, direitas, alturas, tamanhos), "iibi", colunas):
+                coluna[inicio:fim + 1] = array(tipo, dados)
+        self.chaves, self.esquerdas, self.direitas = chaves, esquerdas, direitas
+        self.alturas, self.tamanhos = alturas, tamanhos
+        self._livres = array("i")
+        self.raiz = (total - 1) // 2 if total else NULO
+
+    def _ligar(self, no, esquerda, direita):
+        self.esquerdas[no] = esquerda
+        self.direitas[no] = direita
+        self._atualizar_altura(no)
+        return no
+
+    def _join_direita(self, esquerda, no, direita):
+        filho = self.direitas[esquerda]
+        if self.obter_altura(filho) <= self.obter_altura(direita) + 1:
+            novo = self._ligar(no, filho, direita)
+            if self.obter_altura(novo) <= self.obter_altura(self.esquerdas[esquerda]) + 1:
+                return self._ligar(esquerda, self.esquerdas[esquerda], novo)
+            self._anotar_rotacao("direita_esquerda", self.chaves[esquerda])
+            self._ligar(esquerda, self.esquerdas[esquerda], self._rotacao_direita(novo))
+            return self._rotacao_esquerda(esquerda)
+        novo = self._join_direita(filho, no, direita)
+        self._ligar(esquerda, self.esquerdas[esquerda], novo)
+        if self.obter_altura(novo) <= self.obter_altura(self.esquerdas[esquerda]) + 1:
+            return esquerda
+        self._anotar_rotacao("esquerda", self.chaves[esquerda])
+        return self._rotacao_esquerda(esquerda)
+
+    def _join_esquerda(self, esquerda, no, direita):
+        filho = self.esquerdas[direita]
+        if self.obter_altura(filho) <= self.obter_altura(esquerda) + 1:
+            novo = self._ligar(no, esquerda, filho)
+            if self.obter_altura(novo) <= self.obter_altura(self.direitas[direita]) + 1:
+                return self._ligar(direita, novo, self.direitas[direita])
+            self._anotar_rotacao("esquerda_direita", self.chaves[direita])
+            self._ligar(direita, self._rotacao_esquerda(novo), self.direitas[direita])
+            return self._rotacao_direita(direita)
+        novo = self._join_esquerda(esquerda, no, filho)
+        self._ligar(direita, novo, self.direitas[direita])
+        if self.obter_altura(novo) <= self.obter_altura(self.direitas[direita]) + 1:
+            return direita
+        self._anotar_rotacao("direita", self.chaves[direita])
+        return self._rotacao_direita(direita)
+
+    def _split(self, no, chave):
+        if no == NULO:
+            return NULO, NULO, NULO
+        esquerda, direita, chave_no = self.esquerdas[no], self.direitas[no], self.chaves[no]
+        if self._medida is not None:
+            self._medida.visitar(1 if chave < chave_no else 2)
+        if chave == chave_no:
+            self._ligar(no, NULO, NULO)
+            return esquerda, no, direita
+        if chave < chave_no:
+            menores, encontrado, maiores = self._split(esquerda, chave)
+            return menores, encontrado, self._join(maiores, no, direita)
+        menores, encontrado, maiores = self._split(direita, chave)
+        return self._join(esquerda, no, menores), encontrado, maiores
+
+    def _separar_ultimo(self, no):
+        if self.direitas[no] == NULO:
+            return self.esquerdas[no], no
+        resto, ultimo = self._separar_ultimo(self.direitas[no])
+        return self._join(self.esquerdas[no], no, resto), ultimo
+
+    def _join2(self, esquerda, direita):
+        if esquerda == NULO:
+            return direita
+        resto, ultimo = self._separar_ultimo(esquerda)
+        return self._join(resto, ultimo, direita)
+
+    def _uniao(self, a, b):
+        if a == NULO:
+            return b
+        if b == NULO:
+            return a
+        esquerda, direita = self.esquerdas[a], self.direitas[a]
+        menores, encontrado, maiores = self._split(b, self.chaves[a])
+        if encontrado != NULO:
+            self._liberar_no(encontrado)
+        return self._join(self._uniao(esquerda, menores), a, self._uniao(direita, maiores))
+
+    def _intersecao(self, a, b):
+        if a == NULO or b == NULO:
+            self._descartar(a)
+            self._descartar(b)
+            return NULO
+        esquerda, direita = self.esquerdas[a], self.direitas[a]
+        menores, encontrado, maiores = self._split(b, self.chaves[a])
+        nova_esquerda = self._intersecao(esquerda, menores)
+        nova_direita = self._intersecao(direita, maiores)
+        if encontrado != NULO:
+            self._liberar_no(encontrado)
+            return self._join(nova_esquerda, a, nova_direita)
+        self._liberar_no(a)
+        return self._join2(nova_esquerda, nova_direita)
+
+    def _diferenca(self, a, b):
+        if a == NULO or b == NULO:
+            self._descartar(b)
+            return a
+        esquerda_b, direita_b = self.esquerdas[b], self.direitas[b]
+        menores, encontrado, maiores = self._split(a, self.chaves[b])
+        if encontrado != NULO:
+            self._liberar_no(encontrado)
+        self._liberar_no(b)
+        return self._join2(self._diferenca(menores, esquerda_b), self._diferenca(maiores, direita_b))
+
+    def percurso_em_ordem(self):
+        resultado = []
+        pilha = []
+        no = self.raiz
+        while pilha or no != NULO:
+            while no != NULO:
+                pilha.append(no)
+                no = self.esquerdas[no]
+            no = pilha.pop()
+            resultado.append(self.chaves[no])
+            no = self.direitas[no]
+        return resultado
+
+
+class ArvoreAVLPersistente(ArvoreAVL):
+    """
+    Árvore AVL persistente: `inserir` e `deletar` não alteram a árvore e sim
+    retornam uma nova versão. Só os O(log n) nós do caminho alterado são
+    copiados; o restante é compartilhado com a versão anterior.
+
+    Como nenhum nó é modificado depois de criado, versões antigas continuam
+    válidas e podem ser lidas (buscas, intervalos, estatísticas de ordem) por
+    outras threads enquanto novas versões são criadas, sem travas.
+
+    As operações em lote da ArvoreAVL também retornam novas versões: `split`,
+    `join`, `union`, `intersection`, `difference`, `insert_many`, `delete_many`
+    e `operacao_paralela` usam os mesmos algoritmos, com as primitivas que
+    alteram nós (`_ligar` e as rotações) trocadas por cópias. Só o modo
+    "conjunto" é suportado; a instrumentação é repassada a cada versão.
+    """
+
+    def __init__(self, armazenamento="objetos", modo="conjunto", instrumentacao=None):
+        if modo != "conjunto":
+            raise ValueError("A árvore persistente só suporta o modo 'conjunto'.")
+        super().__init__(armazenamento, modo, instrumentacao)
+
+    def _versao(self, raiz):
+        versao = type(self)(**self._opcoes())
+        versao.raiz = raiz
+        return versao
+
+    def _em_nova_versao(self, metodo, *argumentos):
+        """
+        Aplica `metodo` da ArvoreAVL a uma nova versão com a mesma raiz. Ele só
+        troca a raiz dessa versão: os nós são copiados pelas primitivas abaixo.
+        """
+        versao = self._versao(self.raiz)
+        metodo(versao, *argumentos)
+        return versao
+
+    def _novo_no(self, chave, esquerda, direita):
+        no = self._tipo_no(chave)
+        no.esquerda = esquerda
+        no.direita = direita
+        self._atualizar_altura(no)
+        return no
+
+    # Primitivas da ArvoreAVL com cópia: join, split e as operações de conjunto
+    # passam a criar nós novos em vez de alterar os existentes.
+
+    def _ligar(self, no, esquerda, direita):
+        return self._novo_no(no.chave, esquerda, direita)
+
+    def _rotacao_direita(self, no_pivo):
+        nova_raiz = no_pivo.esquerda
+        return self._novo_no(nova_raiz.chave, nova_raiz.esquerda,
+                             self._novo_no(no_pivo.chave, nova_raiz.direita, no_pivo.direita))
+
+    def _rotacao_esquerda(self, no_pivo):
+        nova_raiz = no_pivo.direita
+        return self._novo_no(nova_raiz.chave,
+                             self._novo_no(no_pivo.chave, no_pivo.esquerda, nova_raiz.esquerda),
+                             nova_raiz.direita)
+
+    def _importar(self, outra):
+        # Nós de outra versão persistente nunca mudam e podem ser compartilhados.
+        if isinstance(outra, ArvoreAVLPersistente):
+            return outra.raiz
+        return super()._importar(outra)
+
+    def _balancear_copiando(self, chave, esquerda, direita):
+        """Cria o nó (chave, esquerda, direita), aplicando rotações com cópia se necessário."""
+        altura_esquerda, altura_direita = self.obter_altura(esquerda), self.obter_altura(direita)
+        if altura_esquerda > altura_direita + 1:
+            if self.obter_fator_balanceamento(esquerda) < 0:
+                self._anotar_rotacao("esquerda_direita", chave)
+                filho = esquerda.direita
+                esquerda = self._novo_no(filho.chave,
+                                         self._novo_no(esquerda.chave, esquerda.esquerda, filho.esquerda),
+                                         filho.direita)
+            else:
+                self._anotar_rotacao("direita", chave)
+            return self._novo_no(esquerda.chave, esquerda.esquerda,
+                                 self._novo_no(chave, esquerda.direita, direita))
+        if altura_direita > altura_esquerda + 1:
+            if self.obter_fator_balanceamento(direita) > 0:
+                self._anotar_rotacao("direita_esquerda", chave)
+                filho = direita.esquerda
+                direita = self._novo_no(filho.chave, filho.esquerda,
+                                        self._novo_no(direita.chave, filho.direita, direita.direita))
+            else:
+                self._anotar_rotacao("esquerda", chave)
+            return self._novo_no(direita.chave, self._novo_no(chave, esquerda, direita.esquerda),
+                                 direita.direita)
+        return self._novo_no(chave, esquerda, direita)
+
+    def inserir(self, chave):
+        """Retorna uma nova versão da árvore contendo `chave`."""
+        return self._em_nova_versao(ArvoreAVL.inserir, chave)
+
+    def _inserir_recursivo(self, no_atual, chave, valor=None, substituir=True):
+        if no_atual is None:
+            return self._tipo_no(chave)
+        if self._medida is not None:
+            self._medida.visitar(1 if chave < no_atual.chave else 2)
+        if chave < no_atual.chave:
+            return self._balancear_copiando(no_atual.chave,
+                                            self._inserir_recursivo(no_atual.esquerda, chave),
+                                            no_atual.direita)
+        if chave > no_atual.chave:
+            return self._balancear_copiando(no_atual.chave, no_atual.esquerda,
+                                            self._inserir_recursivo(no_atual.direita, chave))
+        raise ValueError("Chave duplicada não permitida na Árvore AVL.")
+
+    def deletar(self, chave):
+        """Retorna uma nova versão da árvore sem `chave` (ou esta mesma, se ela não existir)."""
+        if self.obter_profundidade_no(chave) == -1:
+            return self
+        return self._em_nova_versao(ArvoreAVL.deletar, chave)
+
+    def _deletar_recursivo(self, no_atual, chave, ocorrencia=True):
+        if self._medida is not None:
+            self._medida.visitar(1 if chave < no_atual.chave else 2)
+        if chave < no_atual.chave:
+            return self._balancear_copiando(no_atual.chave,
+                                            self._deletar_recursivo(no_atual.esquerda, chave),
+                                            no_atual.direita)
+        if chave > no_atual.chave:
+            return self._balancear_copiando(no_atual.chave, no_atual.esquerda,
+                                            self._deletar_recursivo(no_atual.direita, chave))
+        if no_atual.esquerda is None:
+            return no_atual.direita
+        if no_atual.direita is None:
+            return no_atual.esquerda
+        sucessor = self.obter_no_valor_minimo(no_atual.direita)
+        return self._balancear_copiando(sucessor.chave, no_atual.esquerda,
+                                        self._deletar_recursivo(no_atual.direita, sucessor.chave))
+
+    # Operações em lote: as da ArvoreAVL aplicadas a uma nova versão
+
+    @classmethod
+    def join(cls, menores, chave, maiores, valor=None):
+        """Retorna a versão com menores < chave < maiores; as duas de entrada não mudam."""
+        return super().join(menores._versao(menores.raiz), chave,
+                            maiores._versao(maiores.raiz), valor)
+
+    def split(self, chave):
+        """Retorna (menores, encontrada, maiores) como novas versões; esta não muda."""
+        return ArvoreAVL.split(self._versao(self.raiz), chave)
+
+    def union(self, outra):
+        return self._em_nova_versao(ArvoreAVL.union, outra)
+
+    def intersection(self, outra):
+        return self._em_nova_versao(ArvoreAVL.intersection, outra)
+
+    def difference(self, outra):
+        return self._em_nova_versao(ArvoreAVL.difference, outra)
+
+    def insert_many(self, chaves):
+        return self._em_nova_versao(ArvoreAVL.insert_many, chaves)
+
+    def delete_many(self, chaves):
+        return self._em_nova_versao(ArvoreAVL.delete_many, chaves)
+
+    def operacao_paralela(self, outra, operacao, trabalhadores=None):
+        return self._em_nova_versao(ArvoreAVL.operacao_paralela, outra, operacao, trabalhadores)
+
+
+class ArvoreAVLConcorrente:
+    """
+    Árvore AVL compartilhável entre threads, com troca da raiz por cópia na
+    escrita. As escritas são serializadas por uma trava e cada uma publica uma
+    nova `ArvoreAVLPersistente`; as leituras usam a versão publicada no momento
+    da chamada e nunca esperam pela trava.
+
+    Os métodos de leitura da ArvoreAVL (`obter_profundidade_no`,
+    `encontrar_nos_intervalo`, `iterar_intervalo`, `rank`, ...) são repassados à
+    versão atual. Um iterador de intervalo continua consistente mesmo que
+    ocorram escritas durante a iteração.
+    """
+    def __init__(self, chaves=()):
+        self._versao = ArvoreAVLPersistente.from_iterable(chaves)
+        self._trava_escrita = threading.Lock()
+
+    def snapshot(self):
+        """Retorna a versão atual, imutável, para várias leituras consistentes."""
+        return self._versao
+
+    def inserir(self, chave):
+        with self._trava_escrita:
+            self._versao = self._versao.inserir(chave)
+
+    def deletar(self, chave):
+        with self._trava_escrita:
+            self._versao = self._versao.deletar(chave)
+
+    def __len__(self):
+        return len(self._versao)
+
+    def __getattr__(self, nome):
+        return getattr(self._versao, nome)
+
+
+# --- Snapshot binário ---
+# O formato (cabeçalho, typecodes e validação na carga) é o de arvores.snapshot,
+# o mesmo da BinarySearchTree.
+
+class ArvoreAVLMapeada(SnapshotMapeado):
+    """
+    Visão somente leitura de um snapshot salvo com `ArvoreAVL.salvar`, mapeado
+    em memória. As chaves ordenadas formam o layout implícito da árvore que
+    `from_sorted` construiria: a raiz é o elemento do meio e cada subárvore é
+    uma metade. Por isso a profundidade de um nó é o número de passos da busca
+    binária, e rank/select/intervalos são buscas binárias no arquivo.
+
+    Qualquer método de escrita (ou não implementado aqui) monta a árvore mutável
+    com `from_sorted`, fecha o arquivo e passa a delegar tudo a ela. Escritas
+    retornam o que a árvore retorna: nada na ArvoreAVL e a nova versão na
+    ArvoreAVLPersistente (esta visão continua sendo a versão carregada).
+    """
+    def __init__(self, caminho, classe=ArvoreAVL):
+        super().__init__(caminho, classe.from_sorted)
+
+    def inserir(self, chave):
+        return self._materializar().inserir(chave)
+
+    def deletar(self, chave):
+        return self._materializar().deletar(chave)
+
+    def __contains__(self, chave):
+        return self.obter_profundidade_no(chave) != -1
+
+    def obter_profundidade_no(self, chave):
+        if self._arvore is not None:
+            return self._arvore.obter_profundidade_no(chave)
+        return self._profundidade(chave)
+
+    def rank(self, chave):
+        if self._arvore is not None:
+            return self._arvore.rank(chave)
+        return bisect_left(self._chaves, chave)
+
+    def select(self, k):
+        if self._arvore is not None:
+            return self._arvore.select(k)
+        if not 0 <= k < len(self._chaves):
+            raise IndexError("Posição fora do intervalo da árvore.")
+        return self._chaves[k]
+
+    def contar_intervalo(self, chave_min, chave_max):
+        if self._arvore is not None:
+            return self._arvore.contar_intervalo(chave_min, chave_max)
+        if chave_min > chave_max:
+            return 0
+        return bisect_right(self._chaves, chave_max) - bisect_left(self._chaves, chave_min)
+
+    def mediana(self):
+        if self._arvore is not None:
+            return self._arvore.mediana()
+        if not len(self._chaves):
+            raise ValueError("A árvore está vazia.")
+        return self._chaves[(len(self._chaves) - 1) // 2]
+
+    def iterar_intervalo(self, chave_min=None, chave_max=None, limite=None, reverso=False, apos=None):
+        if self._arvore is not None:
+            return self._arvore.iterar_intervalo(chave_min, chave_max, limite, reverso, apos)
+        return self._iterar(chave_min, chave_max, limite, reverso, apos)
+
+    def encontrar_nos_intervalo(self, chave_min, chave_max):
+        return list(self.iterar_intervalo(chave_min, chave_max))
+
+    def percurso_em_ordem(self):
+        if self._arvore is not None:
+            return self._arvore.percurso_em_ordem()
+        return self._chaves.tolist()
+
+
+# --- Funções executadas nos processos de trabalho ---
+
+def _empacotar(chaves):
+    """Serializa uma faixa de chaves como bytes de array("q") quando possível."""
+    try:
+        return "q", array("q", chaves).tobytes()
+    except (TypeError, OverflowError):
+        return None, list(chaves)
+
+
+def _desempacotar(pacote):
+    tipo, dados = pacote
+    if tipo is None:
+        return dados
+    chaves = array(tipo)
+    chaves.frombytes(dados)
+    return chaves
+
+
+def _ordenar_e_particionar(pacote, pivos):
+    chaves = sorted(_desempacotar(pacote))
+    cortes = [0] + [bisect_left(chaves, p) for p in pivos] + [len(chaves)]
+    return [_empacotar(chaves[cortes[i]:cortes[i + 1]]) for i in range(len(cortes) - 1)]
+
+
+def _mesclar_faixa(pacotes):
+    chaves = sorted(chain.from_iterable(map(_desempacotar, pacotes)))
+    return _empacotar(chaves), len(set(chaves)) != len(chaves)
+
+
+def _combinar_faixa(operacao, pacote_a, pacote_b):
+    chaves = getattr(set(_desempacotar(pacote_a)), operacao)(_desempacotar(pacote_b))
+    return _empacotar(sorted(chaves))
+
+
+def _no_balanceado(inicio, fim):
+    """
+    Nó do meio da subárvore balanceada sobre as posições inicio..fim, em que o
+    índice de cada nó é sua posição em ordem: (índice, filho esquerdo, filho
+    direito, altura, tamanho). A altura de uma árvore montada pelo meio com t
+    nós é t.bit_length().
+    """
+    meio = (inicio + fim) // 2
+    tamanho = fim - inicio + 1
+    esquerda = (inicio + meio - 1) // 2 if inicio < meio else NULO
+    direita = (meio + 1 + fim) // 2 if meio < fim else NULO
+    return meio, esquerda, direita, tamanho.bit_length(), tamanho
+
+
+def _estrutura_balanceada(inicio, fim):
+    """Colunas (esquerdas, direitas, alturas, tamanhos) das posições inicio..fim, como bytes."""
+    total = fim - inicio + 1
+    esquerdas, direitas = array("i", [NULO]) * total, array("i", [NULO]) * total
+    alturas, tamanhos = array("b", [0]) * total, array("i", [0]) * total
+    pilha = [(inicio, fim)]
+    while pilha:
+        baixo, alto = pilha.pop()
+        meio, esquerda, direita, altura, tamanho = _no_balanceado(baixo, alto)
+        j = meio - inicio
+        esquerdas[j], direitas[j], alturas[j], tamanhos[j] = esquerda, direita, altura, tamanho
+        if baixo < meio:
+            pilha.append((baixo, meio - 1))
+        if meio < alto:
+            pilha.append((meio + 1, alto))
+    return esquerdas.tobytes(), direitas.tobytes(), alturas.tobytes(), tamanhos.tobytes()
+
+
 # --- Bloco de Teste e Demonstração da Atividade AVL ---
 if __name__ == "__main__":
     arvore_avl = ArvoreAVL()
@@ -0,0 +1,319 @@
+# benchmark_arvores.py
+# Suíte comum de benchmarks para todas as implementações de árvore do
+# repositório. Cada motor roda as mesmas cargas, com as mesmas chaves, e o
+# resultado (ops/s, latência p50/p99, pico de memória e altura final) é
+# impresso e gravado em JSON para comparar execuções ao longo do tempo.
+#
+#   python benchmark_arvores.py
+#   python benchmark_arvores.py --motores bst arvore_avl --cargas aleatoria zipf \
+#       --tamanhos 1000 100000 --saida resultados.json
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, RAIZ)
+
+
+def carregar(nome, *caminho):
+    # As pastas têm espaços e acentos, então os módulos são carregados pelo caminho.
+    if nome in sys.modules:
+        return sys.modules[nome]
+    spec = importlib.util.spec_from_file_location(nome, os.path.join(RAIZ, *caminho))
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[nome] = modulo
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+# ===============================================================
+# MOTORES: a mesma interface mínima sobre cada implementação
+# ===============================================================
+
+class Motor:
+    """
+    Adaptador de uma implementação. Operações que a árvore não oferece ficam
+    como None, e as cargas que dependem delas são marcadas como não suportadas.
+    A altura é sempre contada em níveis (árvore vazia = 0).
+    """
+    inserir = buscar = remover = intervalo = None
+
+    def altura(self):
+        raise NotImplementedError
+
+    def fechar(self):
+        pass
+
+
+class MotorBST(Motor):
+    def __init__(self, concorrente=False):
+        from arvores import BinarySearchTree, ConcurrentBinarySearchTree
+        self.arvore = ConcurrentBinarySearchTree() if concorrente else BinarySearchTree()
+        self.inserir = self.arvore.insert
+        self.buscar = self.arvore.search
+        self.remover = self.arvore.delete
+
+    def altura(self):
+        return self.arvore.height() + 1
+
+
+class MotorBinaryTree(Motor):
+    def __init__(self):
+        self.arvore = carregar("arvore_balanceada", "atividade_3", "Arvore_balanceada.py").BinaryTree()
+        self.inserir = self.arvore.inserir
+
+    def altura(self):
+        niveis, fila = 0, deque([self.arvore.raiz] if self.arvore.raiz else [])
+        while fila:
+            niveis += 1
+            for _ in range(len(fila)):
+                no = fila.popleft()
+                fila.extend(filho for filho in (no.esquerda, no.direita) if filho)
+        return niveis
+
+
+class MotorAVLTree(Motor):
+    def __init__(self):
+        self.arvore = carregar("avl_atividade_4", "atividade_4", "valores_fixo", "AVL.py").AVLTree()
+        self.raiz = None
+
+    def inserir(self, chave):
+        self.raiz = self.arvore.inserir(self.raiz, chave)
+
+    def altura(self):
+        return self.arvore.obter_altura(self.raiz)
+
+
+class MotorArvoreAVL(Motor):
+    def __init__(self, armazenamento="objetos"):
+        self.arvore = carregar("arvore_avl", "atividade_5", "Árvore AVL.py").ArvoreAVL(
+            armazenamento=armazenamento)
+        self.inserir = self.arvore.inserir
+        self.buscar = self.arvore.__contains__
+        self.remover = self.arvore.deletar
+
+    def intervalo(self, chave_min, chave_max):
+        return sum(1 for _ in self.arvore.iterar_intervalo(chave_min, chave_max))
+
+    def altura(self):
+        return self.arvore.obter_altura(self.arvore.raiz)
+
+
+class MotorBMaisDisco(Motor):
+    def __init__(self):
+        modulo = carregar("arvore_b_disco", "atividade_5", "Arvore_B_disco.py")
+        self.pasta = tempfile.TemporaryDirectory()
+        self.arvore = modulo.ArvoreBMaisDisco(os.path.join(self.pasta.name, "arvore.bmais"))
+        self.inserir = self.arvore.inserir
+        self.buscar = self.arvore.__contains__
+        self.remover = self.arvore.deletar
+
+    def intervalo(self, chave_min, chave_max):
+        return sum(1 for _ in self.arvore.iterar_intervalo(chave_min, chave_max))
+
+    def altura(self):
+        return self.arvore.altura
+
+    def fechar(self):
+        self.arvore.fechar()
+        self.pasta.cleanup()
+
+
+MOTORES = {
+    "bst": MotorBST,
+    "bst_concorrente": lambda: MotorBST(concorrente=True),
+    "binary_tree": MotorBinaryTree,
+    "avl_tree": MotorAVLTree,
+    "arvore_avl": MotorArvoreAVL,
+    "arvore_avl_array": lambda: MotorArvoreAVL(armazenamento="array"),
+    "bmais_disco": MotorBMaisDisco,
+}
+
+
+# ===============================================================
+# CARGAS: (chaves inseridas antes de medir, operações medidas)
+# ===============================================================
+
+def carga_ordenada(n, aleatorio):
+    return [], [("inserir", (chave,)) for chave in range(n)]
+
+
+def carga_reversa(n, aleatorio):
+    return [], [("inserir", (chave,)) for chave in range(n - 1, -1, -1)]
+
+
+def carga_aleatoria(n, aleatorio):
+    chaves = list(range(n))
+    aleatorio.shuffle(chaves)
+    return [], [("inserir", (chave,)) for chave in chaves]
+
+
+def carga_zipf(n, aleatorio, expoente=1.1):
+    # Buscas concentradas em poucas chaves: a de posição r tem peso 1 / r^s.
+    chaves = list(range(n))
+    aleatorio.shuffle(chaves)
+    acumulado, total = [], 0.0
+    for posicao in range(1, n + 1):
+        total += posicao ** -expoente
+        acumulado.append(total)
+    buscadas = aleatorio.choices(chaves, cum_weights=acumulado, k=n)
+    return chaves, [("buscar", (chave,)) for chave in buscadas]
+
+
+def carga_rotatividade(n, aleatorio):
+    # Alterna inserção de uma chave nova e remoção de uma existente.
+    universo = list(range(2 * n))
+    aleatorio.shuffle(universo)
+    presentes, ausentes = universo[:n], universo[n:]
+    preparo = list(presentes)
+    operacoes = []
+    for i in range(n):
+        origem, destino, operacao = ((ausentes, presentes, "inserir") if i % 2 == 0
+                                     else (presentes, ausentes, "remover"))
+        indice = aleatorio.randrange(len(origem))
+        origem[indice], origem[-1] = origem[-1], origem[indice]
+        chave = origem.pop()
+        destino.append(chave)
+        operacoes.append((operacao, (chave,)))
+    return preparo, operacoes
+
+
+def carga_intervalos(n, aleatorio, largura=100):
+    chaves = list(range(n))
+    aleatorio.shuffle(chaves)
+    inicios = (aleatorio.randrange(max(1, n - largura)) for _ in range(max(10, n // 100)))
+    return chaves, [("intervalo", (inicio, inicio + largura - 1)) for inicio in inicios]
+
+
+CARGAS = {
+    "ordenada": carga_ordenada,
+    "reversa": carga_reversa,
+    "aleatoria": carga_aleatoria,
+    "zipf": carga_zipf,
+    "rotatividade": carga_rotatividade,
+    "intervalos": carga_intervalos,
+}
+
+
+# ===============================================================
+# EXECUÇÃO
+# ===============================================================
+
+def _rodar(fabrica, preparo, operacoes, limite_s, latencias=None):
+    """Monta o motor, aplica o preparo e executa as operações até o limite de tempo."""
+    motor = fabrica()
+    try:
+        for chave in preparo:
+            motor.inserir(chave)
+        funcoes = {nome: getattr(motor, nome) for nome in {op for op, _ in operacoes}}
+        relogio = time.perf_counter_ns
+        prazo = relogio() + int(limite_s * 1e9)
+        feitas = 0
+        for operacao, argumentos in operacoes:
+            inicio = relogio()
+            funcoes[operacao](*argumentos)
+            fim = relogio()
+            if latencias is not None:
+                latencias.append(fim - inicio)
+            feitas += 1
+            if fim > prazo:
+                break
+        return feitas, motor.altura()
+    finally:
+        motor.fechar()
+
+
+def medir(nome_motor, nome_carga, n, semente=0, limite_s=60.0, memoria=True):
+    resultado = {"motor": nome_motor, "carga": nome_carga, "n": n}
+    preparo, operacoes = CARGAS[nome_carga](n, random.Random(semente))
+    fabrica = MOTORES[nome_motor]
+    necessarias = {op for op, _ in operacoes} | ({"inserir"} if preparo else set())
+    amostra = fabrica()
+    faltando = sorted(op for op in necessarias if getattr(amostra, op) is None)
+    amostra.fechar()
+    if faltando:
+        resultado["status"] = f"não suportado ({', '.join(faltando)})"
+        return resultado
+
+    latencias = []
+    try:
+        inicio = time.perf_counter()
+        feitas, altura = _rodar(fabrica, preparo, operacoes, limite_s, latencias)
+        duracao = time.perf_counter() - inicio
+        if memoria:
+            tracemalloc.start()
+            try:
+                _rodar(fabrica, preparo, operacoes[:feitas], limite_s)
+                resultado["pico_memoria_bytes"] = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+    except Exception as erro:  # noqa: BLE001 - o erro vira parte do relatório
+        resultado["status"] = f"erro: {type(erro).__name__}: {erro}"
+        return resultado
+
+    latencias.sort()
+    resultado.update({
+        "status": "ok" if feitas == len(operacoes) else f"interrompido após {limite_s:g} s",
+        "operacoes": feitas,
+        "ops_por_s": len(latencias) / (sum(latencias) / 1e9) if latencias else 0.0,
+        "p50_us": latencias[len(latencias) // 2] / 1e3,
+        "p99_us": latencias[min(len(latencias) - 1, int(len(latencias) * 0.99))] / 1e3,
+        "altura": altura,
+        "tempo_total_s": duracao,
+    })
+    return resultado
+
+
+def imprimir(resultado):
+    prefixo = f"{resultado['motor']:17s} {resultado['carga']:13s} {resultado['n']:>9d}"
+    if "ops_por_s" not in resultado:
+        print(f"{prefixo}   {resultado['status']}")
+        return
+    memoria = resultado.get("pico_memoria_bytes")
+    memoria = f"{memoria / 2**20:8.1f} MiB" if memoria is not None else " " * 12
+    extra = "" if resultado["status"] == "ok" else f"   {resultado['status']}"
+    print(f"{prefixo} {resultado['ops_por_s']:11.0f} ops/s  p50 {resultado['p50_us']:8.2f} us  "
+          f"p99 {resultado['p99_us']:9.2f} us {memoria}  altura {resultado['altura']:5d}{extra}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks comuns das árvores do repositório.")
+    parser.add_argument("--motores", nargs="+", choices=sorted(MOTORES), default=list(MOTORES))
+    parser.add_argument("--cargas", nargs="+", choices=list(CARGAS), default=list(CARGAS))
+    parser.add_argument("--tamanhos", nargs="+", type=int, default=[10**3, 10**4],
+                        help="de 1000 a 10000000; os maiores levam muito tempo em Python")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--limite-s", type=float, default=60.0,
+                        help="tempo máximo de cada execução (árvores degeneradas são interrompidas)")
+    parser.add_argument("--sem-memoria", action="store_true",
+                        help="não repete a execução com tracemalloc para medir o pico de memória")
+    parser.add_argument("--saida", default=f"benchmark_arvores_{datetime.now():%Y%m%d_%H%M%S}.json")
+    args = parser.parse_args()
+
+    resultados = []
+    for n in args.tamanhos:
+        for nome_carga in args.cargas:
+            for nome_motor in args.motores:
+                resultado = medir(nome_motor, nome_carga, n, args.semente, args.limite_s,
+                                  not args.sem_memoria)
+                imprimir(resultado)
+                resultados.append(resultado)
+
+    with open(args.saida, "w", encoding="utf-8") as arquivo:
+        json.dump({
+            "executado_em": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "plataforma": platform.platform(),
+            "argumentos": vars(args),
+            "resultados": resultados,
+        }, arquivo, ensure_ascii=False, indent=2)
+    print(f"Resultados gravados em {args.saida}")
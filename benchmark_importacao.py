@@ -0,0 +1,85 @@
+# benchmark_importacao.py
+# Mede quanto custa importar os módulos das árvores em um interpretador novo,
+# como acontece em cada processo de um pool, e falha (código de saída 1) se
+# algum passar do orçamento ou carregar um backend de renderização.
+#
+#   python benchmark_importacao.py [--orcamento-ms 30] [--repeticoes 7]
+import argparse
+import compileall
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+
+# Módulo -> pasta que precisa estar no sys.path para importá-lo, ou o caminho
+# do arquivo, quando o nome do arquivo não é um nome de módulo válido.
+MODULOS = {
+    "arvores": RAIZ,
+    "Arvore_randon": os.path.join(RAIZ, "atividade_1", "Arvore Randomica"),
+    "Arvore_balanceada": os.path.join(RAIZ, "atividade_3"),
+    "arvore_avl": os.path.join(RAIZ, "atividade_5", "Árvore AVL.py"),
+}
+
+# Nenhum deles pode ser carregado só por importar o núcleo.
+PROIBIDOS = ("graphviz", "numpy", "multiprocessing")
+
+# Orçamento padrão, em milissegundos, da mediana de cada importação.
+ORCAMENTO_MS = 30.0
+
+CODIGO_FILHO = """
+import sys, time, json, importlib.util
+caminho = {caminho!r}
+if caminho.endswith(".py"):
+    spec = importlib.util.spec_from_file_location({modulo!r}, caminho)
+    sys.path.insert(0, {raiz!r})
+else:
+    sys.path.insert(0, caminho)
+inicio = time.perf_counter()
+if caminho.endswith(".py"):
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[{modulo!r}] = modulo
+    spec.loader.exec_module(modulo)
+else:
+    import {modulo}
+tempo = time.perf_counter() - inicio
+print(json.dumps([tempo, sorted({{m.split(".")[0] for m in sys.modules}} & set({proibidos!r}))]))
+"""
+
+
+def medir(modulo, caminho, repeticoes):
+    # Os processos de um pool já encontram o .pyc gravado pela primeira importação;
+    # compila antes para não medir a compilação quando PYTHONDONTWRITEBYTECODE
+    # impede o filho de gravá-lo.
+    if caminho.endswith(".py"):
+        compileall.compile_file(caminho, quiet=2)
+    else:
+        compileall.compile_dir(caminho, maxlevels=1 if caminho == RAIZ else 0, quiet=2)
+    tempos, carregados = [], set()
+    for _ in range(repeticoes):
+        saida = subprocess.run(
+            [sys.executable, "-c", CODIGO_FILHO.format(caminho=caminho, modulo=modulo, raiz=RAIZ,
+                                                       proibidos=PROIBIDOS)],
+            check=True, capture_output=True, text=True).stdout
+        tempo, proibidos = json.loads(saida)
+        tempos.append(tempo)
+        carregados.update(proibidos)
+    return statistics.median(tempos), sorted(carregados)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orcamento-ms", type=float, default=ORCAMENTO_MS)
+    parser.add_argument("--repeticoes", type=int, default=7)
+    args = parser.parse_args()
+
+    falhou = False
+    for modulo, caminho in MODULOS.items():
+        mediana, carregados = medir(modulo, caminho, args.repeticoes)
+        ok = mediana * 1e3 <= args.orcamento_ms and not carregados
+        falhou |= not ok
+        extra = f"   carregou {', '.join(carregados)}" if carregados else ""
+        print(f"{'ok   ' if ok else 'FALHA'} {modulo:18s} {mediana * 1e3:6.1f} ms{extra}")
+    sys.exit(1 if falhou else 0)
@@ -0,0 +1,12 @@
+# test_importacao.py
+# Orçamento de importação como teste: `python -m pytest test_importacao.py`.
+import pytest
+
+from benchmark_importacao import MODULOS, ORCAMENTO_MS, medir
+
+
+@pytest.mark.parametrize("modulo", sorted(MODULOS))
+def test_importacao_dentro_do_orcamento(modulo):
+    mediana, carregados = medir(modulo, MODULOS[modulo], repeticoes=5)
+    assert carregados == [], f"{modulo} carregou {', '.join(carregados)}"
+    assert mediana * 1e3 <= ORCAMENTO_MS, f"{modulo} levou {mediana * 1e3:.1f} ms"